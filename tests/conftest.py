@@ -1,6 +1,11 @@
 # tests/conftest.py
 import pytest
 
+@pytest.fixture(autouse=True)
+def _isolated_result_cache(tmp_path_factory, monkeypatch):
+    """Keep the CLI's on-disk batch result cache out of the user's home."""
+    monkeypatch.setenv("OSDAG_VAL_CACHE_DIR", str(tmp_path_factory.mktemp("result-cache")))
+
 class DummyBolt:
     def __init__(self, diameter):
         self.diameter = diameter
@@ -1,5 +1,6 @@
 #from .core import *
 #from .plugin import load_plugin
 from .validator import Validator
+from .rules import RULES, COMPILED
 
-__all__ = ["Validator"]
\ No newline at end of file
+__all__ = ["Validator", "RULES", "COMPILED"]
\ No newline at end of file
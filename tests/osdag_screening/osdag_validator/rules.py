@@ -0,0 +1,232 @@
+"""
+Declarative rule table for the simple Validator checks, compiled to Python.
+
+RULES is the single source of truth for the fu/fy/tf/plate limits and the
+bolt size/grade sets. At import time compile_rules() turns the table into
+source text (the same build-a-list-of-lines approach used by
+osdag_validator_cli/_autogen_generator.py) and exec's it into specialised
+functions, exposed as COMPILED["fu"], COMPILED["bolt"], ...
+
+The generated functions:
+ - dispatch on the exact type of each argument (int / float / str),
+ - validate strings with str.isdecimal() (common case) or a pre-compiled
+   regex instead of try/except around int()/float(),
+ - fold the limits in as literals and keep the allowed sets and helpers in
+   closure cells, so there are no global, self.* or class attribute lookups
+   on the hot path.
+
+Exotic argument types (Decimal, numpy scalars, bool, ...) fall back to the
+reference int()/float() behaviour, so answers always match Validator.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import re
+import sys
+import textwrap
+
+# -------------------------
+# Rule table
+# -------------------------
+# range rules: one (lo, hi) pair per parameter, inclusive.
+#   parse "int"   -> value must satisfy int(value)   (floats truncate)
+#   parse "float" -> value must satisfy float(value)
+# member rules: one allowed set per parameter, after the listed str methods.
+RULES = {
+    "fu": {"kind": "range", "parse": "int", "params": ("value",), "limits": ((300, 700),)},
+    "fy": {"kind": "range", "parse": "int", "params": ("value",), "limits": ((150, 500),)},
+    "tf": {"kind": "range", "parse": "float", "params": ("value",), "limits": ((1.0, 100.0),)},
+    "plate": {
+        "kind": "range",
+        "parse": "float",
+        "params": ("thickness", "width"),
+        "limits": ((1, 100), (50, 2000)),
+    },
+    "bolt": {
+        "kind": "member",
+        "params": ("size", "grade"),
+        "members": (
+            frozenset({"M16", "M20", "M24", "M27", "M30"}),
+            frozenset({"4.6", "8.8", "10.9"}),
+        ),
+        "normalize": (("strip", "upper"), ("strip",)),
+    },
+}
+
+# Strings accepted by int() / float() (base 10, underscores, unicode digits).
+_DIGITS = r"\d(?:_?\d)*"
+INT_PATTERN = re.compile(rf"\s*[+-]?{_DIGITS}\s*")
+FLOAT_PATTERN = re.compile(
+    rf"\s*[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?"
+    r"|(?i:inf|infinity|nan))\s*"
+)
+
+
+# int() refuses very long digit strings (CPython >= 3.11); those take the fallback.
+_MAX_INT_STR = getattr(sys, "get_int_max_str_digits", lambda: 0)() or sys.maxsize
+
+# -------------------------
+# Reference fallbacks (only reached for uncommon argument types)
+# -------------------------
+def _fallback_int(value, lo, hi):
+    try:
+        v = int(value)
+    except Exception:
+        return False
+    return lo <= v <= hi
+
+
+def _fallback_float(value, lo, hi):
+    try:
+        v = float(value)
+    except Exception:
+        return False
+    return lo <= v <= hi
+
+
+def _fallback_member(value, methods, allowed):
+    # mirrors Validator.validate_bolt: non-str values raise AttributeError
+    for m in methods:
+        value = getattr(value, m)()
+    return value in allowed
+
+
+# -------------------------
+# Code generation
+# -------------------------
+def _float_truncation_bounds(lo, hi):
+    """Bounds on a float x such that lo <= int(x) <= hi (int() truncates toward 0)."""
+    low = f"{lo!r} <= {{x}}" if lo > 0 else f"{lo - 1!r} < {{x}}"
+    high = f"{{x}} < {hi + 1!r}" if hi >= 0 else f"{{x}} <= {hi!r}"
+    return low, high
+
+
+def _range_check_lines(name: str, parse: str, lo, hi) -> list[str]:
+    """Lines (indented for a function body) that return False if `name` fails."""
+    lines = [f"    t = _type({name})"]
+    if parse == "int":
+        low, high = _float_truncation_bounds(lo, hi)
+        lines += [
+            # plain digit strings (the batch-file common case) skip the regex
+            f"    if t is _str and ({name}.isdecimal() or _int_match({name}) is not None)"
+            f" and _len({name}) <= {_MAX_INT_STR}:",
+            f"        if not ({lo!r} <= _int({name}) <= {hi!r}): return False",
+            f"    elif t is _int:",
+            f"        if not ({lo!r} <= {name} <= {hi!r}): return False",
+            f"    elif t is _float:",
+            f"        if not ({low.format(x=name)} and {high.format(x=name)}): return False",
+            f"    elif t is _str and _len({name}) <= {_MAX_INT_STR}:",
+            f"        return False",
+            f"    elif not _fallback_int({name}, {lo!r}, {hi!r}):",
+            f"        return False",
+        ]
+    else:
+        lines += [
+            f"    if t is _str:",
+            f"        if not ({name}.replace('.', '', 1).isdecimal() or _float_match({name}) is not None):",
+            f"            return False",
+            f"        if not ({lo!r} <= _float({name}) <= {hi!r}): return False",
+            f"    elif t is _float or t is _int:",
+            f"        if not ({lo!r} <= {name} <= {hi!r}): return False",
+            f"    elif not _fallback_float({name}, {lo!r}, {hi!r}):",
+            f"        return False",
+        ]
+    return lines
+
+
+def _member_check_lines(name: str, methods, allowed_var: str) -> list[str]:
+    expr = name + "".join(f".{m}()" for m in methods)
+    return [
+        f"    if _type({name}) is _str:",
+        f"        if {expr} not in {allowed_var}: return False",
+        f"    elif not _fallback_member({name}, {tuple(methods)!r}, {allowed_var}):",
+        f"        return False",
+    ]
+
+
+def compile_rules(rules: dict = RULES):
+    """
+    Generate and exec specialised check functions for `rules`.
+
+    Returns (source, functions) where functions maps rule name -> callable.
+    """
+    # Every helper is a closure variable of the generated _build() factory:
+    # cell loads are cheaper than globals, and kw-only defaults would be
+    # re-resolved from a dict on every call.
+    helpers = {
+        "_type": type,
+        "_len": len,
+        "_int": int,
+        "_float": float,
+        "_str": str,
+        "_int_match": INT_PATTERN.fullmatch,
+        "_float_match": FLOAT_PATTERN.fullmatch,
+        "_fallback_int": _fallback_int,
+        "_fallback_float": _fallback_float,
+        "_fallback_member": _fallback_member,
+    }
+    lines = ['"""Generated by osdag_validator.rules.compile_rules -- do not edit."""', ""]
+    defs: list[str] = []
+
+    for rule_name, rule in rules.items():
+        params = list(rule["params"])
+        body: list[str] = []
+        if rule["kind"] == "range":
+            for p, (lo, hi) in zip(params, rule["limits"]):
+                body += _range_check_lines(p, rule["parse"], lo, hi)
+        elif rule["kind"] == "member":
+            # reference semantics: any falsy argument is invalid
+            body.append(f"    if {' or '.join(f'not {p}' for p in params)}: return False")
+            for i, (p, methods, allowed) in enumerate(zip(params, rule["normalize"], rule["members"])):
+                var = f"_{rule_name}_allowed_{i}"
+                helpers[var] = frozenset(allowed)
+                body += _member_check_lines(p, methods, var)
+        else:
+            raise ValueError(f"Unknown rule kind {rule['kind']!r} for rule {rule_name!r}")
+        body.append("    return True")
+
+        defs.append(f"def check_{rule_name}({', '.join(params)}):")
+        defs += body
+        defs.append("")
+
+    lines.append(f"def _build({', '.join(helpers)}):")
+    lines += [textwrap.indent(line, "    ") if line else line for line in defs]
+    lines.append("    return {" + ", ".join(f"{n!r}: check_{n}" for n in rules) + "}")
+    lines.append("")
+
+    source = "\n".join(lines)
+    namespace: dict = {}
+    exec(compile(source, "<osdag_validator.rules>", "exec"), namespace)
+    functions = namespace["_build"](**helpers)
+    return source, functions
+
+
+SOURCE, COMPILED = compile_rules(RULES)
+
+
+def _canonical(obj):
+    if isinstance(obj, dict):
+        return {str(k): _canonical(v) for k, v in obj.items()}
+    if isinstance(obj, (set, frozenset)):
+        return sorted(_canonical(v) for v in obj)
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(v) for v in obj]
+    return obj
+
+
+def rules_version(rules: dict = RULES) -> str:
+    """
+    Stable fingerprint of a rule table and of the code generated from it.
+
+    Changes whenever a limit, allowed set or the code generator changes;
+    used to key persisted results (e.g. the batch result cache).
+    """
+    source = SOURCE if rules is RULES else compile_rules(rules)[0]
+    text = json.dumps(_canonical(rules), sort_keys=True) + "\n" + source
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+RULES_VERSION = rules_version(RULES)
+
+__all__ = ["RULES", "COMPILED", "SOURCE", "RULES_VERSION", "compile_rules", "rules_version"]
@@ -1,7 +1,92 @@
+from .rules import RULES
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; only the *_many batch methods need it
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "The vectorized Validator methods require numpy. Install it with `pip install numpy`."
+        )
+
+
+def _parse_int(x) -> float:
+    """Scalar int() parse used for non-numeric arrays; NaN marks failure."""
+    try:
+        return float(int(x))
+    except OverflowError:
+        return float("inf")
+    except:
+        return float("nan")
+
+
+def _parse_float(x) -> float:
+    """Scalar float() parse used for non-numeric arrays; NaN marks failure."""
+    try:
+        return float(x)
+    except:
+        return float("nan")
+
+
+def _as_numeric_array(values, integer: bool):
+    """
+    Turn `values` into a numeric ndarray following the int()/float() semantics
+    of the scalar methods. Unparseable entries become NaN, which fails every
+    range comparison exactly like the scalar `except: return False`.
+    """
+    _require_numpy()
+    if isinstance(values, np.ndarray):
+        arr = values
+    else:
+        try:
+            arr = np.asarray(values)
+        except ValueError:
+            # ragged input (e.g. a list element inside a flat list of values)
+            arr = np.empty(len(values), dtype=object)
+            arr[:] = list(values)
+        if arr.dtype.kind in "US":
+            # np.asarray stringifies mixed lists ([410.5, "x"] -> "410.5");
+            # keep the original objects so int(410.5) still truncates to 410.
+            arr = np.asarray(values, dtype=object)
+
+    kind = arr.dtype.kind
+    if kind in "biu":
+        return arr
+    if kind == "f":
+        # int() truncates toward zero; trunc(nan/inf) still fails the range test
+        return np.trunc(arr) if integer else arr
+
+    # strings / objects / exotic dtypes: one scalar parse per element
+    parse = _parse_int if integer else _parse_float
+    flat = arr.ravel()
+    if kind in "USO":
+        flat = flat.tolist()
+    out = np.fromiter((parse(x) for x in flat), dtype=np.float64, count=arr.size)
+    return out.reshape(arr.shape)
+
+
+def _in_range(arr, lo, hi):
+    return (arr >= lo) & (arr <= hi)
+
+
+# Limits come from the declarative rule table shared with the compiled checks.
+(_FU_MIN, _FU_MAX), = RULES["fu"]["limits"]
+(_FY_MIN, _FY_MAX), = RULES["fy"]["limits"]
+(_TF_MIN, _TF_MAX), = RULES["tf"]["limits"]
+(_PLATE_T_MIN, _PLATE_T_MAX), (_PLATE_W_MIN, _PLATE_W_MAX) = RULES["plate"]["limits"]
+
+
 class Validator:
     """
     Central validator used by CLI, GUI, FastAPI, Batch, and EXE.
     All logic lives here so every interface stays consistent.
+
+    The scalar validate_* methods are the reference implementation. The
+    *_many methods are array-in/array-out counterparts (numpy required) that
+    return a bool ndarray with the same answer for every element.
     """
 
     # ---------- FU ----------
@@ -11,7 +96,10 @@ class Validator:
         except:
             return False
         # Typical steel ultimate strength ranges (MPa)
-        return 300 <= v <= 700
+        return _FU_MIN <= v <= _FU_MAX
+
+    def validate_fu_many(self, values):
+        return _in_range(_as_numeric_array(values, integer=True), _FU_MIN, _FU_MAX)
 
     # ---------- FY ----------
     def validate_fy(self, value: int) -> bool:
@@ -20,7 +108,10 @@ class Validator:
         except:
             return False
         # Typical yield strength ranges (MPa)
-        return 150 <= v <= 500
+        return _FY_MIN <= v <= _FY_MAX
+
+    def validate_fy_many(self, values):
+        return _in_range(_as_numeric_array(values, integer=True), _FY_MIN, _FY_MAX)
 
     # ---------- TF (plate thickness) ----------
     def validate_tf(self, value: float) -> bool:
@@ -29,11 +120,14 @@ class Validator:
         except:
             return False
         # Practical thicknesses (mm)
-        return 1.0 <= t <= 100.0
+        return _TF_MIN <= t <= _TF_MAX
+
+    def validate_tf_many(self, values):
+        return _in_range(_as_numeric_array(values, integer=False), _TF_MIN, _TF_MAX)
 
     # ---------- Bolt ----------
-    VALID_BOLT_SIZES = {"M16", "M20", "M24", "M27", "M30"}
-    VALID_BOLT_GRADES = {"4.6", "8.8", "10.9"}
+    VALID_BOLT_SIZES = set(RULES["bolt"]["members"][0])
+    VALID_BOLT_GRADES = set(RULES["bolt"]["members"][1])
 
     def validate_bolt(self, size: str, grade: str) -> bool:
         if not size or not grade:
@@ -51,9 +145,14 @@ class Validator:
         except:
             return False
 
-        if not (1 <= t <= 100):
+        if not (_PLATE_T_MIN <= t <= _PLATE_T_MAX):
             return False
-        if not (50 <= w <= 2000):
+        if not (_PLATE_W_MIN <= w <= _PLATE_W_MAX):
             return False
 
         return True
+
+    def validate_plate_many(self, thicknesses, widths):
+        t = _as_numeric_array(thicknesses, integer=False)
+        w = _as_numeric_array(widths, integer=False)
+        return _in_range(t, _PLATE_T_MIN, _PLATE_T_MAX) & _in_range(w, _PLATE_W_MIN, _PLATE_W_MAX)
@@ -4,15 +4,86 @@ Stable FastAPI API for osdag-validator.
 
 This module uses the Validator class directly (via get_validator()) and keeps
 HTTP handlers simple and explicit (no CLI wrapper invocation) to avoid arg-mismatch.
+One Validator is loaded at startup and /validate dispatches through a dict
+of pre-bound handlers, behind a bounded response cache; the bulk endpoints
+share the CLI batch dispatcher, and /jobs runs batch files in the
+background (see jobs.py). A two-lane fair scheduler keeps bulk work from
+starving /validate (see scheduler.py). Every endpoint records into one
+Metrics object, served in the Prometheus text format on /metrics.
 """
 
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import math
+import os
+import time
+from time import perf_counter
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.requests import ClientDisconnect
 from pydantic import BaseModel, Field
-from typing import List, Any, Optional
+from typing import List, Any, Dict, Optional
+
+from osdag_validator_cli.cli import get_validator, get_dispatch, as_number_if_possible, run_batch_file, \
+    run_command, run_rows, iter_rows, _bound_check, _missing_method, _iter_batch_rows, _resolve_batch_path, _chunked
+from osdag_validator_cli.cache import TTLCache, MISSING
+from osdag_validator_cli.coalesce import Coalescer, DEFAULT_MAX_WAIT
+from osdag_validator_cli.jobs import JobQueue, JobQueueFull, FINISHED, DONE, RUNNING
+from osdag_validator_cli.scheduler import FairScheduler, INTERACTIVE, BULK
+from osdag_validator_cli.metrics import Metrics
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # bind the Validator and the dispatch tables before the first request (see warm_up)
+    warm_up()
+    if os.environ.get("OSDAG_VAL_RESPONSE_CACHE") or os.environ.get("OSDAG_VAL_RESPONSE_CACHE_TTL"):
+        ttl = float(os.environ.get("OSDAG_VAL_RESPONSE_CACHE_TTL", RESPONSE_CACHE_TTL))
+        configure_response_cache(int(os.environ.get("OSDAG_VAL_RESPONSE_CACHE", RESPONSE_CACHE_SIZE)),
+                                 ttl if ttl > 0 else None)
+    if os.environ.get("OSDAG_VAL_RESPONSE_CACHE_WARM"):
+        warm_response_cache(_iter_batch_rows(os.environ["OSDAG_VAL_RESPONSE_CACHE_WARM"]))
+    if os.environ.get("OSDAG_VAL_COALESCE"):
+        configure_coalescing(int(os.environ["OSDAG_VAL_COALESCE"]),
+                             float(os.environ.get("OSDAG_VAL_COALESCE_WAIT_MS", DEFAULT_MAX_WAIT * 1000)) / 1000)
+    if os.environ.get("OSDAG_VAL_SCHEDULER") == "0":
+        configure_scheduler(False)
+    elif os.environ.get("OSDAG_VAL_LANE_WEIGHTS"):
+        interactive, _, bulk = os.environ["OSDAG_VAL_LANE_WEIGHTS"].partition(":")
+        configure_scheduler(interactive_weight=float(interactive), bulk_weight=float(bulk or 1))
+    yield
+    shutdown_jobs()
+
+
+app = FastAPI(title="Osdag Validator API", version="1.0", lifespan=lifespan)
+
+# counters and phase histograms of this process, served on /metrics
+METRICS = Metrics()
+
+# most rows accepted by one /validate/batch request
+MAX_BATCH_ITEMS = 100_000
 
-from osdag_validator_cli.cli import get_validator, as_number_if_possible, run_batch_file, run_command
+# /validate/stream: rows validated per step (the first block is small so
+# results start flowing at once; later ones suit the grouped columnar path)
+# and the longest line accepted
+STREAM_FIRST_ROWS = 64
+STREAM_BLOCK_ROWS = 2000
+MAX_STREAM_LINE_BYTES = 1024 * 1024
 
-app = FastAPI(title="Osdag Validator API", version="1.0")
+# /validate response cache: entries kept and their lifetime in seconds
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_TTL = 3600.0
+
+# /jobs: batch jobs run at once, jobs queued or running before 429, and how
+# /jobs/{id}/result follows a job still writing its output
+JOB_WORKERS = 2
+MAX_JOBS = 16
+JOB_POLL_SECONDS = 0.05
+JOB_RESULT_CHUNK = 64 * 1024
 
 
 class ValidateRequest(BaseModel):
@@ -28,83 +99,688 @@ class ValidateResponse(BaseModel):
     result: Any
 
 
+class BatchRequest(BaseModel):
+    # either a list of {"command": ..., "args": [...]} items ...
+    items: Optional[List[Dict[str, Any]]] = Field(default=None, examples=[[{"command": "fu", "args": ["410"]}]])
+    # ... or one command over a column of values (one list per value for multi-argument commands)
+    command: Optional[str] = Field(default=None, examples=["fu"])
+    values: Optional[List[Any]] = Field(default=None, examples=[["410", "250"]])
+
+
+class JobRequest(BaseModel):
+    path: str = Field(..., examples=["/data/rows.csv"])
+    format: Optional[str] = Field(default="jsonl", examples=["jsonl"])
+
+
 @app.get("/health")
 def health():
     return {"ok": True, "name": "osdag-validator-api", "version": "1.0"}
 
 
+def _method(v, name: str, fallback=None):
+    """
+    Bound Validator method (the compiled rule check for a stock one, see
+    cli._bound_check), the fallback, or a stub raising the AttributeError a
+    call would.
+    """
+    return _bound_check(v, name) or fallback or _missing_method(name)
+
+
+def _bind_handlers(v) -> dict:
+    """
+    {command: (minimum args, 400 detail if fewer, handler(args))} for one
+    Validator; every method is looked up here, once, not per request.
+    """
+    num = as_number_if_possible
+    fu = _method(v, "validate_fu")
+    fy = _method(v, "validate_fy")
+    fu_fy = _method(v, "validate_fu_fy")
+    tf = _method(v, "validate_tf", lambda x: False)
+    bolt = _method(v, "validate_bolt", lambda s, g: False)
+    plate = _method(v, "validate_plate", lambda a, b: False)
+    fu_fy_entry = (2, "fu-fy requires 2 arguments", lambda args: fu_fy(num(args[0]), num(args[1])))
+    return {
+        "fu": (1, "fu requires 1 argument", lambda args: fu(num(args[0]))),
+        "fy": (1, "fy requires 1 argument", lambda args: fy(num(args[0]))),
+        "fu-fy": fu_fy_entry,
+        "fufy": fu_fy_entry,
+        "tf": (1, "tf requires 1 argument", lambda args: tf(num(args[0]))),
+        "bolt": (2, "bolt requires size and grade", lambda args: bolt(args[0], args[1])),
+        "plate": (2, "plate requires thickness and width", lambda args: plate(num(args[0]), num(args[1]))),
+        # server-side batch runner
+        "batch": (1, "batch requires path argument in args[0]", lambda args: _run_batch_command(args[0])),
+    }
+
+
+_HANDLERS: Optional[dict] = None
+
+# /validate commands that do I/O or unbounded work and must leave the event loop
+BLOCKING_COMMANDS = frozenset({"batch"})
+
+
+def get_handlers() -> dict:
+    """
+    The /validate handler table, built from one shared Validator on first
+    use (normally by the startup hook). Raises ImportError if the Validator
+    cannot be loaded; the next call tries again.
+    """
+    global _HANDLERS
+    if _HANDLERS is None:
+        _HANDLERS = _bind_handlers(get_validator())
+        # cached answers came from the previous Validator
+        if _RESPONSE_CACHE is not None:
+            _RESPONSE_CACHE.clear()
+    return _HANDLERS
+
+
+_num = as_number_if_possible
+
+# command -> normalized response cache key for its args, applying the same
+# conversions the handler does (numbers parsed, bolt size stripped and
+# upper-cased, grade stripped), so " M20 ", "m20" and "M20" share an entry;
+# the batch runner reads files and is never cached
+CACHE_KEYS = {
+    "fu": lambda args: ("fu", _num(args[0])),
+    "fy": lambda args: ("fy", _num(args[0])),
+    "tf": lambda args: ("tf", _num(args[0])),
+    "fu-fy": lambda args: ("fu-fy", _num(args[0]), _num(args[1])),
+    "fufy": lambda args: ("fu-fy", _num(args[0]), _num(args[1])),
+    "plate": lambda args: ("plate", _num(args[0]), _num(args[1])),
+    "bolt": lambda args: ("bolt", args[0].strip().upper(), args[1].strip()),
+}
+
+_RESPONSE_CACHE: Optional[TTLCache] = TTLCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+
+def _cache_key(cmd: str, args: list):
+    """
+    CACHE_KEYS[cmd](args), or None for args that normalize to NaN: such a
+    key never equals itself, so it could only take an entry and never hit.
+    """
+    key = CACHE_KEYS[cmd](args)
+    return None if any(part != part for part in key) else key
+
+
+def configure_response_cache(maxsize: int = RESPONSE_CACHE_SIZE, ttl: Optional[float] = RESPONSE_CACHE_TTL) -> None:
+    """
+    Replace the /validate response cache with an empty one holding up to
+    `maxsize` answers for `ttl` seconds each (None: until evicted). maxsize
+    < 1 turns caching off. At startup this is read from
+    $OSDAG_VAL_RESPONSE_CACHE (entries) and $OSDAG_VAL_RESPONSE_CACHE_TTL
+    (seconds, 0 for no expiry).
+    """
+    global _RESPONSE_CACHE
+    _RESPONSE_CACHE = TTLCache(maxsize, ttl) if maxsize >= 1 else None
+
+
+METRICS.register_cache("response", lambda: _RESPONSE_CACHE.stats() if _RESPONSE_CACHE is not None else None)
+
+
+def warm_response_cache(rows) -> int:
+    """
+    Validate (command, args) rows into the response cache, e.g. the keys
+    recorded by GET /debug/cache/keys; returns the number stored. Rows with
+    an unknown or uncacheable command, too few args or a failing check are
+    skipped, as is everything when the Validator cannot be loaded. At
+    startup $OSDAG_VAL_RESPONSE_CACHE_WARM names a batch file (CSV, JSON or
+    JSON Lines) to load.
+    """
+    cache = _RESPONSE_CACHE
+    if cache is None:
+        return 0
+    try:
+        handlers = get_handlers()
+    except ImportError:
+        return 0
+    stored = 0
+    for cmd, args in rows:
+        cmd = str(cmd or "").lower().strip()
+        if cmd not in CACHE_KEYS or not isinstance(args, list) or len(args) < handlers[cmd][0]:
+            continue
+        try:
+            key = _cache_key(cmd, args)
+            out = handlers[cmd][2](args)
+        except Exception:
+            continue
+        if key is None:
+            continue
+        cache.put(key, out)
+        stored += 1
+    return stored
+
+
+# /validate commands whose parsing matches the CLI batch dispatcher, so they can be coalesced
+COALESCED_COMMANDS = frozenset({"fu", "fy", "tf", "bolt", "plate"})
+
+_COALESCER: Optional[Coalescer] = None
+
+
+def configure_coalescing(max_items: int = 0, max_wait: float = DEFAULT_MAX_WAIT) -> None:
+    """
+    Opt in to micro-batching of concurrent /validate calls: requests for the
+    same command arriving within `max_wait` seconds are validated together,
+    up to `max_items` per group (see coalesce.py). max_items <= 1 turns it
+    off. At startup this is read from $OSDAG_VAL_COALESCE (items) and
+    $OSDAG_VAL_COALESCE_WAIT_MS.
+    """
+    global _COALESCER
+    _COALESCER = Coalescer(run_rows, max_items, max_wait) if max_items > 1 else None
+
+
+_SCHEDULER: Optional[FairScheduler] = FairScheduler()
+
+
+def configure_scheduler(enabled: bool = True, **settings) -> None:
+    """
+    Replace the interactive/bulk scheduler (settings are FairScheduler's:
+    lane weights, budgets, slice_rows, ...), or turn it off. At startup
+    $OSDAG_VAL_SCHEDULER=0 turns it off and $OSDAG_VAL_LANE_WEIGHTS
+    ("interactive:bulk", default "4:1") sets the weights.
+    """
+    global _SCHEDULER
+    _SCHEDULER = FairScheduler(**settings) if enabled else None
+    if _JOBS is not None:
+        _JOBS.scheduler = _SCHEDULER
+
+
+def _overloaded(scheduler: FairScheduler, lane: str) -> HTTPException:
+    return HTTPException(429, f"Too many {lane} requests in flight",
+                         headers={"Retry-After": str(scheduler.retry_after(lane))})
+
+
+def _run_sliced(func, rows: list, step: Optional[int] = None) -> list:
+    """
+    func(part) over consecutive parts of `rows`, each run as one bulk slice
+    of the scheduler (one call with everything when it is off), results
+    concatenated. `step` maps a part's start index to an extra argument.
+    """
+    scheduler = _SCHEDULER
+    if scheduler is None:
+        return func(rows) if step is None else func(rows, step(0))
+    out = []
+    n = scheduler.slice_rows
+    for i in range(0, len(rows), n):
+        with scheduler.bulk_slot():
+            out += func(rows[i:i + n]) if step is None else func(rows[i:i + n], step(i))
+    return out
+
+
+def _run_batch_command(path: str) -> list:
+    """
+    The /validate batch command: run_batch_file(path) results, with the file
+    read and validated one bulk slice at a time, so a large server-side
+    file yields to interactive requests like the other bulk endpoints.
+    """
+    scheduler = _SCHEDULER
+    if scheduler is None:
+        return run_batch_file(path, metrics=METRICS)
+    start = perf_counter()
+    n = scheduler.slice_rows
+    blocks = _chunked(_iter_batch_rows(_resolve_batch_path(path)), n)
+    results = []
+    while True:
+        with scheduler.bulk_slot():
+            block = next(blocks, None)
+            if block is not None:
+                results += iter_rows(block, metrics=METRICS)
+        if block is None or len(block) < n:
+            break
+    METRICS.record_batch(len(results), perf_counter() - start)
+    return results
+
+
+def warm_up() -> None:
+    """Load the Validator and both dispatch tables before the first request."""
+    try:
+        get_handlers()
+        get_dispatch()
+    except ImportError:
+        # reported per request (500) as before, so the app still starts
+        pass
+
+
 @app.post("/validate", response_model=ValidateResponse)
-def validate(req: ValidateRequest):
+async def validate(req: ValidateRequest):
+    """
+    Run one check. Goes through the scheduler's interactive lane (queued
+    behind running bulk slices; 429 with Retry-After when the lane is over
+    budget); the file-reading batch command counts as bulk work.
+    """
+    scheduler = _SCHEDULER
+    if scheduler is None:
+        return await _validate(req)
+    if req.command.lower().strip() in BLOCKING_COMMANDS:
+        if not scheduler.enter_bulk():
+            raise _rejected(req.command.lower().strip(), _overloaded(scheduler, BULK))
+        start = time.monotonic()
+        try:
+            return await _validate(req)
+        finally:
+            scheduler.leave_bulk(time.monotonic() - start)
+    if not scheduler.enter_interactive():
+        raise _rejected(req.command.lower().strip(), _overloaded(scheduler, INTERACTIVE))
     try:
-        v = get_validator()
-    except ImportError as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        async with scheduler.interactive_slot():
+            return await _validate(req)
+    finally:
+        scheduler.leave_interactive()
+
 
+def _rejected(cmd: str, exc: HTTPException) -> HTTPException:
+    """Count a refused /validate request (400, 429, ...) as an "error" outcome."""
+    METRICS.count(cmd, {"error": exc.detail})
+    return exc
+
+
+async def _validate(req: ValidateRequest):
+    # phases recorded in METRICS: parse (command and argument checks; the
+    # body itself is decoded by FastAPI), dispatch (handler and response
+    # cache lookup), validate (the check), serialize (the JSON response)
+    t0 = perf_counter()
     cmd = req.command.lower().strip()
-    args = req.args or []
+    try:
+        handlers = get_handlers()
+    except ImportError as e:
+        raise _rejected(cmd, HTTPException(status_code=500, detail=str(e)))
 
+    args = req.args or []
+    entry = handlers.get(cmd)
+    if entry is None:
+        raise _rejected(cmd, HTTPException(status_code=400, detail=f"Unsupported command: {cmd}"))
+    min_args, detail, handler = entry
+    if len(args) < min_args:
+        raise _rejected(cmd, HTTPException(status_code=400, detail=detail))
+    t1 = perf_counter()
+    cache = _RESPONSE_CACHE
+    key = None
+    if cache is not None and cmd in CACHE_KEYS:
+        key = _cache_key(cmd, args)
+        out = cache.get(key) if key is not None else MISSING
+        if out is not MISSING:
+            t2 = perf_counter()
+            response = JSONResponse({"ok": True, "command": cmd, "args": args, "result": out})
+            METRICS.record(cmd, out, parse=t1 - t0, dispatch=t2 - t1, serialize=perf_counter() - t2)
+            return response
+    coalescer = _COALESCER
+    t2 = perf_counter()
     try:
-        # ---- FU ----
-        if cmd == "fu":
-            if len(args) < 1:
-                raise HTTPException(400, "fu requires 1 argument")
-            value = as_number_if_possible(args[0])
-            out = v.validate_fu(value)
-            return ValidateResponse(ok=True, command=cmd, args=args, result=out)
-
-        # ---- FY ----
-        if cmd == "fy":
-            if len(args) < 1:
-                raise HTTPException(400, "fy requires 1 argument")
-            value = as_number_if_possible(args[0])
-            out = v.validate_fy(value)
-            return ValidateResponse(ok=True, command=cmd, args=args, result=out)
-
-        # ---- FU-FY ----
-        if cmd in ("fu-fy", "fufy"):
-            if len(args) < 2:
-                raise HTTPException(400, "fu-fy requires 2 arguments")
-            fu = as_number_if_possible(args[0])
-            fy = as_number_if_possible(args[1])
-            out = v.validate_fu_fy(fu, fy)
-            return ValidateResponse(ok=True, command=cmd, args=args, result=out)
-
-        # ---- TF (optional method on Validator) ----
-        if cmd == "tf":
-            if len(args) < 1:
-                raise HTTPException(400, "tf requires 1 argument")
-            value = as_number_if_possible(args[0])
-            out = getattr(v, "validate_tf", lambda x: False)(value)
-            return ValidateResponse(ok=True, command=cmd, args=args, result=out)
-
-        # ---- bolt / plate are forwarded if Validator implements them ----
-        if cmd == "bolt":
-            if len(args) < 2:
-                raise HTTPException(400, "bolt requires size and grade")
-            out = getattr(v, "validate_bolt", lambda s,g: False)(args[0], args[1])
-            return ValidateResponse(ok=True, command=cmd, args=args, result=out)
-
-        if cmd == "plate":
-            if len(args) < 2:
-                raise HTTPException(400, "plate requires thickness and width")
-            t = as_number_if_possible(args[0])
-            w = as_number_if_possible(args[1])
-            out = getattr(v, "validate_plate", lambda a,b: False)(t,w)
-            return ValidateResponse(ok=True, command=cmd, args=args, result=out)
-
-        # ---- batch (server-side batch runner) ----
-        if cmd == "batch":
-            if len(args) < 1:
-                raise HTTPException(status_code=400, detail="batch requires path argument in args[0]")
-            path = args[0]
-            out = run_batch_file(path)
-            return ValidateResponse(ok=True, command=cmd, args=args, result=out)
-
-        # unsupported
-        raise HTTPException(status_code=400, detail=f"Unsupported command: {cmd}")
-
-    except HTTPException:
-        raise
+        if coalescer is not None and cmd in COALESCED_COMMANDS:
+            out = await coalescer.submit(cmd, args)
+            if isinstance(out, dict) and "error" in out:
+                raise RuntimeError(out["error"])
+        else:
+            # single checks take microseconds: run them on the event loop instead
+            # of paying a threadpool hop; only the file-reading batch runner blocks
+            out = await run_in_threadpool(handler, args) if cmd in BLOCKING_COMMANDS else handler(args)
     except Exception as e:
         # Internal error
+        METRICS.record(cmd, {"error": str(e)}, parse=t1 - t0, dispatch=t2 - t1, validate=perf_counter() - t2)
         raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+    if key is not None:
+        cache.put(key, out)
+    t3 = perf_counter()
+    # lean path: the handlers' results are plain JSON values, so the
+    # ValidateResponse model (kept for the OpenAPI schema) is not re-validated
+    response = JSONResponse({"ok": True, "command": cmd, "args": args, "result": out})
+    if cmd not in BLOCKING_COMMANDS:
+        # the batch runner records its own rows
+        METRICS.record(cmd, out, parse=t1 - t0, dispatch=t2 - t1, validate=t3 - t2,
+                       serialize=perf_counter() - t3)
+    return response
+
+
+@app.get("/metrics")
+def metrics():
+    """
+    Prometheus text exposition: validations by command and outcome, phase
+    latency histograms, batch rows/sec and cache hit rates.
+    """
+    return Response(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/debug/cache")
+def debug_cache():
+    """Hit/miss/eviction counters of the /validate response cache (null when it is off)."""
+    cache = _RESPONSE_CACHE
+    return {"response_cache": cache.stats() if cache is not None else None}
+
+
+@app.get("/debug/scheduler")
+def debug_scheduler():
+    """In-flight requests, budgets, weights and rejections per scheduler lane (null when it is off)."""
+    scheduler = _SCHEDULER
+    return {"scheduler": scheduler.stats() if scheduler is not None else None}
+
+
+@app.get("/debug/cache/keys")
+def debug_cache_keys():
+    """
+    The cached (command, args) keys as JSON Lines, least recently used
+    first; saved to a .jsonl file they can warm the cache at startup.
+    """
+    cache = _RESPONSE_CACHE
+    keys = cache.keys() if cache is not None else []
+    body = "".join(_encode_json({"command": k[0], "args": list(k[1:])}) + "\n" for k in keys)
+    return Response(body, media_type="application/x-ndjson")
+
+
+_JOBS: Optional[JobQueue] = None
+
+# media type of /jobs/{id}/result per output format
+JOB_MEDIA_TYPES = {"json": "application/json", "jsonl": "application/x-ndjson",
+                   "csv": "text/csv", "text": "text/plain"}
+
+
+def get_job_queue() -> JobQueue:
+    """
+    The background job queue, created on first use with $OSDAG_VAL_JOB_WORKERS
+    threads (default JOB_WORKERS), room for $OSDAG_VAL_MAX_JOBS active jobs
+    (default MAX_JOBS) and outputs under $OSDAG_VAL_JOB_DIR (default: a
+    temporary directory removed at shutdown).
+    """
+    global _JOBS
+    if _JOBS is None:
+        _JOBS = JobQueue(int(os.environ.get("OSDAG_VAL_JOB_WORKERS", JOB_WORKERS)),
+                         int(os.environ.get("OSDAG_VAL_MAX_JOBS", MAX_JOBS)),
+                         os.environ.get("OSDAG_VAL_JOB_DIR") or None, scheduler=_SCHEDULER,
+                         metrics=METRICS)
+    return _JOBS
+
+
+def shutdown_jobs() -> None:
+    """Cancel all jobs and stop the job queue (at application shutdown)."""
+    global _JOBS
+    jobs, _JOBS = _JOBS, None
+    if jobs is not None:
+        jobs.shutdown()
+
+
+def _get_job(job_id: str):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(404, f"Unknown job: {job_id}")
+    return job
+
+
+@app.post("/jobs", status_code=202)
+def submit_job(req: JobRequest):
+    """
+    Queue a server-side batch file and return at once with the job's status
+    (its "id" included). Poll GET /jobs/{id} for progress and fetch the
+    output from GET /jobs/{id}/result. Jobs run in the scheduler's bulk
+    lane; 429 (Retry-After: the soonest running job's ETA) when too many
+    jobs are active.
+    """
+    queue = get_job_queue()
+    try:
+        job = queue.submit(req.path, req.format)
+    except FileNotFoundError:
+        raise HTTPException(400, f"Batch file not found: {req.path}")
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except JobQueueFull as e:
+        etas = [j.status()["eta_seconds"] for j in queue.jobs() if j.state == RUNNING]
+        eta = min((t for t in etas if t is not None), default=1)
+        raise HTTPException(429, str(e), headers={"Retry-After": str(max(1, math.ceil(eta)))})
+    return JSONResponse(job.status(), status_code=202, headers={"Location": f"/jobs/{job.id}"})
+
+
+@app.get("/jobs")
+def list_jobs():
+    return {"jobs": [j.status() for j in get_job_queue().jobs()]}
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """State, rows done, rows/sec, progress (0..1) and ETA in seconds of one job."""
+    return _get_job(job_id).status()
+
+
+class JobOutputAborted(RuntimeError):
+    """The job behind a followed result failed or was cancelled; the output sent so far is incomplete."""
+
+
+async def _follow_output(job, poll: float = JOB_POLL_SECONDS):
+    """
+    Chunks of a job's output file as it is written, until the job finishes.
+    Raises JobOutputAborted if the job fails or is cancelled meanwhile, so
+    the response is cut off instead of ending like a complete result.
+    """
+    f = None
+    try:
+        while True:
+            # checked before reading: once finished, everything is on disk
+            finished = job.state in FINISHED
+            if finished and job.state != DONE:
+                raise JobOutputAborted(f"Job {job.id} {job.state}" + (f": {job.error}" if job.error else ""))
+            if f is None:
+                try:
+                    f = open(job.out_path, "rb")
+                except FileNotFoundError:
+                    if finished:
+                        return
+                    await asyncio.sleep(poll)
+                    continue
+            chunk = f.read(JOB_RESULT_CHUNK)
+            if chunk:
+                yield chunk
+            elif finished:
+                return
+            else:
+                await asyncio.sleep(poll)
+    finally:
+        if f is not None:
+            f.close()
+
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str):
+    """
+    The job's output in its format. For a queued or running job the
+    response follows the output as it is written and ends when the job
+    does; if the job fails or is cancelled meanwhile the connection is
+    aborted, so a client never mistakes the partial output for a complete
+    one. 409 for a job already failed or cancelled.
+    """
+    job = _get_job(job_id)
+    if job.state in FINISHED and job.state != DONE:
+        raise HTTPException(409, f"Job {job_id} {job.state}" + (f": {job.error}" if job.error else ""))
+    return StreamingResponse(_follow_output(job), media_type=JOB_MEDIA_TYPES[job.out_format])
+
+
+@app.delete("/jobs/{job_id}")
+def delete_job(job_id: str):
+    """Cancel a queued or running job, or forget a finished one and delete its output."""
+    queue = get_job_queue()
+    job = _get_job(job_id)
+    if job.state in FINISHED:
+        queue.remove(job_id)
+        return {"ok": True, "id": job_id, "state": job.state, "removed": True}
+    queue.cancel(job_id)
+    return {"ok": True, "id": job_id, "state": job.state, "removed": False}
+
+
+def _batch_rows(req: BatchRequest) -> list:
+    """(command, args) rows for a batch request; HTTPException 400 if malformed."""
+    if req.items is not None:
+        if req.command is not None or req.values is not None:
+            raise HTTPException(400, "send either 'items' or 'command' and 'values', not both")
+        rows = []
+        for it in req.items:
+            args = it.get("args")
+            if args is None:
+                args = []
+            elif not isinstance(args, list):
+                args = [args]
+            rows.append((str(it.get("command") or "").lower(), args))
+        return rows
+    if req.command is None or req.values is None:
+        raise HTTPException(400, "batch requires 'items' or both 'command' and 'values'")
+    cmd = req.command.lower()
+    return [(cmd, v if isinstance(v, list) else [v]) for v in req.values]
+
+
+@app.post("/validate/batch")
+def validate_batch(req: BatchRequest):
+    """
+    Validate many rows in one request.
+
+    Rows go through the CLI batch dispatcher (grouped by command, numeric
+    columns checked vectorized), and the response carries only the results,
+    in request order: {"ok": true, "count": n, "results": [true, false, ...]}.
+    Rows with an unknown command or a failing check get {"error": ...}.
+    Runs in the scheduler's bulk lane, in slices; 429 with Retry-After when
+    the lane is over budget.
+    """
+    t0 = perf_counter()
+    rows = _batch_rows(req)
+    METRICS.observe("parse", perf_counter() - t0)
+    if len(rows) > MAX_BATCH_ITEMS:
+        raise HTTPException(413, f"at most {MAX_BATCH_ITEMS} rows per batch request")
+    scheduler = _SCHEDULER
+    if scheduler is not None and not scheduler.enter_bulk():
+        raise _overloaded(scheduler, BULK)
+    start = time.monotonic()
+    try:
+        results = _run_sliced(lambda part: run_rows(part, metrics=METRICS), rows)
+    except ImportError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {e}")
+    finally:
+        if scheduler is not None:
+            scheduler.leave_bulk(time.monotonic() - start)
+    t1 = perf_counter()
+    # plain JSON values already; skip FastAPI's per-element jsonable_encoder pass
+    response = JSONResponse({"ok": True, "count": len(results), "results": results})
+    t2 = perf_counter()
+    METRICS.observe("serialize", t2 - t1)
+    METRICS.record_batch(len(rows), t2 - t0)
+    return response
+
+
+_decode_json = json.JSONDecoder().decode
+# same text as the CLI's jsonl output
+_encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+
+def _stream_row(line: str, lineno: int):
+    """(command, args) for one NDJSON line, or an {"line", "error"} object."""
+    try:
+        item = _decode_json(line)
+    except ValueError as e:
+        return {"line": lineno, "error": f"Invalid JSON on line {lineno}: {e}"}
+    if not isinstance(item, dict):
+        return {"line": lineno, "error": f"Line {lineno} is not a JSON object"}
+    args = item.get("args")
+    if args is None:
+        args = []
+    elif not isinstance(args, list):
+        args = [args]
+    return str(item.get("command") or "").lower(), args
+
+
+def _validate_stream_lines(lines: list, lineno: int) -> str:
+    """
+    NDJSON results for consecutive request lines, the first being line
+    `lineno`. Runs in a worker thread, so parsing, validation and encoding
+    stay off the event loop, in the scheduler's bulk slices.
+    """
+    return "".join(_run_sliced(_encode_stream_lines, lines, lambda i: lineno + i))
+
+
+def _encode_stream_lines(lines: list, lineno: int) -> list:
+    t0 = perf_counter()
+    rows = [_stream_row(line, n) for n, line in enumerate(lines, lineno) if line.strip()]
+    METRICS.observe("parse", perf_counter() - t0)
+    # validate the whole block up front so encoding is timed on its own
+    results = iter(list(iter_rows([r for r in rows if type(r) is tuple], metrics=METRICS)))
+    t1 = perf_counter()
+    out = [_encode_json(next(results) if type(r) is tuple else r) for r in rows]
+    out.append("")
+    t2 = perf_counter()
+    METRICS.observe("serialize", t2 - t1)
+    METRICS.record_batch(len(rows), t2 - t0)
+    return ["\n".join(out)] if rows else []
+
+
+async def _stream_results(chunks):
+    """NDJSON result text for an async iterator of NDJSON request body chunks."""
+    pending = bytearray()
+    lineno = 1  # number of the first line in `pending`
+    size = STREAM_FIRST_ROWS
+    async for chunk in chunks:
+        pending += chunk
+        end = pending.rfind(b"\n") + 1
+        if end:
+            lines = pending[:end].decode("utf-8", "replace").split("\n")
+            lines.pop()  # the empty string after the last newline
+            del pending[:end]
+            # answer each body chunk as it arrives; blocks grow from
+            # STREAM_FIRST_ROWS so the first results go out immediately
+            i = 0
+            while i < len(lines):
+                part = lines[i:i + size]
+                text = await run_in_threadpool(_validate_stream_lines, part, lineno)
+                i += len(part)
+                lineno += len(part)
+                size = min(size * 2, STREAM_BLOCK_ROWS)
+                if text:
+                    yield text
+        if len(pending) > MAX_STREAM_LINE_BYTES:
+            yield _encode_json({"line": lineno, "error": f"Line {lineno} exceeds {MAX_STREAM_LINE_BYTES} bytes"}) + "\n"
+            return
+    if pending:
+        text = await run_in_threadpool(_validate_stream_lines, [pending.decode("utf-8", "replace")], lineno)
+        if text:
+            yield text
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator consumes the request body itself.
+
+    Under ASGI < 2.4 the stock class watches receive() for a disconnect in a
+    parallel task, which would swallow the request body chunks the iterator
+    is waiting for; here the iterator's own request.stream() sees the
+    disconnect (as ClientDisconnect) and send() failures end the response.
+    The background task runs however the response ends, so it can release
+    what the request held.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        finally:
+            if self.background is not None:
+                await self.background()
+
+
+@app.post("/validate/stream")
+async def validate_stream(request: Request):
+    """
+    Validate an NDJSON upload as it arrives.
+
+    The body is one {"command": ..., "args": [...]} object per line; the
+    response is NDJSON too, one {"command", "args", "result"} object per
+    input line, in order, sent as soon as each piece of the body has been
+    validated. Only one block of rows is held at a time, so memory stays
+    flat however long the upload is. Lines that are not JSON objects get
+    {"line": n, "error": ...} in their place.
+    Counts against the scheduler's bulk lane until the response ends; 429
+    with Retry-After when the lane is over budget.
+    """
+    scheduler = _SCHEDULER
+    if scheduler is None:
+        return _DuplexStreamingResponse(_stream_results(request.stream()), media_type="application/x-ndjson")
+    if not scheduler.enter_bulk():
+        raise _overloaded(scheduler, BULK)
+    start = time.monotonic()
+
+    async def release():
+        scheduler.leave_bulk(time.monotonic() - start)
+
+    return _DuplexStreamingResponse(_stream_results(request.stream()), media_type="application/x-ndjson",
+                                    background=BackgroundTask(release))
@@ -0,0 +1,147 @@
+# osdag_validator_cli/cache.py
+"""
+Bounded LRU cache for validation results.
+
+Batch files repeat the same (command, args) pairs millions of times; the
+cache sits in front of the command dispatcher so each distinct pair is
+validated once per run. Keys are (command, parsed_args) as produced by the
+dispatcher's argument parsers, so "410" and " 410" share an entry.
+
+TTLCache adds a lock and a per-entry lifetime for caches shared between
+threads, such as the API's /validate response cache.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+MISSING = object()
+
+
+class LRUCache:
+    """Size-bounded least-recently-used mapping with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the cached value (marking it recently used) or `default`.
+
+        Raises TypeError for unhashable keys, like a dict lookup.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        data = self._data
+        data[key] = value
+        data.move_to_end(key)
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def merge_stats(self, stats: dict) -> None:
+        """Fold counters from another cache (e.g. a worker process) into this one."""
+        self.hits += stats.get("hits", 0)
+        self.misses += stats.get("misses", 0)
+        self.evictions += stats.get("evictions", 0)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (
+            f"cache: {s['hits']} hits, {s['misses']} misses, {s['evictions']} evictions "
+            f"({s['hit_rate']:.1%} hit rate, {s['size']}/{s['maxsize']} entries)"
+        )
+
+
+class TTLCache(LRUCache):
+    """
+    Thread-safe LRUCache whose entries also expire `ttl` seconds after they
+    were stored (never, if ttl is None). Expired entries are dropped when
+    they are next looked up and counted as misses.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float | None = None, clock=time.monotonic):
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be > 0 or None")
+        super().__init__(maxsize)
+        self.ttl = ttl
+        self.expirations = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        with self._lock:
+            data = self._data
+            entry = data.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > self._clock():
+                    data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del data[key]
+                self.expirations += 1
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            LRUCache.put(self, key, (value, expires))
+
+    def keys(self) -> list:
+        """Live keys, least recently used first."""
+        now = self._clock()
+        with self._lock:
+            return [k for k, (_, expires) in self._data.items() if expires is None or expires > now]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def merge_stats(self, stats: dict) -> None:
+        with self._lock:
+            LRUCache.merge_stats(self, stats)
+            self.expirations += stats.get("expirations", 0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            s = LRUCache.stats(self)
+        s["expirations"] = self.expirations
+        s["ttl"] = self.ttl
+        return s
+
+
+__all__ = ["LRUCache", "TTLCache", "MISSING"]
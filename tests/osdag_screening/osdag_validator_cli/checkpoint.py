@@ -0,0 +1,108 @@
+# osdag_validator_cli/checkpoint.py
+"""
+Checkpoint state for resumable batch runs.
+
+A checkpoint records how far a batch run has got:
+
+    input_offset   decompressed byte offset in the input just past the last
+                   finished row (None for JSON array input, which resumes by
+                   row index instead)
+    row_index      number of rows whose results are safely in the output
+    output_offset  byte length of the output file at that point
+
+plus the input path, size and modification time (st_mtime_ns) and the
+output path and format, so a checkpoint is never applied to a different
+job, nor to an input edited in place since it was written. save() writes a temporary file, fsyncs it and
+renames it over the old checkpoint, so a crash leaves either the previous
+or the new checkpoint on disk, never a torn one.
+"""
+
+from __future__ import annotations
+import json
+import os
+
+VERSION = 2
+
+
+class BatchCheckpoint:
+    """Progress of one batch run; see the module docstring for the fields."""
+
+    __slots__ = ("input_path", "input_size", "input_mtime_ns", "out_path", "out_format",
+                 "input_offset", "row_index", "output_offset")
+
+    def __init__(self, input_path: str, input_size: int, input_mtime_ns: int, out_path: str, out_format: str,
+                 input_offset: int | None = 0, row_index: int = 0, output_offset: int = 0):
+        self.input_path = input_path
+        self.input_size = input_size
+        self.input_mtime_ns = input_mtime_ns
+        self.out_path = out_path
+        self.out_format = out_format
+        self.input_offset = input_offset
+        self.row_index = row_index
+        self.output_offset = output_offset
+
+    def to_dict(self) -> dict:
+        d = {name: getattr(self, name) for name in self.__slots__}
+        d["version"] = VERSION
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "BatchCheckpoint":
+        if d.get("version") != VERSION:
+            raise ValueError(f"Unsupported checkpoint version {d.get('version')!r}")
+        return cls(**{name: d[name] for name in cls.__slots__})
+
+    def matches(self, other: "BatchCheckpoint") -> bool:
+        """True if both describe the same job (same, unmodified input file and output)."""
+        return self.same_files(other) and (self.input_size, self.input_mtime_ns) == (
+            other.input_size, other.input_mtime_ns)
+
+    def same_files(self, other: "BatchCheckpoint") -> bool:
+        """True if both name the same input and output, whether or not the input changed."""
+        return (self.input_path, self.out_path, self.out_format) == (
+            other.input_path, other.out_path, other.out_format)
+
+
+def load(path: str) -> BatchCheckpoint | None:
+    """Read a checkpoint file; None if it does not exist."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    return BatchCheckpoint.from_dict(data)
+
+
+def save(path: str, state: BatchCheckpoint) -> None:
+    """Atomically replace the checkpoint file with `state` and fsync it."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state.to_dict(), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+
+def remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _fsync_dir(directory: str) -> None:
+    # makes the rename itself durable; not possible on every platform
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+__all__ = ["BatchCheckpoint", "load", "save", "remove"]
@@ -8,8 +8,13 @@ This file exposes:
  - as_number_if_possible(s) -> int/float/str conversion helper
  - format_output / print_result for CLI output
  - cmd_* functions used by the console script
+ - get_dispatch() -> {command: (bound callable, arg parser)} registry, built once
  - run_command(cmd, args) -> dict result (safe for programmatic use)
- - run_batch_file(path, out_path=None, out_format="json")
+ - iter_batch_file(path, workers=1) -> generator of result dicts
+ - iter_rows(rows) / run_rows(rows) -> result dicts / bare results for in-memory (command, args) rows
+ - run_batch_file(path, out_path=None, out_format="json", stream=False, workers=1,
+                  checkpoint=None) -> results list or row count
+ - run_column_file(manifest, out_path=None) -> [(command, bool ndarray)] for .npy/.npz columns
  - main(argv=None) -> exit code for CLI invocation
 
 Designed to be safely called from:
@@ -24,8 +29,21 @@ import argparse
 import json
 import csv
 import os
+from itertools import chain
+from time import perf_counter
 from typing import Any
 
+from .cache import LRUCache, MISSING
+from .jsonstream import iter_json_array, iter_json_lines
+from .writers import get_writer, DEFAULT_FLUSH_BYTES
+from .mmapcsv import iter_csv_rows, iter_csv_rows_from, iter_text_lines, iter_tracked_rows
+from .compression import open_text, open_binary, is_compressed, strip_compression_suffix
+from .diskcache import ResultStore, DEFAULT_MAX_BYTES, row_bytes
+from .results import ResultTable
+from .metrics import Metrics
+from .checkpoint import BatchCheckpoint, load as load_checkpoint, save as save_checkpoint, \
+    remove as remove_checkpoint
+
 # -------------------------
 # Validator import helper
 # -------------------------
@@ -163,96 +181,877 @@ def cmd_validate_plate(args):
 # -------------------------
 # batch helper + CLI runner
 # -------------------------
-def _run_command_by_name(cmd: str, args: list[str]):
-    """Internal runner used by batch and run_command."""
-    v = get_validator()
-    cmd = (cmd or "").strip()
+# Argument parsers: turn the raw args list of a batch row into call arguments.
+def _parse_single(args):
+    return (as_number_if_possible(args[0]) if args else None,)
+
+def _parse_bolt(args):
+    return (args[0] if args else "", args[1] if len(args) > 1 else "")
+
+def _parse_plate(args):
+    t = as_number_if_possible(args[0]) if args else 0
+    w = as_number_if_possible(args[1]) if len(args) > 1 else 0
+    return (t, w)
+
+def _missing_method(name: str):
+    def _raise(*_args):
+        raise AttributeError(f"'Validator' object has no attribute '{name}'")
+    return _raise
+
+# command -> (Validator method, argument parser, fallback if the method is missing)
+COMMAND_SPECS = {
+    "fu": ("validate_fu", _parse_single, None),
+    "fy": ("validate_fy", _parse_single, None),
+    "tf": ("validate_tf", _parse_single, lambda x: False),
+    "bolt": ("validate_bolt", _parse_bolt, lambda s, g: False),
+    "plate": ("validate_plate", _parse_plate, lambda a, b: False),
+}
+
+# commands whose arguments are all numbers -> argument count (columnar pre-parsing)
+NUMERIC_ARITY = {"fu": 1, "fy": 1, "tf": 1, "plate": 2}
+
+# string-valued commands whose answer depends only on a few distinct cell
+# values (bolt size and grade); grouped runs answer them from a validity
+# table per check function, see _run_categorical
+CATEGORICAL_COMMANDS = frozenset({"bolt"})
+VALIDITY_TABLE_SIZE = 4096
+_VALIDITY_TABLES: dict = {}
+
+_DISPATCH: dict | None = None
+_VECTOR_DISPATCH: dict | None = None
+
+def _bound_check(v, method: str):
+    """
+    v.<method>, or None if `v` lacks it. While `v` runs the stock Validator
+    method, the check compiled from the rule table (osdag_validator.COMPILED)
+    is returned instead: same answers and errors, without the try/except and
+    attribute lookups. Subclasses and patched methods keep their own code.
+    """
+    func = getattr(v, method, None)
+    if func is None:
+        return None
     try:
-        if cmd == "fu":
-            val = as_number_if_possible(args[0]) if args else None
-            res = v.validate_fu(val)
-        elif cmd == "fy":
-            val = as_number_if_possible(args[0]) if args else None
-            res = v.validate_fy(val)
-        elif cmd == "tf":
-            val = as_number_if_possible(args[0]) if args else None
-            res = getattr(v, "validate_tf", lambda x: False)(val)
-        elif cmd == "bolt":
-            res = getattr(v, "validate_bolt", lambda s,g: False)(args[0] if args else "", args[1] if len(args)>1 else "")
-        elif cmd == "plate":
-            t = as_number_if_possible(args[0]) if args else 0
-            w = as_number_if_possible(args[1]) if len(args)>1 else 0
-            res = getattr(v, "validate_plate", lambda a,b: False)(t, w)
-        else:
-            res = {"error": f"Unknown command '{cmd}'"}
-    except Exception as e:
-        res = {"error": str(e)}
+        from osdag_validator import Validator, COMPILED
+    except ImportError:
+        return func
+    compiled = COMPILED.get(method[len("validate_"):]) if method.startswith("validate_") else None
+    if compiled is not None and getattr(func, "__func__", None) is getattr(Validator, method, None):
+        return compiled
+    return func
+
+def get_dispatch(refresh: bool = False) -> dict:
+    """
+    Return the command registry: {command: (bound_callable, arg_parser)}.
+
+    Built once from a single shared Validator instance, so the batch hot path
+    does no imports, instantiation or getattr probing per row; stock checks
+    run as the compiled rule functions (see _bound_check).
+    Raises ImportError (via get_validator) if osdag_validator is missing.
+    """
+    global _DISPATCH, _VECTOR_DISPATCH
+    if _DISPATCH is None or refresh:
+        v = get_validator()
+        table = {}
+        for name, (method, parser, fallback) in COMMAND_SPECS.items():
+            func = _bound_check(v, method) or fallback or _missing_method(method)
+            table[name] = (func, parser)
+        _DISPATCH = table
+        _VECTOR_DISPATCH = _build_vector_dispatch(v)
+        _VALIDITY_TABLES.clear()
+    return _DISPATCH
+
+def _build_vector_dispatch(v) -> dict:
+    """{command: Validator.<method>_many} for numeric commands, if numpy is present."""
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return {}
+    table = {}
+    for name in NUMERIC_ARITY:
+        many = getattr(v, COMMAND_SPECS[name][0] + "_many", None)
+        if many is not None:
+            table[name] = many
+    return table
+
+def get_vector_dispatch() -> dict:
+    """Array-in/array-out validators keyed by command (empty without numpy)."""
+    get_dispatch()
+    return _VECTOR_DISPATCH
+
+def _run_command_by_name(cmd: str, args: list[str], dispatch: dict | None = None,
+                         cache: LRUCache | None = None):
+    """Internal runner used by batch and run_command.
+
+    With a cache, results are memoised on (command, parsed args); rows whose
+    parsed args are unhashable (e.g. nested JSON lists) bypass it. Errors are
+    never cached.
+    """
+    if dispatch is None:
+        dispatch = get_dispatch()
+    cmd = (cmd or "").strip()
+    entry = dispatch.get(cmd)
+    if entry is None:
+        res = {"error": f"Unknown command '{cmd}'"}
+    else:
+        func, parser = entry
+        try:
+            res = _invoke(cmd, func, parser(args), cache)
+        except Exception as e:
+            res = {"error": str(e)}
     return {"command": cmd, "args": args, "result": res}
 
-def run_command(cmd: str, args: list[str]):
+def _invoke(cmd: str, func, call_args: tuple, cache: LRUCache | None):
+    """Call a dispatch entry, going through the cache when one is given."""
+    if cache is None:
+        return func(*call_args)
+    key = (cmd, call_args)
+    try:
+        res = cache.get(key)
+    except TypeError:
+        return func(*call_args)
+    if res is MISSING:
+        res = func(*call_args)
+        cache.put(key, res)
+    return res
+
+def run_command(cmd: str, args: list[str], cache: LRUCache | None = None):
     """Public wrapper returning a result dict (no printing)."""
-    return _run_command_by_name(cmd, args)
+    return _run_command_by_name(cmd, args, cache=cache)
+
+def _resolve_batch_path(path: str) -> str:
+    path = os.path.expanduser(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    return path
+
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+
+def _batch_kind(path: str) -> str:
+    """"json", "jsonl" or "csv", from the suffix under any compression suffix."""
+    lower = strip_compression_suffix(path).lower()
+    if lower.endswith(JSON_LINES_SUFFIXES):
+        return "jsonl"
+    if lower.endswith(".json"):
+        return "json"
+    return "csv"
+
+def _parse_rows(f, kind: str):
+    """Yield (command, args) pairs from an open text stream (or iterable of lines)."""
+    if kind == "csv":
+        for row in csv.reader(f):
+            if not row:
+                continue
+            yield row[0].strip(), [c.strip() for c in row[1:]]
+    else:
+        for it in (iter_json_lines(f) if kind == "jsonl" else iter_json_array(f)):
+            yield it.get("command"), it.get("args", [])
+
+def _iter_batch_rows(path: str):
+    """Yield (command, args) pairs from a CSV, JSON or JSON Lines batch file.
+
+    JSON arrays and JSON Lines are parsed incrementally, one command object
+    at a time, so multi-GB exports never have to fit in memory. .gz, .bz2
+    and .xz files are decompressed on the fly; the format comes from the
+    suffix underneath (rows.jsonl.gz is JSON Lines). Plain CSV files are
+    scanned through mmap (see mmapcsv.py).
+    """
+    kind = _batch_kind(path)
+    if kind == "csv" and not is_compressed(path) and os.path.isfile(path):
+        # plain CSV on disk: memory-mapped block scanner, same rows as csv.reader
+        yield from iter_csv_rows(path)
+        return
+    with open_text(path) as f:
+        yield from _parse_rows(f, kind)
+
+def _iter_batch_rows_from(path: str, offset: int = 0, skip: int = 0):
+    """
+    Like _iter_batch_rows, but yields (end_offset, (command, args), raw)
+    where end_offset is the decompressed byte offset just past the row and
+    raw the bytes it was parsed from, and starts reading at `offset`. JSON
+    arrays cannot be entered mid-file: they are re-parsed from the start,
+    the first `skip` rows are dropped, end_offset is None and raw is a
+    stand-in (diskcache.row_bytes). Plain CSV files are scanned through
+    mmap, as in _iter_batch_rows.
+    """
+    kind = _batch_kind(path)
+    if kind == "json":
+        for i, row in enumerate(_iter_batch_rows(path)):
+            if i >= skip:
+                yield None, row, row_bytes(row)
+        return
+    if kind == "csv" and not is_compressed(path) and os.path.isfile(path):
+        # plain CSV on disk: the memory-mapped scanner, tracking offsets
+        yield from iter_csv_rows_from(path, offset)
+        return
+    with open_binary(path) as f:
+        if offset:
+            f.seek(offset)
+        # newlines are translated as in _iter_batch_rows' text-mode read, so
+        # a resumed or cached run parses exactly the rows a plain run does
+        yield from iter_tracked_rows(iter_text_lines(f), lambda lines: _parse_rows(lines, kind), offset)
+
+def _run_block(rows, dispatch: dict, cache: LRUCache | None = None):
+    """
+    Validate a block of rows using the typed columnar pre-parse; yields
+    result dicts in row order.
+
+    Numeric argument columns are parsed once into float arrays; when numpy
+    is available each numeric command present in the block is checked over
+    the whole column with the Validator *_many methods, otherwise each row
+    gets a clean float. Rows with a missing or non-numeric argument are
+    invalid without calling the validator. Rows the pre-parser could not
+    type (non-string cells) and other commands take the per-row path.
+    Results are the same as _run_command_by_name.
+    """
+    from .columnar import parse_block, column_view, VALID, INVALID
+
+    block = parse_block(rows, NUMERIC_ARITY)
+    commands = block.commands
+    vector = get_vector_dispatch()
+    checked = {}
+    for name in set(commands).intersection(vector):
+        cols = [column_view(block.values[j]) for j in range(NUMERIC_ARITY[name])]
+        checked[name] = vector[name](*cols).tolist()
+
+    st0 = block.state[0]
+    st1 = block.state[1]
+    v0 = block.values[0]
+    v1 = block.values[1]
+    arity_get = NUMERIC_ARITY.get
+    for i, (cmd, args) in enumerate(rows):
+        name = commands[i]
+        k = arity_get(name)
+        entry = dispatch.get(name)
+        if k is None or entry is None:
+            yield _run_command_by_name(cmd, args, dispatch, cache)
+            continue
+        s0 = st0[i]
+        if k == 1:
+            ok = s0 == VALID
+            bad = s0 == INVALID
+        else:
+            s1 = st1[i]
+            ok = s0 == VALID and s1 == VALID
+            # one unparseable cell already makes the plate invalid
+            bad = (s0 == INVALID or s1 == INVALID) and not ok
+        if ok:
+            if name in checked:
+                res = checked[name][i]
+            else:
+                try:
+                    res = _invoke(name, entry[0], (v0[i],) if k == 1 else (v0[i], v1[i]), cache)
+                except Exception as e:
+                    res = {"error": str(e)}
+        elif bad:
+            res = False
+        else:
+            yield _run_command_by_name(cmd, args, dispatch, cache)
+            continue
+        yield {"command": name, "args": args, "result": res}
+
+def _run_vector_bucket(name: str, rows, dispatch: dict, cache: LRUCache | None = None) -> list:
+    """
+    Result dicts for rows that all carry the numeric command `name`.
+
+    The whole bucket is one *_many call; the per-row branching of
+    _run_block becomes array arithmetic on the state masks, and only rows
+    with an untyped (RAW) cell and no invalid one take the per-row path.
+    """
+    import numpy as np
+    from .columnar import parse_columns, column_view, VALID, INVALID
+
+    k = NUMERIC_ARITY[name]
+    block = parse_columns(rows, k)
+    states = [np.frombuffer(block.state[j], dtype=np.uint8) for j in range(k)]
+    ok = states[0] == VALID
+    bad = states[0] == INVALID
+    for st in states[1:]:
+        ok &= st == VALID
+        bad |= st == INVALID
+    results = (get_vector_dispatch()[name](*(column_view(block.values[j]) for j in range(k))) & ok).tolist()
+    out = [{"command": name, "args": args, "result": res} for (_, args), res in zip(rows, results)]
+    for i in np.flatnonzero(~(ok | bad)).tolist():
+        out[i] = _run_command_by_name(*rows[i], dispatch, cache)
+    return out
+
+def _run_categorical(name: str, rows, entry: tuple) -> list:
+    """
+    Result dicts for rows that all carry the categorical command `name`.
+
+    Each distinct argument tuple is checked once: the bool answer is kept
+    in the validity table of the command's check function (at most
+    VALIDITY_TABLE_SIZE entries each), which outlives the block, so later
+    blocks of the run only look rows up. Unhashable arguments and errors
+    are never stored and take the check every time.
+    """
+    func, parser = entry
+    table = _VALIDITY_TABLES.get(func)
+    if table is None:
+        table = _VALIDITY_TABLES[func] = {}
+    get = table.get
+    out = []
+    for _, args in rows:
+        key = tuple(args)
+        try:
+            res = get(key)
+        except TypeError:
+            key = res = None
+        if res is None:
+            try:
+                res = func(*parser(args))
+            except Exception as e:
+                res = {"error": str(e)}
+            else:
+                if key is not None and type(res) is bool and len(table) < VALIDITY_TABLE_SIZE:
+                    table[key] = res
+        out.append({"command": name, "args": args, "result": res})
+    return out
+
+def _run_bucket(name: str, rows, dispatch: dict, cache: LRUCache | None, vector: dict) -> list:
+    """Result dicts for rows that all carry the (stripped) command `name`."""
+    entry = dispatch.get(name)
+    if entry is None:
+        return [_run_command_by_name(cmd, args, dispatch, cache) for cmd, args in rows]
+    if name in vector:
+        return _run_vector_bucket(name, rows, dispatch, cache)
+    if name in NUMERIC_ARITY:
+        return list(_run_block(rows, dispatch, cache))
+    if name in CATEGORICAL_COMMANDS and cache is None:
+        return _run_categorical(name, rows, entry)
+    func, parser = entry
+    out = []
+    for _, args in rows:
+        try:
+            res = _invoke(name, func, parser(args), cache)
+        except Exception as e:
+            res = {"error": str(e)}
+        out.append({"command": name, "args": args, "result": res})
+    return out
+
+def _run_grouped(rows, dispatch: dict, cache: LRUCache | None = None, metrics: Metrics | None = None) -> list:
+    """
+    Validate a block of rows grouped by command; returns result dicts in row order.
+
+    Planner for mixed files: rows are bucketed by (stripped) command with
+    their row indices, each bucket runs as one homogeneous block -- the
+    columnar pre-parse and *_many checks for numeric commands, the validity
+    table for categorical ones (without an LRU cache, whose counters it
+    would bypass), otherwise one handler looked up once and called row
+    after row -- and the results are scattered back to the original
+    positions. A block with a single raw command spelling skips the
+    bucketing. Results are the same as _run_command_by_name. With
+    `metrics` the bucketing is timed as the dispatch phase and the buckets
+    as validate.
+    """
+    if metrics is not None:
+        t0 = perf_counter()
+    vector = get_vector_dispatch()
+    try:
+        spellings = set([cmd for cmd, _ in rows])
+    except TypeError:  # an unhashable command cell
+        spellings = ()
+    if len(spellings) == 1:
+        cmd = next(iter(spellings))
+        name = cmd.strip() if type(cmd) is str else (cmd or "").strip()
+        if metrics is not None:
+            t1 = perf_counter()
+            metrics.observe("dispatch", t1 - t0)
+        out = _run_bucket(name, rows, dispatch, cache, vector)
+        if metrics is not None:
+            metrics.observe("validate", perf_counter() - t1)
+        return out
+
+    buckets: dict = {}
+    names: dict = {}
+    for i, (cmd, _) in enumerate(rows):
+        if type(cmd) is str:
+            name = names.get(cmd)
+            if name is None:
+                name = names[cmd] = cmd.strip()
+        else:
+            name = (cmd or "").strip()
+        idx = buckets.get(name)
+        if idx is None:
+            buckets[name] = [i]
+        else:
+            idx.append(i)
+
+    out = [None] * len(rows)
+    if metrics is not None:
+        t1 = perf_counter()
+        metrics.observe("dispatch", t1 - t0)
+    for name, idx in buckets.items():
+        for i, res in zip(idx, _run_bucket(name, [rows[i] for i in idx], dispatch, cache, vector)):
+            out[i] = res
+    if metrics is not None:
+        metrics.observe("validate", perf_counter() - t1)
+    return out
+
+# rows per task sent to a worker process; large enough to amortise pickling
+BATCH_CHUNK_SIZE = 2000
+
+_WORKER_CACHE: LRUCache | None = None
 
-def run_batch_file(path: str, out_path: str | None = None, out_format: str = "json"):
+def _chunk_results(rows, dispatch: dict, cache: LRUCache | None, preparse: bool) -> list:
+    """Bare result values for a list of rows."""
+    if preparse:
+        return [r["result"] for r in _run_grouped(rows, dispatch, cache)]
+    return [_run_command_by_name(cmd, args, dispatch, cache)["result"] for cmd, args in rows]
+
+def _run_chunk(rows, cache_size: int = 0, preparse: bool = False):
+    """Worker-process entry point: validate one chunk of (command, args) rows.
+
+    Only the bare results travel back; the parent already holds the rows and
+    rebuilds the result dicts, which halves the pickling cost. With
+    cache_size each worker keeps its own LRU cache and returns the counter
+    deltas for this chunk so the parent can report totals.
+    """
+    global _WORKER_CACHE
+    dispatch = get_dispatch()
+    cache = None
+    if cache_size:
+        if _WORKER_CACHE is None or _WORKER_CACHE.maxsize != cache_size:
+            _WORKER_CACHE = LRUCache(cache_size)
+        cache = _WORKER_CACHE
+        before = cache.stats()
+    results = _chunk_results(rows, dispatch, cache, preparse)
+    delta = {}
+    if cache is not None:
+        after = cache.stats()
+        delta = {k: after[k] - before[k] for k in ("hits", "misses", "evictions")}
+    return results, delta
+
+def _chunked(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _iter_parallel(rows, workers: int, chunk_size: int, cache: LRUCache | None = None,
+                   preparse: bool = False):
+    """
+    Run rows on a process pool and yield results in input order.
+
+    Futures are consumed FIFO, and at most 2 * workers chunks are in flight,
+    so memory stays bounded while every worker has work queued.
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache_size = cache.maxsize if cache is not None else 0
+
+    def _collect(chunk, future):
+        results, delta = future.result()
+        if cache is not None:
+            cache.merge_stats(delta)
+        for (cmd, args), res in zip(chunk, results):
+            yield {"command": (cmd or "").strip(), "args": args, "result": res}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunked(rows, chunk_size):
+            pending.append((chunk, pool.submit(_run_chunk, chunk, cache_size, preparse)))
+            if len(pending) >= 2 * workers:
+                yield from _collect(*pending.popleft())
+        while pending:
+            yield from _collect(*pending.popleft())
+
+# bump when the results for the same input rows change in a way the
+# sources hashed by result_cache_version() do not capture
+RESULT_FORMAT = 1
+
+_RESULT_CACHE_VERSION: str | None = None
+
+def result_cache_version() -> str:
+    """
+    Version key for the on-disk result cache: RESULT_FORMAT, the compiled
+    rule set, the marshal format and the source of the code that turns rows
+    into results -- the Validator module, this module (argument parsers,
+    as_number_if_possible, the grouped planner) and columnar.py. Editing a
+    limit, a validator method or the argument parsing makes every cached
+    block a miss.
+    """
+    global _RESULT_CACHE_VERSION
+    if _RESULT_CACHE_VERSION is None:
+        import hashlib
+        import inspect
+        import marshal
+        from osdag_validator.rules import RULES_VERSION
+        from . import columnar
+        h = hashlib.sha256(f"{RESULT_FORMAT}:{RULES_VERSION}:{marshal.version}:".encode())
+        for module in (inspect.getmodule(type(get_validator())), sys.modules[__name__], columnar):
+            try:
+                h.update(inspect.getsource(module).encode("utf-8"))
+            except (OSError, TypeError):
+                pass
+        _RESULT_CACHE_VERSION = h.hexdigest()[:16]
+    return _RESULT_CACHE_VERSION
+
+def _iter_stored(items, store: ResultStore, workers: int, chunk_size: int,
+                 cache: LRUCache | None, preparse: bool):
+    """
+    Replay result blocks from `store` and validate only the chunks it lacks.
+
+    `items` yields ((command, args), raw_bytes) pairs, which are split into
+    content-defined chunks (see diskcache.iter_chunks);
+    missing chunks are validated in-process or, with workers > 1, on a
+    process pool (at most 2 * workers in flight), then stored.
+    """
+    from collections import deque
+    from .diskcache import iter_chunks
+
+    pool = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers)
+    dispatch = get_dispatch()
+    cache_size = cache.maxsize if cache is not None else 0
+
+    def _collect(chunk, key, job):
+        if pool is not None and not isinstance(job, list):
+            job, delta = job.result()
+            if cache is not None:
+                cache.merge_stats(delta)
+            store.put(key, job)
+        for (cmd, args), res in zip(chunk, job):
+            yield {"command": (cmd or "").strip(), "args": args, "result": res}
+
+    try:
+        pending = deque()
+        for chunk, key in iter_chunks(items, result_cache_version(), max_rows=max(chunk_size, 256)):
+            job = store.get(key)
+            if job is None:
+                if pool is not None:
+                    job = pool.submit(_run_chunk, chunk, cache_size, preparse)
+                else:
+                    job = _chunk_results(chunk, dispatch, cache, preparse)
+                    store.put(key, job)
+            pending.append((chunk, key, job))
+            if len(pending) > (2 * workers if pool is not None else 0):
+                yield from _collect(*pending.popleft())
+        while pending:
+            yield from _collect(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+def _iter_blocks(rows, dispatch: dict, cache: LRUCache | None, block_size: int):
+    for block in _chunked(rows, block_size):
+        yield from _run_grouped(block, dispatch, cache)
+
+def _iter_metered(rows, workers: int, chunk_size: int, cache: LRUCache | None, preparse: bool,
+                  result_store: ResultStore | None, metrics: Metrics):
+    """
+    Blocks (lists) of result dicts, as _iter_results would produce them,
+    recording outcome counts and phase timings in `metrics` per block:
+    reading a block of rows is the parse phase; with preparse the grouping
+    is dispatch and the checks validate, otherwise the per-row dispatch and
+    checks together are validate. Parallel and result-store runs parse and
+    validate elsewhere (worker processes, cached blocks): only their
+    outcomes are counted.
+    """
+    if workers != 1 or result_store is not None:
+        for block in _chunked(_iter_results(rows, workers, chunk_size, cache, preparse, result_store), chunk_size):
+            metrics.count_results(block)
+            yield block
+        return
+    dispatch = get_dispatch()
+    blocks = _chunked(rows, chunk_size)
+    while True:
+        t0 = perf_counter()
+        block = next(blocks, None)
+        if block is None:
+            return
+        t1 = perf_counter()
+        metrics.observe("parse", t1 - t0)
+        if preparse:
+            results = _run_grouped(block, dispatch, cache, metrics)
+        else:
+            results = [_run_command_by_name(cmd, args, dispatch, cache) for cmd, args in block]
+            metrics.observe("validate", perf_counter() - t1)
+        metrics.count_results(results)
+        yield results
+
+def _write_all(writer, results, metrics: Metrics | None = None) -> int:
+    """writer.write_all(results); with `metrics` each block of results written is timed as serialize."""
+    if metrics is None:
+        return writer.write_all(results)
+    for block in _chunked(results, BATCH_CHUNK_SIZE):
+        t0 = perf_counter()
+        for r in block:
+            writer.write(r)
+        metrics.observe("serialize", perf_counter() - t0)
+    writer.close()
+    return writer.count
+
+def iter_batch_file(path: str, workers: int = 1, chunk_size: int = BATCH_CHUNK_SIZE,
+                    cache: LRUCache | None = None, preparse: bool = False,
+                    result_store: ResultStore | None = None, metrics: Metrics | None = None):
+    """
+    Generator over the result dicts of a CSV or JSON batch file.
+
+    Rows are read and validated one at a time, so memory use does not grow
+    with the size of the file. FileNotFoundError is raised immediately.
+    With workers > 1 (0 = one per CPU) rows are validated in chunks on a
+    process pool; results still come back in input order.
+    An LRUCache memoises repeated (command, args) rows; in parallel mode
+    each worker keeps its own cache of the same size and the counters are
+    merged into `cache`.
+    preparse=True groups each chunk of rows by command and runs every group
+    as one typed columnar block (see _run_grouped and columnar.py), so
+    malformed numbers cost no exceptions; results keep input order.
+    A ResultStore replays result blocks cached on disk by earlier runs and
+    only validates the chunks of the file that changed.
+    A Metrics object (metrics.py) records outcome counts and phase timings.
+    """
+    path = _resolve_batch_path(path)
+    if result_store is not None:
+        items = ((row, raw) for _, row, raw in _iter_batch_rows_from(path))
+        return _iter_results(items, workers, chunk_size, cache, preparse, result_store, metrics)
+    return _iter_results(_iter_batch_rows(path), workers, chunk_size, cache, preparse, metrics=metrics)
+
+def _iter_results(rows, workers: int = 1, chunk_size: int = BATCH_CHUNK_SIZE,
+                  cache: LRUCache | None = None, preparse: bool = False,
+                  result_store: ResultStore | None = None, metrics: Metrics | None = None):
+    """
+    Result dicts for an iterable of (command, args) rows; see iter_batch_file.
+    With a result_store the iterable yields ((command, args), raw_bytes).
+    """
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if metrics is not None:
+        return chain.from_iterable(_iter_metered(rows, workers, chunk_size, cache, preparse,
+                                                 result_store, metrics))
+    if result_store is not None:
+        return _iter_stored(rows, result_store, workers, chunk_size, cache, preparse)
+    if workers > 1:
+        return _iter_parallel(rows, workers, chunk_size, cache, preparse)
+    dispatch = get_dispatch()
+    if preparse:
+        return _iter_blocks(rows, dispatch, cache, chunk_size)
+    return (_run_command_by_name(cmd, args, dispatch, cache) for cmd, args in rows)
+
+def iter_rows(rows, preparse: bool = True, cache: LRUCache | None = None, metrics: Metrics | None = None):
+    """
+    Result dicts for an iterable of (command, args) rows, in input order.
+
+    The in-memory counterpart of iter_batch_file for callers that already
+    hold the rows (e.g. the HTTP batch endpoints); same dispatcher, same
+    grouped columnar execution with preparse=True.
+    """
+    return _iter_results(rows, cache=cache, preparse=preparse, metrics=metrics)
+
+def run_rows(rows, preparse: bool = True, cache: LRUCache | None = None, metrics: Metrics | None = None) -> list:
+    """Bare results for (command, args) rows, in input order; see iter_rows."""
+    return [r["result"] for r in iter_rows(rows, preparse, cache, metrics)]
+
+def _open_output(out_path: str, out_format: str, mode: str = "w"):
+    newline = "" if out_format == "csv" else None
+    return open_text(os.path.expanduser(out_path), mode, newline=newline)
+
+# rows between checkpoints; each one costs two fsyncs
+DEFAULT_CHECKPOINT_EVERY = 50_000
+
+def _run_checkpointed(path: str, out_path: str | None, out_format: str, checkpoint_path: str,
+                      every: int, workers: int, cache: LRUCache | None, preparse: bool,
+                      flush_bytes: int, result_store: ResultStore | None = None,
+                      metrics: Metrics | None = None) -> int:
+    """
+    Streaming batch run that records a checkpoint every `every` rows.
+
+    If `checkpoint_path` holds a checkpoint for the same job, the output is
+    truncated back to the checkpointed length and the run continues from
+    the recorded input offset, appending; finished rows are not validated
+    again. The checkpoint is removed once the output is complete.
+    """
+    if not out_path:
+        raise ValueError("checkpointed runs need an output file (--out)")
+    if is_compressed(out_path):
+        raise ValueError("checkpointed runs cannot write compressed output")
+    if every < 1:
+        raise ValueError("checkpoint interval must be >= 1")
+    path = _resolve_batch_path(path)
+    out_path = os.path.expanduser(out_path)
+    st = os.stat(path)
+    job = BatchCheckpoint(os.path.abspath(path), st.st_size, st.st_mtime_ns, os.path.abspath(out_path),
+                          out_format, input_offset=None if _batch_kind(path) == "json" else 0)
+
+    state = load_checkpoint(checkpoint_path)
+    if state is None:
+        state = job
+        f = _open_output(out_path, out_format)
+    elif not state.same_files(job):
+        raise ValueError(f"checkpoint {checkpoint_path} belongs to a different batch job")
+    elif not state.matches(job):
+        raise ValueError(f"{path} changed since checkpoint {checkpoint_path} was written; "
+                         f"delete the checkpoint to start over")
+    else:
+        # anything past the checkpoint may be partial; it is regenerated below
+        os.truncate(out_path, state.output_offset)
+        f = _open_output(out_path, out_format, "a")
+
+    from collections import deque
+    offsets = deque()  # input offsets of rows read ahead of their results
+
+    def rows():
+        for end, row, raw in _iter_batch_rows_from(path, state.input_offset or 0, state.row_index):
+            offsets.append(end)
+            yield (row, raw) if result_store is not None else row
+
+    with f:
+        writer = get_writer(out_format, f, flush_bytes)
+        writer.count = state.row_index  # so JSON/text resume after a separator, not "["
+        since = 0
+        for result in _iter_results(rows(), workers, BATCH_CHUNK_SIZE, cache, preparse, result_store, metrics):
+            writer.write(result)
+            end = offsets.popleft()
+            since += 1
+            if since >= every:
+                writer.flush()
+                os.fsync(f.fileno())
+                state.input_offset = end
+                state.row_index = writer.count
+                state.output_offset = f.tell()
+                save_checkpoint(checkpoint_path, state)
+                since = 0
+        writer.close()
+        os.fsync(f.fileno())
+    remove_checkpoint(checkpoint_path)
+    return writer.count
+
+def run_batch_file(path: str, out_path: str | None = None, out_format: str = "json", stream: bool = False,
+                   workers: int = 1, cache: LRUCache | None = None, preparse: bool = False,
+                   flush_bytes: int = DEFAULT_FLUSH_BYTES, checkpoint: str | None = None,
+                   checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+                   result_store: ResultStore | None = None, compact: bool = False,
+                   metrics: Metrics | None = None):
     """
     Reads CSV or JSON batch file and runs commands.
     CSV format: each row -> command, arg1, arg2, ...
     JSON format: a list of {"command": "fu", "args": ["410"]}
+    JSON Lines (.jsonl/.ndjson): one {"command": ..., "args": [...]} per line
+    Input and out_path ending in .gz, .bz2 or .xz are (de)compressed as a
+    stream.
+
+    By default all results are returned as a list (and written to out_path,
+    if given, once the run completes); compact=True returns a ResultTable
+    instead, a read-only sequence of the same dicts stored column-wise
+    (see results.py) at a fraction of the memory. With stream=True each result is
+    written to out_path (stdout if None) as soon as it is produced and the
+    number of rows processed is returned instead; memory stays constant.
+    workers > 1 validates chunks of rows on that many processes (0 = all
+    CPUs); the output is identical to a serial run. Pass an LRUCache as
+    `cache` to memoise repeated rows; its stats() hold the run's counters.
+    preparse=True enables the typed columnar pre-parsing stage; numeric
+    rows checked column-wise by the *_many methods do not touch the cache.
+    Output formats: json, jsonl, csv, text. Writers buffer output and flush
+    every `flush_bytes` characters (0 = after every row).
+    checkpoint=FILE makes the run resumable: every `checkpoint_every` rows
+    the input offset, row count and output length are fsynced to FILE, and
+    a later call with the same arguments continues from there. Implies
+    stream=True and needs an uncompressed out_path.
+    result_store: an on-disk ResultStore (see diskcache.py) to replay
+    unchanged chunks from.
+    metrics: a Metrics object (see metrics.py) that receives the outcome
+    counts, phase timings and rows/sec of the run.
     """
-    path = os.path.expanduser(path)
-    if not os.path.exists(path):
-        raise FileNotFoundError(path)
-    results = []
-    if path.lower().endswith(".json"):
-        with open(path, "r", encoding="utf-8") as f:
-            items = json.load(f)
-            if not isinstance(items, list):
-                raise ValueError("JSON batch file must contain a list of commands")
-            for it in items:
-                cmd = it.get("command")
-                args = it.get("args", [])
-                results.append(_run_command_by_name(cmd, args))
-    else:
-        with open(path, "r", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                if not row:
-                    continue
-                cmd = row[0].strip()
-                args = [c.strip() for c in row[1:]]
-                results.append(_run_command_by_name(cmd, args))
+    if metrics is not None:
+        start = perf_counter()
+        rows = _run_batch_file(path, out_path, out_format, stream, workers, cache, preparse, flush_bytes,
+                               checkpoint, checkpoint_every, result_store, compact, metrics)
+        metrics.record_batch(rows if type(rows) is int else len(rows), perf_counter() - start)
+        return rows
+    return _run_batch_file(path, out_path, out_format, stream, workers, cache, preparse, flush_bytes,
+                           checkpoint, checkpoint_every, result_store, compact)
+
+def _run_batch_file(path, out_path, out_format, stream, workers, cache, preparse, flush_bytes,
+                    checkpoint, checkpoint_every, result_store, compact, metrics=None):
+    if checkpoint:
+        return _run_checkpointed(path, out_path, out_format, checkpoint, checkpoint_every,
+                                 workers, cache, preparse, flush_bytes, result_store, metrics)
+    results = iter_batch_file(path, workers=workers, cache=cache, preparse=preparse,
+                              result_store=result_store, metrics=metrics)
+    if stream:
+        if out_path:
+            with _open_output(out_path, out_format) as f:
+                return _write_all(get_writer(out_format, f, flush_bytes), results, metrics)
+        return _write_all(get_writer(out_format, sys.stdout, flush_bytes), results, metrics)
+
+    results = ResultTable(results) if compact else list(results)
     if out_path:
-        out_path = os.path.expanduser(out_path)
-        if out_format == "json":
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
-        elif out_format == "csv":
-            with open(out_path, "w", encoding="utf-8", newline='') as f:
-                w = csv.writer(f)
-                for r in results:
-                    w.writerow([r.get("command")] + list(map(str, r.get("args", []))) + [r.get("result")])
-        else:
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(str(results))
+        with _open_output(out_path, out_format) as f:
+            _write_all(get_writer(out_format, f, flush_bytes), results, metrics)
     return results
 
+def run_column_file(manifest_path: str, out_path: str | None = None):
+    """
+    Validate .npy/.npz columns named by a manifest (see npyinput.py) with
+    the vectorized checks. Results go to out_path (.npy or .npz) and are
+    returned as [(command, bool ndarray)]. Requires numpy.
+    """
+    from .npyinput import run_column_batch
+    vector = get_vector_dispatch()
+    if not vector:
+        raise ImportError("Column batch input requires numpy. Install it with `pip install numpy`.")
+    return run_column_batch(os.path.expanduser(manifest_path), vector,
+                            {k: v for k, v in NUMERIC_ARITY.items() if k in vector}, out_path)
+
+def _cmd_batch_columns(args):
+    try:
+        results = run_column_file(args.path, args.out)
+    except Exception as e:
+        print(f"Batch error: {e}", file=sys.stderr)
+        return 2
+    summary = [{"command": cmd, "rows": int(res.size), "valid": int(res.sum())} for cmd, res in results]
+    print(json.dumps(summary, indent=2))
+    return 0
+
+def _open_result_store(args) -> ResultStore | None:
+    if args.no_cache:
+        return None
+    try:
+        return ResultStore(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024)
+    except (OSError, ValueError) as e:
+        print(f"Result cache disabled: {e}", file=sys.stderr)
+        return None
+
 def cmd_batch(args):
+    if args.columns:
+        return _cmd_batch_columns(args)
+    cache = LRUCache(args.cache_size) if args.cache_size > 0 and not args.no_cache else None
+    store = _open_result_store(args)
+    metrics = None
+    if args.stats:
+        metrics = Metrics()
+        if cache is not None:
+            metrics.register_cache("lru", cache.stats)
+        if store is not None:
+            metrics.register_cache("result_store", store.stats)
+    # Printing to stdout always streams; only "--out without --stream" keeps
+    # the historical write-the-file-then-echo-everything behaviour.
+    stream = args.stream or not args.out or bool(args.checkpoint)
     try:
-        results = run_batch_file(args.path, out_path=args.out, out_format=args.format)
+        results = run_batch_file(args.path, out_path=args.out, out_format=args.format,
+                                 stream=stream, workers=args.workers, cache=cache,
+                                 preparse=args.preparse, flush_bytes=args.flush_bytes,
+                                 checkpoint=args.checkpoint, checkpoint_every=args.checkpoint_every,
+                                 result_store=store, compact=True, metrics=metrics)
     except Exception as e:
         print(f"Batch error: {e}", file=sys.stderr)
         return 2
-    if args.format == "json":
-        print(json.dumps(results, ensure_ascii=False, indent=2))
-    elif args.format == "csv":
-        import io
-        buf = io.StringIO()
-        w = csv.writer(buf)
-        for r in results:
-            w.writerow([r.get("command")] + list(map(str, r.get("args", []))) + [r.get("result")])
-        print(buf.getvalue())
-    else:
-        print(results)
+    finally:
+        if cache is not None:
+            print(cache.format_stats(), file=sys.stderr)
+        if metrics is not None:
+            print(metrics.format_stats(), file=sys.stderr)
+    if not stream:
+        get_writer(args.format, sys.stdout, args.flush_bytes).write_all(results)
+    if (not args.out or not stream) and args.format != "jsonl":
+        print()  # historical trailing newline; JSON Lines already ends with one
     return 0
 
 # ---------- CLI entry ----------
@@ -289,9 +1088,39 @@ def main(argv=None):
     p_plate.set_defaults(func=cmd_validate_plate)
 
     p_batch = sub.add_parser("batch")
-    p_batch.add_argument("path", help="CSV or JSON file containing commands")
+    p_batch.add_argument("path", help="CSV, JSON or JSON Lines (.jsonl/.ndjson) file containing commands")
     p_batch.add_argument("--out", "-o", help="Output file to write results")
-    p_batch.add_argument("--format", choices=("json","csv","text"), default="json", help="Output format for batch")
+    p_batch.add_argument("--format", choices=("json","jsonl","csv","text"), default="json", help="Output format for batch")
+    p_batch.add_argument("--stream", action="store_true",
+                         help="Write each result as it is produced (constant memory)")
+    p_batch.add_argument("--workers", "-j", type=int, default=1,
+                         help="Worker processes for validation (0 = one per CPU)")
+    p_batch.add_argument("--cache-size", type=int, default=0,
+                         help="Memoise up to N distinct (command, args) results (0 = off); "
+                              "hit/miss/eviction counts are printed to stderr")
+    p_batch.add_argument("--flush-bytes", type=int, default=DEFAULT_FLUSH_BYTES,
+                         help="Flush output every N characters (0 = after every row)")
+    p_batch.add_argument("--preparse", action="store_true",
+                         help="Group each block of rows by command and pre-parse argument columns "
+                              "(vectorized checks; faster on mixed or malformed input)")
+    p_batch.add_argument("--columns", action="store_true",
+                         help="PATH is a JSON manifest of .npy/.npz columns; --out takes a .npy or .npz "
+                              "file of boolean results")
+    p_batch.add_argument("--checkpoint", metavar="FILE",
+                         help="Record progress in FILE and resume from it if it exists (needs --out)")
+    p_batch.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY, metavar="N",
+                         help=f"Rows between checkpoints (default {DEFAULT_CHECKPOINT_EVERY})")
+    p_batch.add_argument("--no-cache", action="store_true",
+                         help="Validate every row; do not read or write the on-disk result cache "
+                              "(also disables --cache-size)")
+    p_batch.add_argument("--cache-dir", metavar="DIR",
+                         help="On-disk result cache directory (default $OSDAG_VAL_CACHE_DIR or "
+                              "~/.cache/osdag-validator/results)")
+    p_batch.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar="MB",
+                         help="Size limit of the on-disk result cache; least recently used blocks are evicted")
+    p_batch.add_argument("--stats", action="store_true",
+                         help="Print rows/sec, valid/invalid/error counts per command, phase timings "
+                              "and cache hit rates to stderr")
     p_batch.set_defaults(func=cmd_batch)
 
     if not argv:
@@ -316,9 +1145,15 @@ if __name__ == "__main__":
 # Exports
 __all__ = [
     "get_validator",
+    "get_dispatch",
+    "get_vector_dispatch",
     "as_number_if_possible",
     "run_command",
+    "iter_batch_file",
+    "iter_rows",
+    "run_rows",
     "run_batch_file",
+    "run_column_file",
     "format_output",
     "print_result",
 ]
@@ -0,0 +1,81 @@
+# osdag_validator_cli/coalesce.py
+"""
+Micro-batching of concurrent single-row validations.
+
+Coalescer.submit(command, args) parks the call on an asyncio future. Calls
+for the same command that arrive within `max_wait` seconds of the first are
+gathered into one group, closed early once it holds `max_items` rows; the
+group is then validated with a single run_rows() call -- the grouped,
+vectorized batch path -- and every future is resolved with its own result.
+
+The trade is latency for per-call overhead: a request may wait up to
+max_wait for company. Results are the batch dispatcher's, so a failing
+check comes back as {"error": ...} rather than an exception.
+"""
+
+from __future__ import annotations
+import asyncio
+from typing import Any, Callable
+
+DEFAULT_MAX_WAIT = 0.001
+
+
+class Coalescer:
+    """Groups concurrent (command, args) validations per command; see the module docstring."""
+
+    def __init__(self, run_rows: Callable[[list], list], max_items: int, max_wait: float = DEFAULT_MAX_WAIT):
+        if max_items < 1:
+            raise ValueError("max_items must be >= 1")
+        if max_wait < 0:
+            raise ValueError("max_wait must be >= 0")
+        self.run_rows = run_rows
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self._groups: dict = {}  # command -> ([args], [future], timer handle)
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, command: str, args: list) -> Any:
+        """Result of validating one row, computed together with its neighbours."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        group = self._groups.get(command)
+        if group is None:
+            timer = loop.call_later(self.max_wait, self._flush, command)
+            group = self._groups[command] = ([], [], timer)
+        group[0].append(args)
+        group[1].append(future)
+        if len(group[1]) >= self.max_items:
+            self._flush(command)
+        return await future
+
+    def _flush(self, command: str) -> None:
+        group = self._groups.pop(command, None)
+        if group is None:
+            return
+        arg_lists, futures, timer = group
+        timer.cancel()
+        self.batches += 1
+        self.rows += len(futures)
+        try:
+            results = self.run_rows([(command, args) for args in arg_lists])
+        except Exception as e:
+            for f in futures:
+                if not f.done():
+                    f.set_exception(e)
+            return
+        for f, res in zip(futures, results):
+            if not f.done():  # the request may have been cancelled meanwhile
+                f.set_result(res)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch": (self.rows / self.batches) if self.batches else 0.0,
+            "max_items": self.max_items,
+            "max_wait": self.max_wait,
+        }
+
+
+__all__ = ["Coalescer", "DEFAULT_MAX_WAIT"]
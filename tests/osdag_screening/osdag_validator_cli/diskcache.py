@@ -0,0 +1,192 @@
+# osdag_validator_cli/diskcache.py
+"""
+Content-addressed on-disk cache of batch result blocks.
+
+iter_chunks() splits a stream of (command, args) rows into chunks whose
+boundaries depend on the row contents (a row ends a chunk when the CRC of
+its raw input bytes has the low CHUNK_MASK bits clear, within
+MIN_ROWS..MAX_ROWS). Inserting or editing a few rows therefore changes only
+the chunks around them; every other chunk keeps its boundaries and its key.
+The key is a BLAKE2b digest of the chunk's raw bytes keyed with the cache
+version (rule set, validator code and the CLI code that parses rows into
+results; see cli.result_cache_version), so a rule change invalidates
+everything. Hashing the bytes as read keeps replay far cheaper than
+validating.
+
+ResultStore keeps one file per chunk key holding the marshalled list of
+results, under a two-level fan-out directory. Reads touch the file's mtime
+and the store evicts the least recently used files once the total size
+passes max_bytes. Files are written to a temporary name and renamed, so a
+concurrent or interrupted run never sees a partial block; unreadable blocks
+count as misses.
+"""
+
+from __future__ import annotations
+import hashlib
+import marshal
+import os
+from typing import Iterable, Iterator
+from zlib import crc32
+
+MIN_ROWS = 256
+MAX_ROWS = 8192
+CHUNK_MASK = 0x3FF  # ~1024 rows per chunk on average
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> str:
+    """$OSDAG_VAL_CACHE_DIR, else $XDG_CACHE_HOME/osdag-validator/results."""
+    env = os.environ.get("OSDAG_VAL_CACHE_DIR")
+    if env:
+        return os.path.expanduser(env)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "osdag-validator", "results")
+
+
+def iter_chunks(items: Iterable, version: str, min_rows: int = MIN_ROWS, max_rows: int = MAX_ROWS,
+                mask: int = CHUNK_MASK) -> Iterator[tuple[list, str]]:
+    """
+    Yield (rows, key) content-defined chunks.
+
+    `items` yields (row, raw) pairs where raw is the bytes the row was read
+    from (its input line(s), newline included) or any other self-delimiting
+    encoding of it; see row_bytes().
+    """
+    seed = version.encode("utf-8")[:64]
+    chunk: list = []
+    parts: list = []
+    for row, raw in items:
+        chunk.append(row)
+        parts.append(raw)
+        n = len(chunk)
+        if n >= max_rows or (n >= min_rows and not crc32(raw) & mask):
+            yield chunk, hashlib.blake2b(b"".join(parts), digest_size=20, key=seed).hexdigest()
+            chunk = []
+            parts = []
+    if chunk:
+        yield chunk, hashlib.blake2b(b"".join(parts), digest_size=20, key=seed).hexdigest()
+
+
+def row_bytes(row) -> bytes:
+    """Stand-in raw bytes for a row that was not read from a line (one repr per line)."""
+    # repr() escapes newlines, so the trailing one delimits rows unambiguously
+    return repr(row).encode("utf-8", "surrogatepass") + b"\n"
+
+
+class ResultStore:
+    """Directory of result blocks keyed by chunk digest, LRU-bounded by size."""
+
+    def __init__(self, directory: str | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_used = sum(size for _, _, size in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _entries(self):
+        """(path, mtime, size) of every block file."""
+        for sub in os.scandir(self.directory):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                if e.is_file() and not e.name.endswith(".tmp"):
+                    st = e.stat()
+                    yield e.path, st.st_mtime_ns, st.st_size
+
+    def get(self, key: str) -> list | None:
+        """Cached results for chunk `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                results = marshal.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return results
+
+    def put(self, key: str, results: list) -> bool:
+        """Store a result block; False if the results cannot be marshalled or written.
+
+        A full disk or read-only cache directory only costs the caching: the
+        run carries on with the results it already has.
+        """
+        try:
+            data = marshal.dumps(results)
+        except ValueError:
+            return False
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(data)
+            try:
+                replaced = os.path.getsize(path)  # an existing block is overwritten, not added
+            except OSError:
+                replaced = 0
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return False
+        self.bytes_used += len(data) - replaced
+        if self.bytes_used > self.max_bytes:
+            self.evict()
+        return True
+
+    def evict(self, target: int | None = None) -> None:
+        """Delete least recently used blocks until at most `target` bytes remain.
+
+        Defaults to 90% of max_bytes so a full cache does not rescan on every put.
+        """
+        if target is None:
+            target = self.max_bytes * 9 // 10
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self.bytes_used = total
+
+    def clear(self) -> None:
+        self.evict(0)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return (
+            f"result cache: {s['hits']} blocks replayed, {s['misses']} validated, "
+            f"{s['evictions']} evicted ({s['hit_rate']:.1%} hit rate, "
+            f"{s['bytes'] / 1048576:.1f}/{s['max_bytes'] / 1048576:.1f} MiB)"
+        )
+
+
+__all__ = ["ResultStore", "iter_chunks", "row_bytes", "default_cache_dir", "DEFAULT_MAX_BYTES"]
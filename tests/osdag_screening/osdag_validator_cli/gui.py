@@ -9,7 +9,7 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Any
-from .cli import run_command
+from .cli import run_command, COMMAND_SPECS
 
 class App(tk.Tk):
     def __init__(self):
@@ -24,7 +24,7 @@ class App(tk.Tk):
 
         ttk.Label(frame, text="Command").grid(row=0, column=0, sticky="w")
         self.cmd_var = tk.StringVar(value="fu")
-        ttk.Entry(frame, textvariable=self.cmd_var).grid(row=0, column=1, sticky="ew")
+        ttk.Combobox(frame, textvariable=self.cmd_var, values=list(COMMAND_SPECS)).grid(row=0, column=1, sticky="ew")
 
         ttk.Label(frame, text="Args (comma separated)").grid(row=1, column=0, sticky="w")
         self.args_var = tk.StringVar(value="410")
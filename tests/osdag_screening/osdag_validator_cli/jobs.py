@@ -0,0 +1,266 @@
+# osdag_validator_cli/jobs.py
+"""
+Background batch jobs for the API.
+
+JobQueue runs batch files on a small thread pool instead of inside a
+request. submit() returns a Job at once; the job reads its input with
+cli._iter_batch_rows_from (so the byte offset of every row is known; rows
+come out exactly as `osdag-val batch` reads them, line ends included),
+validates through the same grouped dispatcher as the batch endpoints and
+writes the results incrementally, in any batch output format, to a file in
+the queue's directory.
+
+Progress is kept on the Job as plain counters (rows and input bytes done)
+written by the worker thread and read by status(); rows/sec comes from the
+row count, the ETA from the share of the input read so far. The ETA is
+unknown (None) for JSON array and compressed inputs, whose byte offsets do
+not map onto the file size.
+
+At most `max_workers` jobs run at a time and at most `max_jobs` may be
+queued or running; submit() raises JobQueueFull beyond that. cancel()
+drops a queued job, or stops a running one once the block of rows it is
+validating (a scheduler slice, or BATCH_CHUNK_SIZE rows) is done. The
+partial output of a cancelled or failed job is deleted. Finished jobs are
+kept (oldest first dropped, with their output) up to `keep_finished`.
+
+With a FairScheduler (scheduler.py) a job validates and writes its rows in
+the scheduler's bulk slices, so it yields to interactive requests. With a
+Metrics object (metrics.py) jobs record their outcomes, phase timings and
+rows/sec.
+"""
+
+from __future__ import annotations
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from .cli import _batch_kind, _chunked, _iter_batch_rows_from, _iter_results, _open_output, \
+    _resolve_batch_path, BATCH_CHUNK_SIZE
+from .compression import is_compressed
+from .writers import get_writer, WRITERS, DEFAULT_FLUSH_BYTES
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = frozenset({DONE, FAILED, CANCELLED})
+
+# output file suffix per format
+SUFFIXES = {"json": ".json", "jsonl": ".jsonl", "csv": ".csv", "text": ".txt"}
+
+
+class JobQueueFull(Exception):
+    """Raised by JobQueue.submit when `max_jobs` jobs are already queued or running."""
+
+
+class Job:
+    """One batch job; counters are updated by the worker thread as it goes."""
+
+    def __init__(self, job_id: str, path: str, out_format: str, out_path: str):
+        self.id = job_id
+        self.path = path
+        self.out_format = out_format
+        self.out_path = out_path
+        self.state = QUEUED
+        self.error: str | None = None
+        self.rows_done = 0
+        self.bytes_done = 0
+        # ETA base: the input size when byte offsets are file offsets
+        self.bytes_total = None if is_compressed(path) or _batch_kind(path) == "json" else os.path.getsize(path)
+        self.created = time.time()
+        self.started: float | None = None
+        self.finished: float | None = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def status(self) -> dict:
+        elapsed = None
+        if self.started is not None:
+            elapsed = (self.finished or time.time()) - self.started
+        rate = self.rows_done / elapsed if elapsed else 0.0
+        eta = None
+        if self.state == DONE:
+            eta = 0.0
+        elif self.state == RUNNING and self.bytes_total and self.bytes_done and elapsed:
+            eta = (self.bytes_total - self.bytes_done) * elapsed / self.bytes_done
+        progress = None
+        if self.state == DONE:
+            progress = 1.0
+        elif self.bytes_total:
+            progress = min(self.bytes_done / self.bytes_total, 1.0)
+        return {
+            "id": self.id,
+            "state": self.state,
+            "path": self.path,
+            "format": self.out_format,
+            "rows_done": self.rows_done,
+            "rows_per_sec": rate,
+            "progress": progress,
+            "eta_seconds": eta,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobQueue:
+    """Thread pool of batch jobs; see the module docstring."""
+
+    def __init__(self, max_workers: int = 2, max_jobs: int = 16, directory: str | None = None,
+                 keep_finished: int = 100, preparse: bool = True, flush_bytes: int = DEFAULT_FLUSH_BYTES,
+                 scheduler=None, metrics=None):
+        if max_workers < 1 or max_jobs < 1:
+            raise ValueError("max_workers and max_jobs must be >= 1")
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.keep_finished = keep_finished
+        self.preparse = preparse
+        self.flush_bytes = flush_bytes
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self._own_dir = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="osdag-jobs-")
+        os.makedirs(self.directory, exist_ok=True)
+        self._jobs: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="osdag-job")
+
+    def submit(self, path: str, out_format: str = "jsonl") -> Job:
+        """
+        Queue the batch file at `path`; returns its Job. FileNotFoundError if
+        the input does not exist, ValueError for an unknown output format,
+        JobQueueFull if `max_jobs` jobs are already active.
+        """
+        out_format = (out_format or "jsonl").lower()
+        if out_format not in WRITERS:
+            raise ValueError(f"Unsupported output format: {out_format} (supported: {', '.join(WRITERS)})")
+        path = os.path.abspath(_resolve_batch_path(path))
+        job_id = uuid.uuid4().hex
+        job = Job(job_id, path, out_format, os.path.join(self.directory, job_id + SUFFIXES[out_format]))
+        with self._lock:
+            if self.active() >= self.max_jobs:
+                raise JobQueueFull(f"{self.max_jobs} jobs already queued or running")
+            self._jobs[job_id] = job
+            job.future = self._pool.submit(self._run, job)
+        return job
+
+    def active(self) -> int:
+        """Jobs queued or running."""
+        return sum(1 for j in self._jobs.values() if j.state not in FINISHED)
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Job | None:
+        """
+        Cancel a queued or running job (no-op once finished); None if unknown.
+        A running job stops after the block of rows it is validating.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # never started
+            self._finish(job, CANCELLED)
+        return job
+
+    def remove(self, job_id: str) -> bool:
+        """Forget a finished job and delete its output; False if unknown or still active."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state not in FINISHED:
+                return False
+            del self._jobs[job_id]
+        _remove_file(job.out_path)
+        return True
+
+    def _finish(self, job: Job, state: str, error: str | None = None) -> None:
+        job.error = error
+        job.finished = time.time()
+        if state != DONE:
+            _remove_file(job.out_path)
+        job.state = state
+        self._prune()
+
+    def _prune(self) -> None:
+        with self._lock:
+            finished = [j for j in self._jobs.values() if j.state in FINISHED]
+            drop = finished[:max(len(finished) - self.keep_finished, 0)]
+            for j in drop:
+                del self._jobs[j.id]
+        for j in drop:
+            _remove_file(j.out_path)
+
+    def _run(self, job: Job) -> None:
+        if job.cancel_event.is_set():
+            self._finish(job, CANCELLED)
+            return
+        job.started = time.time()
+        job.state = RUNNING
+        cancelled = job.cancel_event.is_set
+        offsets = deque()  # input offsets of rows read ahead of their results
+
+        def rows():
+            for end, row, _ in _iter_batch_rows_from(job.path):
+                offsets.append(end)
+                yield row
+
+        scheduler = self.scheduler
+        slot = scheduler.bulk_slot if scheduler is not None else nullcontext
+        slice_rows = scheduler.slice_rows if scheduler is not None else BATCH_CHUNK_SIZE
+        metrics = self.metrics
+        start = time.perf_counter()
+        try:
+            with _open_output(job.out_path, job.out_format) as f:
+                writer = get_writer(job.out_format, f, self.flush_bytes)
+                for block in _chunked(rows(), slice_rows):
+                    with slot():
+                        results = _iter_results(block, 1, slice_rows, None, self.preparse, metrics=metrics)
+                        if metrics is not None:
+                            results = list(results)
+                            t0 = time.perf_counter()
+                        for result in results:
+                            if cancelled():
+                                break
+                            writer.write(result)
+                            job.bytes_done = offsets.popleft() or 0
+                            job.rows_done += 1
+                        if metrics is not None:
+                            metrics.observe("serialize", time.perf_counter() - t0)
+                    if cancelled():
+                        break
+                else:
+                    writer.close()
+        except Exception as e:
+            self._finish(job, FAILED, f"{type(e).__name__}: {e}")
+            return
+        finally:
+            if metrics is not None:
+                metrics.record_batch(job.rows_done, time.perf_counter() - start)
+        self._finish(job, CANCELLED if cancelled() else DONE)
+
+    def shutdown(self) -> None:
+        """Cancel every job and stop the pool; owned output directories are removed."""
+        for job_id in list(self._jobs):
+            self.cancel(job_id)
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._own_dir:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+__all__ = ["JobQueue", "Job", "JobQueueFull", "QUEUED", "RUNNING", "DONE", "FAILED", "CANCELLED"]
@@ -0,0 +1,133 @@
+# osdag_validator_cli/jsonstream.py
+"""
+Incremental readers for JSON batch input.
+
+ - iter_json_array(f): yields the elements of a top-level JSON array one at
+   a time, reading the file in fixed-size chunks. Only the current element
+   (plus one chunk of look-ahead) is ever held in memory; more input is
+   read only while the element is cut off by the end of the buffer, so a
+   malformed element raises at once, and an element longer than
+   `max_element` characters raises ValueError instead of growing the
+   buffer without bound.
+ - iter_json_lines(f): JSON Lines / NDJSON, one value per non-blank line.
+
+Both take an open text stream and raise ValueError (json.JSONDecodeError
+for malformed input) just like json.load would.
+"""
+
+from __future__ import annotations
+import json
+import re
+from typing import Any, IO, Iterator
+
+CHUNK_SIZE = 1 << 16
+# longest single array element buffered (characters)
+MAX_ELEMENT = 1 << 26
+_WS = " \t\n\r"
+# what may be left of a number cut off by the end of the buffer
+_NUMBER_TAIL = re.compile(r"[0-9+\-.eE]*\Z")
+_LITERALS = ("true", "false", "null", "NaN", "Infinity", "-Infinity")
+
+_decoder = json.JSONDecoder()
+
+
+def _truncated(e: json.JSONDecodeError, buf: str) -> bool:
+    """True if the decode error may only mean the element runs past the end of `buf`."""
+    if e.pos >= len(buf) or e.msg.startswith("Unterminated string"):
+        return True
+    if e.msg.startswith("Invalid \\uXXXX"):
+        return e.pos + 6 > len(buf)
+    # a nested number ("[10, 250." + "5]") or literal ("[tr" + "ue]") cut short
+    if _NUMBER_TAIL.match(buf, e.pos):
+        return True
+    tail = buf[e.pos:e.pos + 9]
+    return e.pos + len(tail) == len(buf) and any(lit != tail and lit.startswith(tail) for lit in _LITERALS)
+
+
+def iter_json_array(f: IO[str], chunk_size: int = CHUNK_SIZE, max_element: int = MAX_ELEMENT) -> Iterator[Any]:
+    """Yield each element of the top-level JSON array in `f`."""
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        data = f.read(chunk_size)
+        if not data:
+            eof = True
+            return False
+        # drop the consumed prefix so the buffer never grows past one element
+        buf = buf[pos:] + data
+        pos = 0
+        return True
+
+    def grow() -> bool:
+        """fill() for an element cut off by the end of the buffer, up to max_element characters."""
+        if len(buf) - pos > max_element:
+            raise ValueError(f"JSON array element exceeds {max_element} characters")
+        return fill()
+
+    def skip_ws() -> bool:
+        """Advance past whitespace; False if input is exhausted."""
+        nonlocal pos
+        while True:
+            n = len(buf)
+            while pos < n and buf[pos] in _WS:
+                pos += 1
+            if pos < n:
+                return True
+            if not fill():
+                return False
+
+    if not skip_ws() or buf[pos] != "[":
+        raise ValueError("JSON batch file must contain a list of commands")
+    pos += 1
+
+    first = True
+    while True:
+        if not skip_ws():
+            raise json.JSONDecodeError("Unterminated array", buf, pos)
+        if buf[pos] == "]":
+            pos += 1
+            break
+        if not first:
+            if buf[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+            if not skip_ws():
+                raise json.JSONDecodeError("Unterminated array", buf, pos)
+        first = False
+
+        while True:
+            try:
+                value, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as e:
+                # element straddles the chunk boundary: read more and retry
+                if _truncated(e, buf) and grow():
+                    continue
+                raise
+            # a bare number may continue in the next chunk ("-1." + "5e3")
+            if type(value) in (int, float) and _NUMBER_TAIL.match(buf, end) and grow():
+                continue
+            break
+        pos = end
+        yield value
+
+    if skip_ws():
+        raise json.JSONDecodeError("Extra data", buf, pos)
+
+
+def iter_json_lines(f: IO[str]) -> Iterator[Any]:
+    """Yield one decoded value per non-blank line (JSON Lines / NDJSON)."""
+    for lineno, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {lineno}: {e}") from e
+
+
+__all__ = ["iter_json_array", "iter_json_lines", "CHUNK_SIZE", "MAX_ELEMENT"]
@@ -0,0 +1,232 @@
+# osdag_validator_cli/metrics.py
+"""
+Dependency-free service metrics in the Prometheus text format.
+
+A Metrics object collects:
+
+ - validations by command and outcome (valid / invalid / error), where
+   the outcome of a result follows print_result: an {"error": ...} dict is
+   an error, any other truthy result is valid, the rest invalid;
+ - latency histograms for the four phases of handling work: parse (input
+   to (command, args) rows), dispatch (routing rows to their checks),
+   validate (running the checks) and serialize (encoding results), kept
+   apart by unit: "request" samples time one /validate call (record()),
+   "block" samples one block of batch rows (observe()), since the two
+   differ by orders of magnitude;
+ - batch rows and seconds, from which rows/sec is reported;
+ - hit rates of any registered cache (anything with a stats() dict
+   holding "hits" and "misses").
+
+render() produces the exposition text served on /metrics; format_stats()
+the summary the CLI prints with --stats. Updates take a lock, so worker
+threads may record into the same object.
+"""
+
+from __future__ import annotations
+import threading
+from bisect import bisect_left
+from typing import Callable, Iterable
+
+PHASES = ("parse", "dispatch", "validate", "serialize")
+OUTCOMES = ("valid", "invalid", "error")
+REQUEST, BLOCK = "request", "block"
+UNITS = (REQUEST, BLOCK)
+
+# seconds; one batch block takes milliseconds, one request microseconds
+DEFAULT_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# distinct command labels kept; further commands (unknown ones from batch
+# input, say) are counted as "other" so the series stay bounded
+MAX_COMMAND_LABELS = 64
+
+PREFIX = "osdag_validator"
+
+
+def outcome(result) -> str:
+    """"valid", "invalid" or "error" for one result value."""
+    if isinstance(result, dict) and "error" in result:
+        return "error"
+    return "valid" if result else "invalid"
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket, made cumulative on render."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-quantile (None if empty or past the last bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.buckets, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return None
+
+
+class Metrics:
+    """Counters, phase histograms, batch throughput and cache hit rates; see the module docstring."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+        self.validations: dict = {}  # (command, outcome) -> count
+        self._commands: set = set()
+        self.phases = {(u, p): Histogram(buckets) for u in UNITS for p in PHASES}
+        self.batch_rows = 0
+        self.batch_seconds = 0.0
+        self._caches: dict = {}  # name -> callable returning stats() or None
+
+    def _label(self, command) -> str:
+        command = str(command or "")
+        if command not in self._commands:
+            if len(self._commands) >= MAX_COMMAND_LABELS:
+                return "other"
+            self._commands.add(command)
+        return command
+
+    def count(self, command, result) -> None:
+        """Record the outcome of one validation."""
+        with self._lock:
+            key = (self._label(command), outcome(result))
+            self.validations[key] = self.validations.get(key, 0) + 1
+
+    def count_results(self, results: Iterable[dict]) -> None:
+        """Record the outcomes of result dicts ({"command", "result", ...}), e.g. one batch block."""
+        local: dict = {}
+        get = local.get
+        for r in results:
+            result = r["result"]
+            # bools are nearly every row; skip the outcome() call for them
+            key = (r["command"], "valid" if result is True else "invalid" if result is False else outcome(result))
+            local[key] = get(key, 0) + 1
+        with self._lock:
+            for (command, out), n in local.items():
+                key = (self._label(command), out)
+                self.validations[key] = self.validations.get(key, 0) + n
+
+    def record(self, command, result, **phases: float) -> None:
+        """One validated request and its phase timings (parse=..., validate=..., ...) under one lock."""
+        with self._lock:
+            key = (self._label(command), outcome(result))
+            self.validations[key] = self.validations.get(key, 0) + 1
+            for phase, seconds in phases.items():
+                self.phases[REQUEST, phase].observe(seconds)
+
+    def observe(self, phase: str, seconds: float, unit: str = BLOCK) -> None:
+        """Record one latency sample for `phase` (one of PHASES), by default for a block of rows."""
+        with self._lock:
+            self.phases[unit, phase].observe(seconds)
+
+    def record_batch(self, rows: int, seconds: float) -> None:
+        """Add a finished piece of batch work (rows validated, wall seconds)."""
+        with self._lock:
+            self.batch_rows += rows
+            self.batch_seconds += seconds
+
+    def rows_per_second(self) -> float:
+        return self.batch_rows / self.batch_seconds if self.batch_seconds else 0.0
+
+    def register_cache(self, name: str, stats: Callable[[], dict | None]) -> None:
+        """Report the hit rate of a cache; `stats` returns its stats() dict (or None when it is off)."""
+        self._caches[name] = stats
+
+    def cache_stats(self) -> dict:
+        out = {}
+        for name, stats in self._caches.items():
+            s = stats()
+            if s is not None:
+                lookups = s.get("hits", 0) + s.get("misses", 0)
+                out[name] = (s.get("hits", 0), s.get("misses", 0), s.get("hits", 0) / lookups if lookups else 0.0)
+        return out
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        p = PREFIX
+        with self._lock:
+            validations = sorted(self.validations.items())
+            phases = {key: (h.buckets, list(h.counts), h.sum, h.count) for key, h in self.phases.items()}
+            rows, seconds = self.batch_rows, self.batch_seconds
+        lines = [f"# HELP {p}_validations_total Validations by command and outcome.",
+                 f"# TYPE {p}_validations_total counter"]
+        for (command, out), n in validations:
+            lines.append(f'{p}_validations_total{{command="{_escape(command)}",outcome="{out}"}} {n}')
+        lines += [f"# HELP {p}_phase_seconds Time spent per phase, per request or per block of batch rows.",
+                  f"# TYPE {p}_phase_seconds histogram"]
+        for unit in UNITS:
+            for name in PHASES:
+                buckets, counts, total, n = phases[unit, name]
+                labels = f'unit="{unit}",phase="{name}"'
+                cumulative = 0
+                for bound, c in zip(buckets + (float("inf"),), counts):
+                    cumulative += c
+                    le = "+Inf" if bound == float("inf") else _num(bound)
+                    lines.append(f'{p}_phase_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f'{p}_phase_seconds_sum{{{labels}}} {_num(total)}')
+                lines.append(f'{p}_phase_seconds_count{{{labels}}} {n}')
+        lines += [f"# HELP {p}_batch_rows_total Rows validated by batch work.",
+                  f"# TYPE {p}_batch_rows_total counter",
+                  f"{p}_batch_rows_total {rows}",
+                  f"# HELP {p}_batch_seconds_total Wall time of batch work.",
+                  f"# TYPE {p}_batch_seconds_total counter",
+                  f"{p}_batch_seconds_total {_num(seconds)}",
+                  f"# HELP {p}_batch_rows_per_second Mean batch throughput.",
+                  f"# TYPE {p}_batch_rows_per_second gauge",
+                  f"{p}_batch_rows_per_second {_num(rows / seconds if seconds else 0.0)}"]
+        caches = self.cache_stats()
+        for metric, kind, index, help_text in (("cache_hits_total", "counter", 0, "Cache hits."),
+                                               ("cache_misses_total", "counter", 1, "Cache misses."),
+                                               ("cache_hit_ratio", "gauge", 2, "Cache hit rate.")):
+            lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} {kind}"]
+            for name, values in sorted(caches.items()):
+                lines.append(f'{p}_{metric}{{cache="{_escape(name)}"}} {_num(values[index])}')
+        return "\n".join(lines) + "\n"
+
+    def format_stats(self) -> str:
+        """Human-readable summary (the CLI's --stats output)."""
+        with self._lock:
+            totals = {}
+            for (command, out), n in self.validations.items():
+                totals.setdefault(command, dict.fromkeys(OUTCOMES, 0))[out] += n
+            phases = {key: (h.count, h.sum, h.quantile(0.5), h.quantile(0.99)) for key, h in self.phases.items()}
+        lines = [f"stats: {self.batch_rows} rows in {self.batch_seconds:.2f}s ({self.rows_per_second():,.0f} rows/s)"]
+        for command, t in sorted(totals.items()):
+            lines.append(f"  {command}: {t['valid']} valid, {t['invalid']} invalid, {t['error']} errors")
+        for unit in UNITS:
+            for name in PHASES:
+                n, total, p50, p99 = phases[unit, name]
+                if n:
+                    lines.append(f"  {name} per {unit}: {total:.3f}s over {n} samples "
+                                 f"(p50 <= {_ms(p50)}, p99 <= {_ms(p99)})")
+        for name, (hits, misses, rate) in sorted(self.cache_stats().items()):
+            lines.append(f"  {name} cache: {hits} hits, {misses} misses ({rate:.1%} hit rate)")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    return repr(float(value))
+
+
+def _ms(seconds: float | None) -> str:
+    return "inf" if seconds is None else f"{seconds * 1000:g} ms"
+
+
+__all__ = ["Metrics", "Histogram", "outcome", "PHASES", "OUTCOMES", "UNITS", "REQUEST", "BLOCK", "DEFAULT_BUCKETS"]
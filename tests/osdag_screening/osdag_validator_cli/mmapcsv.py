@@ -0,0 +1,303 @@
+# osdag_validator_cli/mmapcsv.py
+"""
+Memory-mapped CSV scanner for plain (uncompressed) batch files.
+
+iter_csv_rows(path) yields the same (command, args) pairs as reading the
+file in text mode with csv.reader and stripping every cell, but avoids most
+of the per-row work:
+
+ - the file is mmap'ed and cut into blocks of whole lines; each block is
+   decoded with a single str(memoryview, "utf-8") call instead of through a
+   TextIOWrapper line by line,
+ - blocks without quotes, CR or NUL characters (the usual case) are split
+   with str.split on "\\n" and "," -- for such input csv.reader's output is
+   exactly the comma split,
+ - blocks with no whitespace other than newlines skip the per-cell strip().
+
+Blocks that contain quotes, CR or NUL (or lines too long for a block) go
+through csv.reader, with newlines translated the way text-mode open() does,
+so quoted fields -- including ones that span lines or blocks -- and csv
+errors behave exactly as before.
+
+iter_text_lines() and iter_tracked_rows() give readers of binary streams
+(resumable and cached runs need the byte offset and raw bytes of every row)
+the same newline handling: lines end at \r\n, lone \r or \n, and the
+parser sees each end as "\n".
+"""
+
+from __future__ import annotations
+import csv
+import io
+import mmap
+import re
+from itertools import chain
+from typing import Iterator
+
+# small enough to keep the decoded block cheap to hold; never above csv's
+# field size limit, so a fast-path block cannot hide a field csv.reader
+# would reject as too long
+BLOCK_SIZE = 16 * 1024
+
+_SPECIAL = re.compile('["\r\x00]')
+_SPECIAL_BYTES = re.compile(b'["\r\x00]')
+_INNER_WS = re.compile(r"[^\S\n]")  # whitespace strip() would remove from a cell
+_TEXT_LINE = re.compile(r"[^\n]*\n|[^\n]+")
+_BYTE_LINE = re.compile(rb"[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+")
+_NEWLINE = re.compile(b"\n")
+
+
+def iter_csv_rows(path: str, block_size: int = BLOCK_SIZE) -> Iterator[tuple[str, list[str]]]:
+    """Yield (command, args) from a plain CSV file; see the module docstring.
+
+    Raises OSError/ValueError if `path` cannot be memory-mapped (e.g. a pipe).
+    """
+    mm = _map(path)
+    if mm is None:
+        return
+    view = memoryview(mm)
+    try:
+        size = len(mm)
+        pos = 0
+        limit = min(block_size, csv.field_size_limit())
+        while pos < size:
+            end = min(pos + limit, size)
+            if end < size:
+                nl = mm.rfind(b"\n", pos, end)
+                if nl < 0:
+                    # a single line longer than a block
+                    pos = yield from _scan_csv(mm, view, pos, mm.find(b"\n", end) + 1 or size)
+                    continue
+                end = nl + 1
+            text = str(view[pos:end], "utf-8")
+            if _SPECIAL.search(text) is not None:
+                pos = yield from _scan_csv(mm, view, pos, end)
+                continue
+            # pop(0) leaves the args list in place instead of copying a slice
+            if _INNER_WS.search(text) is None:
+                for line in text.split("\n"):
+                    if line:
+                        cells = line.split(",")
+                        yield cells.pop(0), cells
+            else:
+                for line in text.split("\n"):
+                    if line:
+                        cells = line.split(",")
+                        yield cells.pop(0).strip(), [c.strip() for c in cells]
+            pos = end
+    finally:
+        view.release()
+        mm.close()
+
+
+def iter_csv_rows_from(path: str, offset: int = 0, block_size: int = BLOCK_SIZE):
+    """
+    Like iter_csv_rows, but yields (end_offset, (command, args), raw) as
+    iter_tracked_rows() does, starting at byte `offset` (0 or a row end).
+
+    Resumable and cached runs read plain CSV through this; blocks are cut
+    and scanned the same way. Special blocks go through csv.reader, in one
+    pass with the rows mapped back to line ends, or a line at a time when
+    they hold a CR, so every row's offset and bytes stay exact.
+    """
+    mm = _map(path)
+    if mm is None:
+        return
+    try:
+        size = len(mm)
+        pos = offset  # end of the last row yielded: where the next row's raw bytes begin
+        scan = offset
+        limit = min(block_size, csv.field_size_limit())
+        while scan < size:
+            end = min(scan + limit, size)
+            if end < size:
+                nl = mm.rfind(b"\n", scan, end)
+                if nl < 0:
+                    pos = scan = yield from _scan_tracked(mm, pos, mm.find(b"\n", end) + 1 or size)
+                    continue
+                end = nl + 1
+            blob = mm[scan:end]
+            if _SPECIAL_BYTES.search(blob) is not None:
+                if b"\r" in blob:
+                    pos = scan = yield from _scan_tracked(mm, pos, end)
+                else:
+                    pos = scan = yield from _scan_block_tracked(mm, blob, pos, scan, end)
+                continue
+            text = blob.decode("utf-8")
+            lines = text.split("\n")
+            raws = blob.split(b"\n")
+            last, last_raw = lines.pop(), raws.pop()  # "" unless the file ends without a newline
+            strip = _INNER_WS.search(text) is not None
+            p = scan
+            for line, raw in zip(lines, raws):
+                p += len(raw) + 1
+                if line:
+                    cells = line.split(",")
+                    if strip:
+                        yield p, (cells.pop(0).strip(), [c.strip() for c in cells]), mm[pos:p]
+                    else:
+                        yield p, (cells.pop(0), cells), mm[pos:p]
+                    pos = p
+            if last:
+                p += len(last_raw)
+                cells = last.split(",")
+                yield p, (cells.pop(0).strip(), [c.strip() for c in cells]), mm[pos:p]
+                pos = p
+            scan = end
+    finally:
+        mm.close()
+
+
+def _scan_tracked(mm, start: int, stop: int):
+    """
+    iter_tracked_rows() over the lines of the map from `start` (a row end)
+    until a row ends at or past `stop`; returns the offset after that row.
+    """
+    size = len(mm)
+
+    def lines():
+        pos = start
+        while pos < size:
+            end = mm.find(b"\n", pos) + 1 or size
+            yield mm[pos:end]
+            pos = end
+
+    end = size
+    for end, row, raw in iter_tracked_rows(iter_text_lines(lines()), _csv_rows, start):
+        yield end, row, raw
+        if end >= stop:
+            return end
+    return size
+
+
+def _scan_block_tracked(mm, blob: bytes, pos: int, start: int, stop: int):
+    """
+    _scan_tracked() for a block [start, stop) without CR (`blob`), run as
+    one csv.reader pass: a row's raw bytes run from the previous row's end
+    (`pos`) to the end of the last line the reader took for it. A quoted
+    field still open at `stop` pulls further lines from the map.
+    """
+    ends = [m.end() + start for m in _NEWLINE.finditer(blob)]
+    if not blob.endswith(b"\n"):
+        ends.append(stop)
+    n = len(ends)
+    size = len(mm)
+
+    def more():
+        p = stop
+        while p < size:
+            for piece in iter_text_lines((mm[p:mm.find(b"\n", p) + 1 or size],)):
+                p += len(piece)
+                ends.append(p)
+                yield _universal_newlines(piece.decode("utf-8"))
+
+    reader = csv.reader(chain(io.StringIO(blob.decode("utf-8")), more()))
+    for row in reader:
+        if row:
+            end = ends[reader.line_num - 1]
+            yield end, (row.pop(0).strip(), [c.strip() for c in row]), mm[pos:end]
+            pos = end
+            if reader.line_num >= n:
+                return end
+    return size
+
+
+def _csv_rows(lines):
+    for row in csv.reader(lines):
+        if row:
+            yield row.pop(0).strip(), [c.strip() for c in row]
+
+
+def _map(path: str):
+    """Read-only mmap of `path`, or None for an empty file."""
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files cannot be mapped
+            if f.seek(0, 2) == 0:
+                return None
+            raise
+
+
+def _scan_csv(mm, view, start: int, stop: int):
+    """
+    Run csv.reader over the block [start, stop) until a row ends at or past
+    its last line.
+
+    Yields rows; returns the byte offset after the last line consumed. A
+    quoted field still open at `stop` makes the reader pull further lines
+    from the map, one at a time, so it is read whole.
+    """
+    text = _universal_newlines(str(view[start:stop], "utf-8"))
+    n = text.count("\n") + (not text.endswith("\n"))
+    pos = stop
+    size = len(mm)
+    left = 0  # lines of the current raw line not yet handed to the reader
+
+    def more():
+        nonlocal pos, left
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            end = size if nl < 0 else nl + 1
+            pieces = _TEXT_LINE.findall(_universal_newlines(mm[pos:end].decode("utf-8")))
+            pos = end
+            for i, piece in enumerate(pieces):
+                left = len(pieces) - 1 - i
+                yield piece
+
+    # StringIO (newline="\n") iterates the block's lines without copying them into a list
+    reader = csv.reader(chain(io.StringIO(text), more()))
+    for row in reader:
+        if row:
+            yield row.pop(0).strip(), [c.strip() for c in row]
+        if reader.line_num >= n and not left:
+            break
+    return pos
+
+
+def iter_text_lines(lines):
+    """
+    Split binary lines (each ending in at most one \\n, as iterating a
+    binary file gives them) where text-mode open() would: at \\r\\n, lone
+    \\r and \\n. The pieces keep their original line ends.
+    """
+    for line in lines:
+        if b"\r" in line:
+            yield from _BYTE_LINE.findall(line)
+        else:
+            yield line
+
+
+def iter_tracked_rows(lines, parse, offset: int = 0):
+    """
+    Yield (end_offset, row, raw) for each row `parse` reads.
+
+    `lines` are binary lines from iter_text_lines(); `parse` takes an
+    iterable of text lines, with every line end translated to "\\n", and
+    yields rows. raw is the bytes the row was parsed from (including any
+    blank lines before it) and end_offset the byte offset just past them,
+    counting from `offset`. Parsers that pull one line at a time (csv.reader,
+    jsonstream.iter_json_lines) keep both exact after every row.
+    """
+    parts = []
+
+    def text():
+        for line in lines:
+            parts.append(line)
+            yield _universal_newlines(line.decode("utf-8"))
+
+    for row in parse(text()):
+        raw = parts[0] if len(parts) == 1 else b"".join(parts)
+        parts.clear()
+        offset += len(raw)
+        yield offset, row, raw
+
+
+def _universal_newlines(text: str) -> str:
+    # what text-mode open() does: \r\n and lone \r both end a line
+    if "\r" in text:
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+__all__ = ["iter_csv_rows", "iter_csv_rows_from", "iter_text_lines", "iter_tracked_rows", "BLOCK_SIZE"]
@@ -0,0 +1,175 @@
+# osdag_validator_cli/npyinput.py
+"""
+Columnar batch input from NumPy .npy/.npz files (numpy required).
+
+A manifest (JSON) names the command for each column; array paths are
+relative to the manifest and npz members are written "file.npz:member":
+
+    {"columns": [
+        {"command": "fu", "arrays": ["fu.npy"]},
+        {"command": "fy", "arrays": ["props.npz:fy"]},
+        {"command": "plate", "arrays": ["plates.npz:thickness", "plates.npz:width"]}
+    ]}
+
+Every array is opened with mmap_mode="r" -- npz members too, when they are
+stored uncompressed (np.savez); np.savez_compressed members have to be
+inflated into memory. The columns go straight to the Validator *_many
+checks, one slice at a time, and the bool results are written in manifest
+order to a .npy (one array, entries concatenated) or .npz (one array per
+entry) file. .npy output is itself memory-mapped, so inputs and results
+are paged through rather than held; .npz output keeps the results (one
+byte per row) in memory until it is written.
+"""
+
+from __future__ import annotations
+import json
+import os
+import zipfile
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# elements per call to a *_many check
+SLICE_SIZE = 1 << 20
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Column (.npy/.npz) batch input requires numpy. Install it with `pip install numpy`.")
+
+
+_HEADER_READERS = {}
+if np is not None:
+    _HEADER_READERS = {(1, 0): np.lib.format.read_array_header_1_0,
+                       (2, 0): np.lib.format.read_array_header_2_0}
+
+
+def _mmap_npz_member(path: str, member: str):
+    """Memory-map one member of an npz archive; None if it cannot be mapped (compressed)."""
+    with zipfile.ZipFile(path) as zf:
+        try:
+            info = zf.getinfo(member + ".npy")
+        except KeyError:
+            raise KeyError(f"{path} has no array named {member!r}") from None
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+        with open(path, "rb") as f:
+            # the local file header (30 bytes + name + extra) precedes the data
+            f.seek(info.header_offset)
+            header = f.read(30)
+            start = info.header_offset + 30 + int.from_bytes(header[26:28], "little") \
+                + int.from_bytes(header[28:30], "little")
+            f.seek(start)
+            version = np.lib.format.read_magic(f)
+            read_header = _HEADER_READERS.get(version)
+            if read_header is None:
+                return None
+            shape, fortran_order, dtype = read_header(f)
+            offset = f.tell()
+    if dtype.hasobject:
+        raise ValueError(f"{path}:{member} holds Python objects; only numeric columns are supported")
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def load_column(spec: str, base_dir: str = "."):
+    """Open one column ("file.npy" or "file.npz:member") memory-mapped where possible."""
+    _require_numpy()
+    path, member = spec, ""
+    head, _, tail = spec.rpartition(":")
+    if head.lower().endswith(".npz"):
+        path, member = head, tail
+    path = os.path.join(base_dir, os.path.expanduser(path))
+    if path.lower().endswith(".npz"):
+        if not member:
+            raise ValueError(f"{spec!r}: name the npz member as 'file.npz:member'")
+        arr = _mmap_npz_member(path, member)
+        if arr is None:
+            with np.load(path, allow_pickle=False) as data:
+                arr = data[member]
+    else:
+        arr = np.load(path, mmap_mode="r", allow_pickle=False)
+    if arr.ndim != 1:
+        raise ValueError(f"{spec!r}: columns must be 1-D, got shape {arr.shape}")
+    return arr
+
+
+def read_manifest(path: str, arity: dict) -> list[tuple[str, list]]:
+    """Parse a manifest into [(command, [column arrays])] checked against `arity`."""
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    entries = manifest.get("columns") if isinstance(manifest, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError("Column manifest must be an object with a 'columns' list")
+    base_dir = os.path.dirname(os.path.abspath(path))
+    out = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"columns[{i}]: entry must be an object with 'command' and 'arrays'")
+        cmd = (entry.get("command") or "").strip()
+        if cmd not in arity:
+            raise ValueError(f"columns[{i}]: command {cmd!r} has no vectorized check "
+                             f"(supported: {', '.join(sorted(arity))})")
+        specs = entry.get("arrays") or []
+        if len(specs) != arity[cmd]:
+            raise ValueError(f"columns[{i}]: {cmd} takes {arity[cmd]} array(s), got {len(specs)}")
+        arrays = [load_column(s, base_dir) for s in specs]
+        if len({len(a) for a in arrays}) > 1:
+            raise ValueError(f"columns[{i}]: arrays for {cmd} differ in length")
+        out.append((cmd, arrays))
+    return out
+
+
+def run_columns(entries, vector: dict, targets: list, slice_size: int = SLICE_SIZE) -> None:
+    """Validate each entry slice by slice into the matching bool array of `targets`."""
+    for (cmd, arrays), target in zip(entries, targets):
+        check = vector[cmd]
+        n = len(arrays[0])
+        for i in range(0, n, slice_size):
+            j = min(i + slice_size, n)
+            target[i:j] = check(*(a[i:j] for a in arrays))
+
+
+def _entry_names(entries) -> list[str]:
+    names, seen = [], {}
+    for cmd, _ in entries:
+        seen[cmd] = seen.get(cmd, 0) + 1
+        names.append(cmd if seen[cmd] == 1 else f"{cmd}_{seen[cmd]}")
+    return names
+
+
+def run_column_batch(manifest_path: str, vector: dict, arity: dict, out_path: str | None = None,
+                     slice_size: int = SLICE_SIZE):
+    """
+    Validate the columns named by a manifest.
+
+    `vector` maps commands to their *_many checks. With out_path ending in
+    .npy the results are written (memory-mapped) as one bool array in
+    manifest order; with .npz as one array per entry, keyed by command
+    (fu, fu_2, ... for repeats). Returns [(command, bool array)] -- arrays
+    backed by the .npy output when there is one.
+    """
+    _require_numpy()
+    entries = read_manifest(manifest_path, arity)
+    sizes = [len(arrays[0]) for _, arrays in entries]
+    lower = (out_path or "").lower()
+    if lower.endswith(".npy"):
+        out = np.lib.format.open_memmap(os.path.expanduser(out_path), mode="w+", dtype=np.bool_,
+                                        shape=(sum(sizes),))
+        bounds = np.cumsum([0] + sizes).tolist()
+        results = [out[bounds[k]:bounds[k + 1]] for k in range(len(sizes))]
+        run_columns(entries, vector, results, slice_size)
+        out.flush()
+        return [(cmd, res) for (cmd, _), res in zip(entries, results)]
+    if out_path and not lower.endswith(".npz"):
+        raise ValueError("Column batch output must be a .npy or .npz file")
+    results = [np.empty(n, dtype=np.bool_) for n in sizes]
+    run_columns(entries, vector, results, slice_size)
+    if out_path:
+        np.savez(os.path.expanduser(out_path), **dict(zip(_entry_names(entries), results)))
+    return [(cmd, res) for (cmd, _), res in zip(entries, results)]
+
+
+__all__ = ["run_column_batch", "read_manifest", "load_column", "SLICE_SIZE"]
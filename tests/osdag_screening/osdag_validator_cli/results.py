@@ -0,0 +1,137 @@
+# osdag_validator_cli/results.py
+"""
+Compact, array-backed container for batch results.
+
+A batch run that keeps its results used to hold one dict
+{"command", "args", "result"} plus one args list per row. ResultTable
+stores the same information column-wise:
+
+ - command  : small integer ids (array 'H') into a list of names,
+ - args     : one flat list of interned argument values plus an offsets
+              array, so repeated values ("410", "M20", "8.8") are shared,
+ - result   : one bit per row in a bytearray for True/False results; the
+              rare non-bool result (an {"error": ...} dict) goes in a side
+              dict keyed by row.
+
+It behaves as a read-only sequence of result dicts: indexing and iteration
+build the dict for a row on demand, so existing callers (writers, tests
+comparing against lists, JSON serialisation of list(table)) are unchanged.
+"""
+
+from __future__ import annotations
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterable
+
+_BIT = object()  # marks rows whose result lives in the bit array
+
+
+class ResultTable(Sequence):
+    """Sequence of {"command", "args", "result"} dicts stored column-wise."""
+
+    __slots__ = ("_names", "_ids", "_commands", "_flat", "_offsets", "_bits",
+                 "_other", "_raw_args", "_pool", "_n")
+
+    def __init__(self, results: Iterable[dict] = ()):
+        self._names: list = []           # command id -> name
+        self._ids: dict = {}             # name -> command id
+        self._commands = array("H")
+        self._flat: list = []            # all args, interned, back to back
+        self._offsets = array("I", [0])  # row i's args are _flat[_offsets[i]:_offsets[i + 1]]
+        self._bits = bytearray()         # bit i set <=> result of row i is True
+        self._other: dict = {}           # row -> non-bool result
+        self._raw_args: dict = {}        # row -> args that were not a list
+        self._pool: dict = {}            # intern table for string args
+        self._n = 0
+        for r in results:
+            self.append(r["command"], r["args"], r["result"])
+
+    def append(self, command: Any, args: Any, result: Any) -> None:
+        n = self._n
+        cid = self._ids.get(command)
+        if cid is None:
+            cid = self._ids[command] = len(self._names)
+            self._names.append(command)
+            if cid > 0xFFFF and self._commands.typecode == "H":
+                self._commands = array("I", self._commands)
+        self._commands.append(cid)
+
+        flat = self._flat
+        if type(args) is list:
+            # only strings are interned: 1, 1.0 and True are equal keys but must not merge
+            pool_setdefault = self._pool.setdefault
+            for a in args:
+                flat.append(pool_setdefault(a, a) if type(a) is str else a)
+        else:
+            self._raw_args[n] = args
+        try:
+            self._offsets.append(len(flat))
+        except OverflowError:  # past 4G args
+            self._offsets = array("Q", self._offsets)
+            self._offsets.append(len(flat))
+
+        if not n & 7:
+            self._bits.append(0)
+        if result is True:
+            self._bits[n >> 3] |= 1 << (n & 7)
+        elif result is not False:
+            self._other[n] = result
+        self._n = n + 1
+
+    def extend(self, results: Iterable[dict]) -> None:
+        append = self.append
+        for r in results:
+            append(r["command"], r["args"], r["result"])
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _row(self, i: int) -> dict:
+        if i in self._raw_args:
+            args = self._raw_args[i]
+        else:
+            args = self._flat[self._offsets[i]:self._offsets[i + 1]]
+        result = self._other.get(i, _BIT)
+        if result is _BIT:
+            result = bool(self._bits[i >> 3] >> (i & 7) & 1)
+        return {"command": self._names[self._commands[i]], "args": args, "result": result}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(self._n))]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("ResultTable index out of range")
+        return self._row(index)
+
+    def __iter__(self):
+        row = self._row
+        for i in range(self._n):
+            yield row(i)
+
+    def __eq__(self, other):
+        if isinstance(other, (ResultTable, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def count_valid(self) -> int:
+        """Rows whose result is True, without building any dicts."""
+        return sum(bin(b).count("1") for b in self._bits)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the table, including the interned values."""
+        import sys
+        size = sys.getsizeof(self._commands) + sys.getsizeof(self._offsets) + sys.getsizeof(self._bits)
+        size += sys.getsizeof(self._flat) + sys.getsizeof(self._other) + sys.getsizeof(self._raw_args)
+        size += sys.getsizeof(self._pool) + sum(sys.getsizeof(v) for v in self._pool.values())
+        size += sum(sys.getsizeof(v) for v in self._other.values())
+        return size
+
+
+__all__ = ["ResultTable"]
@@ -0,0 +1,305 @@
+# osdag_validator_cli/scheduler.py
+"""
+Two-lane fair scheduler for the API: interactive single validations and
+bulk batch work, served from one queue by weighted fair queueing.
+
+One lane holds the server at a time (bulk slices run in worker threads,
+interactive requests on the event loop, and both compete for the same
+interpreter). Each lane has a virtual finish time, the server time it has
+been given divided by its weight; when both lanes have work waiting, the
+one with the smaller virtual finish time goes next. A lane that was idle
+starts again at the system's virtual time, so idling earns no credit. With
+both lanes busy the bulk lane keeps bulk_weight / (interactive_weight +
+bulk_weight) of the time and neither lane is starved.
+
+ - Interactive requests run under interactive_slot(), which is awaited: a
+   request that arrives while bulk slices hold the server is queued
+   (without blocking the loop) until they end. The interactive lane keeps
+   the server, and is charged for it, until it has been idle for
+   `idle_grace` seconds, so a stream of short requests is not queued
+   behind a slice one request at a time.
+ - Bulk work is cut into slices of `slice_rows` rows, each run under
+   bulk_slot() (blocks the calling thread), up to `bulk_concurrency` at a
+   time. Slices are short by default, since a queued interactive request
+   waits for the running ones to finish.
+
+Waiting bulk threads block on a condition and hold no GIL, so the event
+loop answers interactive requests without competing with them; an
+interactive request waits at most for the slices already running.
+
+Admission control is per lane: enter_interactive() and enter_bulk() return
+False once `interactive_budget` interactive requests (running or queued)
+or `bulk_budget` bulk requests are in flight; retry_after() estimates, in
+whole seconds, when a lane will have room again (for a 429 Retry-After
+header).
+"""
+
+from __future__ import annotations
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+INTERACTIVE, BULK = "interactive", "bulk"
+
+
+class _Waiter:
+    """
+    One queued unit of work: a bulk slice waits on `cond`, an interactive
+    request that has to wait on `future` (resolved on its `loop`).
+    """
+
+    __slots__ = ("granted", "cond", "loop", "future")
+
+    def __init__(self, cond=None):
+        self.granted = False
+        self.cond = cond
+        self.loop = None
+        self.future = None
+
+
+def _wake(future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class FairScheduler:
+    """Weighted fair queueing between the interactive and bulk lanes; see the module docstring."""
+
+    def __init__(self, interactive_weight: float = 4, bulk_weight: float = 1,
+                 interactive_budget: int = 512, bulk_budget: int = 8, slice_rows: int = 64,
+                 bulk_concurrency: int = 1, idle_grace: float = 0.005):
+        if interactive_weight <= 0 or bulk_weight <= 0:
+            raise ValueError("lane weights must be > 0")
+        if min(interactive_budget, bulk_budget, slice_rows, bulk_concurrency) < 1:
+            raise ValueError("budgets, slice_rows and bulk_concurrency must be >= 1")
+        self.interactive_weight = interactive_weight
+        self.bulk_weight = bulk_weight
+        self.interactive_budget = interactive_budget
+        self.bulk_budget = bulk_budget
+        self.slice_rows = slice_rows
+        self.bulk_concurrency = bulk_concurrency
+        self.idle_grace = idle_grace
+        self._lock = threading.Lock()
+        self._weight = {INTERACTIVE: interactive_weight, BULK: bulk_weight}
+        # the shared queue, guarded by _lock
+        self._waiting = {INTERACTIVE: deque(), BULK: deque()}
+        self._finish = {INTERACTIVE: 0.0, BULK: 0.0}  # per-lane virtual finish time
+        self._vtime = 0.0    # virtual time at the start of the current turn
+        self._owner = None   # lane holding the server
+        self._since = 0.0    # when _owner took it
+        # interactive lane: admission counters are only touched by the event loop thread
+        self.interactive_inflight = 0
+        self.interactive_requests = 0
+        self.interactive_running = 0
+        self.interactive_last = 0.0
+        self.interactive_deferred = 0
+        # bulk lane
+        self.bulk_inflight = 0
+        self.bulk_running = 0
+        self.bulk_slices = 0
+        self.bulk_deferred = 0
+        self.bulk_seconds = 0.0
+        self.bulk_request_seconds = 0.0  # moving average, for Retry-After
+        self.rejected = {INTERACTIVE: 0, BULK: 0}
+
+    # -- the shared queue (all under _lock) -------------------------------
+
+    def _virtual(self, lane: str, now: float) -> float:
+        """Virtual finish time of `lane`, counting its current turn up to `now`."""
+        finish = self._finish[lane]
+        if lane == self._owner:
+            finish += (now - self._since) / self._weight[lane]
+        return finish
+
+    def _end_turn(self, at: float) -> None:
+        lane = self._owner
+        self._finish[lane] += max(0.0, at - self._since) / self._weight[lane]
+        self._owner = None
+
+    def _holds(self, now: float) -> bool:
+        """Whether the lane owning the server still has a claim on it."""
+        if self._owner == BULK:
+            return self.bulk_running > 0
+        return (self.interactive_running > 0 or bool(self._waiting[INTERACTIVE])
+                or now - self.interactive_last < self.idle_grace)
+
+    def _enqueue(self, lane: str, waiter: _Waiter) -> None:
+        if lane != self._owner and not self._waiting[lane]:
+            # back from idle: start at the current virtual time, not behind it
+            self._finish[lane] = max(self._finish[lane], self._vtime)
+        self._waiting[lane].append(waiter)
+
+    def _dispatch(self, now: float) -> None:
+        """Give the server to the lane whose turn it is and grant its waiters."""
+        waiting = self._waiting
+        if self._owner == INTERACTIVE and not self._holds(now):
+            # the lane let go when its grace ran out, not when this was noticed
+            self._end_turn(min(now, self.interactive_last + self.idle_grace))
+        if self._owner == INTERACTIVE and waiting[BULK] and self.interactive_running == 0 \
+                and self._virtual(INTERACTIVE, now) >= self._finish[BULK]:
+            self._end_turn(now)
+        # a lane that finished a request within idle_grace is still backlogged
+        interactive = bool(waiting[INTERACTIVE]) or now - self.interactive_last < self.idle_grace
+        if self._owner is None:
+            # ties go to bulk, so an interactive lane that has used its share yields
+            if interactive and (not waiting[BULK] or self._finish[INTERACTIVE] < self._finish[BULK]):
+                lane = INTERACTIVE
+            elif waiting[BULK]:
+                lane = BULK
+            else:
+                return
+            self._owner, self._since = lane, now
+            self._vtime = max(self._vtime, self._finish[lane])
+        if self._owner == INTERACTIVE:
+            if waiting[BULK] and self._virtual(INTERACTIVE, now) >= self._finish[BULK]:
+                return  # bulk is owed the next turn; queue behind it
+            while waiting[INTERACTIVE]:
+                waiter = waiting[INTERACTIVE].popleft()
+                waiter.granted = True
+                self.interactive_running += 1
+                if waiter.future is not None:
+                    waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+        else:
+            while waiting[BULK] and self.bulk_running < self.bulk_concurrency:
+                if interactive and self._virtual(BULK, now) > self._finish[INTERACTIVE]:
+                    break
+                waiter = waiting[BULK].popleft()
+                waiter.granted = True
+                self.bulk_running += 1
+                waiter.cond.notify()
+
+    def _wake_bulk_head(self) -> None:
+        """Let the first waiting slice recompute when its turn can come by time alone."""
+        if self._waiting[BULK]:
+            self._waiting[BULK][0].cond.notify()
+
+    def _bulk_timeout(self, waiter: _Waiter, now: float):
+        """How long a waiting bulk slice may sleep before its turn can come by time alone."""
+        if waiter is not self._waiting[BULK][0] or self._owner != INTERACTIVE or self.interactive_running or self._waiting[INTERACTIVE]:
+            return None  # woken when the running work ends
+        owed = (self._finish[BULK] - self._virtual(INTERACTIVE, now)) * self.interactive_weight
+        grace = self.interactive_last + self.idle_grace - now
+        return max(0.0005, min(owed, grace))
+
+    # -- interactive lane -------------------------------------------------
+
+    def enter_interactive(self) -> bool:
+        """Admit one interactive request; False if the lane is over budget."""
+        if self.interactive_inflight >= self.interactive_budget:
+            self.rejected[INTERACTIVE] += 1
+            return False
+        self.interactive_inflight += 1
+        self.interactive_requests += 1
+        return True
+
+    def leave_interactive(self) -> None:
+        self.interactive_inflight -= 1
+
+    def _leave_interactive_slot(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.interactive_running -= 1
+            self.interactive_last = now
+            self._dispatch(now)
+            self._wake_bulk_head()
+
+    @asynccontextmanager
+    async def interactive_slot(self):
+        """Run one interactive request when the lane's turn comes (awaits; never blocks the loop)."""
+        waiter = _Waiter()
+        with self._lock:
+            now = time.monotonic()
+            self._enqueue(INTERACTIVE, waiter)
+            self._dispatch(now)
+            if not waiter.granted:
+                waiter.loop = asyncio.get_running_loop()
+                waiter.future = waiter.loop.create_future()
+                self.interactive_deferred += 1
+        if waiter.future is not None:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                with self._lock:
+                    if not waiter.granted:
+                        self._waiting[INTERACTIVE].remove(waiter)
+                        self._dispatch(time.monotonic())
+                        raise
+                self._leave_interactive_slot()
+                raise
+        try:
+            yield
+        finally:
+            self._leave_interactive_slot()
+
+    # -- bulk lane --------------------------------------------------------
+
+    def enter_bulk(self) -> bool:
+        """Admit one bulk request (batch upload, stream, job); False if over budget."""
+        with self._lock:
+            if self.bulk_inflight >= self.bulk_budget:
+                self.rejected[BULK] += 1
+                return False
+            self.bulk_inflight += 1
+            return True
+
+    def leave_bulk(self, seconds: float | None = None) -> None:
+        """End a bulk request; `seconds` (its duration) feeds the Retry-After estimate."""
+        with self._lock:
+            self.bulk_inflight -= 1
+            if seconds is not None:
+                avg = self.bulk_request_seconds
+                self.bulk_request_seconds = seconds if not avg else avg + (seconds - avg) / 8
+
+    @contextmanager
+    def bulk_slot(self):
+        """Run one slice of bulk work when the lane's turn comes (blocks the calling thread)."""
+        waiter = _Waiter(threading.Condition(self._lock))
+        with self._lock:
+            now = time.monotonic()
+            self._enqueue(BULK, waiter)
+            self._dispatch(now)
+            self.bulk_deferred += not waiter.granted
+            while not waiter.granted:
+                waiter.cond.wait(self._bulk_timeout(waiter, now))
+                now = time.monotonic()
+                self._dispatch(now)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            end = time.monotonic()
+            with self._lock:
+                self.bulk_running -= 1
+                self.bulk_slices += 1
+                self.bulk_seconds += end - start
+                if self.bulk_running == 0 and self._owner == BULK:
+                    self._end_turn(end)
+                self._dispatch(end)
+                self._wake_bulk_head()
+
+    # -- admission feedback -----------------------------------------------
+
+    def retry_after(self, lane: str) -> int:
+        """Whole seconds a rejected client of `lane` should wait (at least 1)."""
+        if lane == BULK:
+            return max(1, math.ceil(self.bulk_request_seconds))
+        return 1
+
+    def stats(self) -> dict:
+        return {
+            "interactive": {"inflight": self.interactive_inflight, "budget": self.interactive_budget,
+                            "weight": self.interactive_weight, "requests": self.interactive_requests,
+                            "waiting": len(self._waiting[INTERACTIVE]),
+                            "deferred_requests": self.interactive_deferred,
+                            "rejected": self.rejected[INTERACTIVE]},
+            "bulk": {"inflight": self.bulk_inflight, "budget": self.bulk_budget, "weight": self.bulk_weight,
+                     "running_slices": self.bulk_running, "slices": self.bulk_slices,
+                     "deferred_slices": self.bulk_deferred, "busy_seconds": self.bulk_seconds,
+                     "rejected": self.rejected[BULK]},
+        }
+
+
+__all__ = ["FairScheduler", "INTERACTIVE", "BULK"]
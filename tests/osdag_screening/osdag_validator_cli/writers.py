@@ -0,0 +1,178 @@
+# osdag_validator_cli/writers.py
+"""
+Incremental writers for batch results.
+
+Each writer receives result dicts ({"command", "args", "result"}) one at a
+time and writes them to an open text stream as they arrive, so a batch run
+never has to hold the full result list. The bytes produced are identical to
+what run_batch_file historically wrote from a complete list:
+
+ - json  : json.dump(results, f, ensure_ascii=False, indent=2)
+ - csv   : csv.writer rows of [command, *args, result]
+ - text  : str(results)
+ - jsonl : one compact JSON object per line (JSON Lines)
+
+Output is buffered in memory and handed to the stream (and flushed) once
+`flush_bytes` characters have accumulated, so downstream pipes see data
+early without paying a write per row. flush_bytes=0 writes every row through.
+"""
+
+from __future__ import annotations
+import csv
+import json
+from typing import Any, IO, Iterable
+
+
+def csv_row(r: dict) -> list:
+    """Flatten one result dict into the batch CSV row layout."""
+    return [r.get("command")] + list(map(str, r.get("args", []))) + [r.get("result")]
+
+
+DEFAULT_FLUSH_BYTES = 64 * 1024
+
+
+class _EmitAdapter:
+    """File-like shim so csv.writer can feed a ResultWriter's buffer."""
+
+    __slots__ = ("write",)
+
+    def __init__(self, write):
+        self.write = write
+
+
+class ResultWriter:
+    """Base class: write(result) per row, close() once at the end."""
+
+    def __init__(self, f: IO[str], flush_bytes: int = DEFAULT_FLUSH_BYTES):
+        self.f = f
+        self.flush_bytes = flush_bytes
+        self.count = 0
+        self._parts: list[str] = []
+        self._pending = 0
+
+    def _emit(self, text: str) -> None:
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self.flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand buffered output to the stream and flush it."""
+        if self._parts:
+            self.f.write("".join(self._parts))
+            self._parts.clear()
+            self._pending = 0
+        flush = getattr(self.f, "flush", None)
+        if flush is not None:
+            flush()
+
+    def write(self, result: dict) -> None:
+        raise NotImplementedError
+
+    def _trailer(self) -> str:
+        return ""
+
+    def close(self) -> None:
+        """Write any trailer and flush. Does not close the underlying stream."""
+        trailer = self._trailer()
+        if trailer:
+            self._parts.append(trailer)
+        self.flush()
+
+    def write_all(self, results: Iterable[dict]) -> int:
+        for r in results:
+            self.write(r)
+        self.close()
+        return self.count
+
+
+# json.dumps(indent=...) goes through the pure-Python encoder, whose closures
+# form reference cycles on every call; at millions of rows that garbage piles
+# up between GC passes. Scalars use the C encoder and indentation is done here.
+_encode_compact = json.JSONEncoder(ensure_ascii=False).encode
+
+def _json_key(key) -> str:
+    if isinstance(key, str):
+        return _encode_compact(key)
+    if key is True:
+        return '"true"'
+    if key is False:
+        return '"false"'
+    if key is None:
+        return '"null"'
+    return _encode_compact(_encode_compact(key))
+
+def pretty_json(obj: Any, level: int = 0, indent: str = "  ") -> str:
+    """Same text as json.dumps(obj, ensure_ascii=False, indent=2), cycle-free."""
+    if isinstance(obj, dict):
+        if not obj:
+            return "{}"
+        inner = indent * (level + 1)
+        items = ",\n".join(
+            f"{inner}{_json_key(k)}: {pretty_json(v, level + 1, indent)}" for k, v in obj.items()
+        )
+        return "{\n" + items + "\n" + indent * level + "}"
+    if isinstance(obj, (list, tuple)):
+        if not obj:
+            return "[]"
+        inner = indent * (level + 1)
+        items = ",\n".join(inner + pretty_json(v, level + 1, indent) for v in obj)
+        return "[\n" + items + "\n" + indent * level + "]"
+    return _encode_compact(obj)
+
+
+class JSONWriter(ResultWriter):
+    """Pretty JSON array, same layout as json.dump(..., indent=2)."""
+
+    def write(self, result: dict) -> None:
+        self._emit(("[\n  " if self.count == 0 else ",\n  ") + pretty_json(result, 1))
+        self.count += 1
+
+    def _trailer(self) -> str:
+        return "\n]" if self.count else "[]"
+
+
+class JSONLinesWriter(ResultWriter):
+    """One compact JSON object per line."""
+
+    def write(self, result: dict) -> None:
+        self._emit(_encode_compact(result) + "\n")
+        self.count += 1
+
+
+class CSVWriter(ResultWriter):
+    def __init__(self, f: IO[str], flush_bytes: int = DEFAULT_FLUSH_BYTES):
+        super().__init__(f, flush_bytes)
+        self._writer = csv.writer(_EmitAdapter(self._emit))
+
+    def write(self, result: dict) -> None:
+        self._writer.writerow(csv_row(result))
+        self.count += 1
+
+
+class TextWriter(ResultWriter):
+    """Python repr of the result list, same as str(results)."""
+
+    def write(self, result: dict) -> None:
+        self._emit(("[" if self.count == 0 else ", ") + repr(result))
+        self.count += 1
+
+    def _trailer(self) -> str:
+        return "]" if self.count else "[]"
+
+
+WRITERS = {
+    "json": JSONWriter,
+    "jsonl": JSONLinesWriter,
+    "csv": CSVWriter,
+    "text": TextWriter,
+}
+
+
+def get_writer(fmt: str, f: IO[str], flush_bytes: int = DEFAULT_FLUSH_BYTES) -> ResultWriter:
+    """Return the incremental writer for `fmt` (unknown formats fall back to text)."""
+    return WRITERS.get((fmt or "text").lower(), TextWriter)(f, flush_bytes)
+
+
+__all__ = ["ResultWriter", "JSONWriter", "JSONLinesWriter", "CSVWriter", "TextWriter", "WRITERS",
+           "DEFAULT_FLUSH_BYTES", "get_writer", "csv_row", "pretty_json"]
@@ -0,0 +1,38 @@
+# tests/test_api_batch.py
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli import app as app_module
+from osdag_validator_cli import cli
+
+client = TestClient(app_module.app)
+
+def test_items_form_matches_cli_dispatcher():
+    items = [{"command": "fu", "args": ["410"]}, {"command": " FY ", "args": ["abc"]},
+             {"command": "bolt", "args": ["m20", "8.8"]}, {"command": "plate", "args": [10, 250]},
+             {"command": "tf", "args": "12.5"}, {"command": "nope"}]
+    r = client.post("/validate/batch", json={"items": items})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["count"] == 6
+    assert body["results"][:5] == [True, False, True, True, True]
+    assert body["results"][5] == {"error": "Unknown command 'nope'"}
+
+def test_columnar_form():
+    r = client.post("/validate/batch", json={"command": "plate", "values": [["10", "250"], ["1", "2"], "x"]})
+    assert r.json()["results"] == [True, False, False]
+    values = [str(v) for v in range(250, 750)]
+    r = client.post("/validate/batch", json={"command": "fu", "values": values})
+    assert r.json()["results"] == [cli.run_command("fu", [v])["result"] for v in values]
+
+@pytest.mark.parametrize("payload", [{}, {"command": "fu"}, {"items": [], "command": "fu", "values": []}])
+def test_malformed_requests_are_400(payload):
+    assert client.post("/validate/batch", json=payload).status_code == 400
+
+def test_row_limit(monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_BATCH_ITEMS", 3)
+    assert client.post("/validate/batch", json={"command": "fu", "values": [1, 2, 3, 4]}).status_code == 413
@@ -0,0 +1,43 @@
+# tests/test_api_batch_performance.py
+import os
+import time
+
+import pytest
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli.app import app
+
+N = 10_000
+LOOPED = 1_000  # /validate calls timed; extrapolated to N
+
+def test_batch_endpoint_vs_looping_validate():
+    client = TestClient(app)
+    kinds = [("fu", ["410"]), ("fy", ["abc"]), ("bolt", ["M20", "8.8"]), ("plate", ["10", "250"])]
+    items = [{"command": c, "args": a} for c, a in (kinds[i % 4] for i in range(N))]
+
+    t0 = time.perf_counter()
+    for it in items[:LOOPED]:
+        assert client.post("/validate", json=it).status_code == 200
+    looped = (time.perf_counter() - t0) * N / LOOPED
+
+    t0 = time.perf_counter()
+    r = client.post("/validate/batch", json={"items": items})
+    batch = time.perf_counter() - t0
+    assert r.json()["count"] == N
+
+    t0 = time.perf_counter()
+    r = client.post("/validate/batch", json={"command": "fu", "values": [str(300 + i % 500) for i in range(N)]})
+    columnar = time.perf_counter() - t0
+    assert r.json()["count"] == N
+
+    print(f"\n{N} rows: looped /validate ~{looped:.2f}s ({N / looped:,.0f} rows/s), "
+          f"/validate/batch items {batch:.3f}s ({N / batch:,.0f} rows/s), "
+          f"columnar {columnar:.3f}s ({N / columnar:,.0f} rows/s)")
@@ -0,0 +1,125 @@
+# tests/test_api_cache.py
+import threading
+
+import pytest
+
+from osdag_validator_cli.cache import TTLCache, MISSING
+
+def test_ttl_entries_expire():
+    now = [0.0]
+    c = TTLCache(4, ttl=10, clock=lambda: now[0])
+    c.put("a", False)
+    assert c.get("a") is False
+    now[0] = 10.0
+    assert c.get("a") is MISSING
+    s = c.stats()
+    assert (s["hits"], s["misses"], s["expirations"], s["size"], s["ttl"]) == (1, 1, 1, 0, 10)
+
+def test_ttl_cache_is_lru_bounded():
+    c = TTLCache(2)
+    for k in "abc":
+        c.put(k, k)
+    assert c.keys() == ["b", "c"] and c.stats()["evictions"] == 1
+
+def test_ttl_cache_rejects_bad_ttl():
+    with pytest.raises(ValueError):
+        TTLCache(4, ttl=0)
+
+def test_ttl_cache_counts_under_threads():
+    c = TTLCache(64)
+
+    def work():
+        for i in range(2000):
+            if c.get(i % 100) is MISSING:
+                c.put(i % 100, i)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    s = c.stats()
+    assert s["hits"] + s["misses"] == 16000 and s["size"] == 64
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli import app as app_module
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app_module, "_HANDLERS", None)
+    app_module.configure_response_cache()
+    with TestClient(app_module.app) as c:
+        yield c
+    app_module.configure_response_cache()
+
+def _stats(client):
+    return client.get("/debug/cache").json()["response_cache"]
+
+def test_normalized_args_share_an_entry(client):
+    for size in (" M20 ", "m20", "M20"):
+        r = client.post("/validate", json={"command": "bolt", "args": [size, "8.8"]})
+        assert r.json() == {"ok": True, "command": "bolt", "args": [size, "8.8"], "result": True}
+    client.post("/validate", json={"command": "fu", "args": ["410"]})
+    client.post("/validate", json={"command": "FU", "args": [" 410 ", "extra"]})
+    s = _stats(client)
+    assert (s["hits"], s["misses"], s["size"]) == (3, 2, 2)
+
+def test_errors_and_batch_are_not_cached(client, tmp_path):
+    for _ in range(2):
+        assert client.post("/validate", json={"command": "fu-fy", "args": ["410", "250"]}).status_code == 500
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\n")
+    client.post("/validate", json={"command": "batch", "args": [str(f)]})
+    assert _stats(client)["size"] == 0
+
+def test_nan_args_are_not_cached(client):
+    client.post("/validate", json={"command": "fu", "args": ["410"]})
+    for value in ("nan", "NaN", " nan "):
+        r = client.post("/validate", json={"command": "fu", "args": [value]})
+        assert r.status_code == 200
+    client.post("/validate", json={"command": "plate", "args": ["10", "nan"]})
+    assert client.post("/validate", json={"command": "fu", "args": ["410"]}).json()["result"] is True
+    s = _stats(client)
+    assert (s["hits"], s["size"]) == (1, 1)
+    assert app_module.warm_response_cache([("tf", ["nan"]), ("tf", ["12.5"])]) == 1
+
+def test_new_validator_clears_the_cache(client, monkeypatch):
+    client.post("/validate", json={"command": "fu", "args": ["410"]})
+    monkeypatch.setattr(app_module, "_HANDLERS", None)
+    app_module.get_handlers()
+    assert _stats(client)["size"] == 0
+
+def test_recorded_keys_warm_the_cache(client, tmp_path):
+    client.post("/validate", json={"command": "plate", "args": ["10", "250"]})
+    client.post("/validate", json={"command": "bolt", "args": ["m20", " 8.8"]})
+    keys = tmp_path / "keys.jsonl"
+    keys.write_text(client.get("/debug/cache/keys").text)
+    assert keys.read_text().splitlines() == ['{"command": "plate", "args": [10, 250]}',
+                                             '{"command": "bolt", "args": ["M20", "8.8"]}']
+    app_module.configure_response_cache()
+    rows = list(app_module._iter_batch_rows(str(keys))) + [("nope", []), ("fu", []), ("batch", ["x"])]
+    assert app_module.warm_response_cache(rows) == 2
+    r = client.post("/validate", json={"command": "plate", "args": ["10.0", "250"]})
+    assert r.json()["result"] is True
+    assert _stats(client)["hits"] == 1
+
+def test_warm_file_loaded_at_startup(monkeypatch, tmp_path):
+    keys = tmp_path / "keys.csv"
+    keys.write_text("fu,410\ntf,12.5\n")
+    monkeypatch.setenv("OSDAG_VAL_RESPONSE_CACHE", "16")
+    monkeypatch.setenv("OSDAG_VAL_RESPONSE_CACHE_WARM", str(keys))
+    try:
+        with TestClient(app_module.app) as c:
+            assert _stats(c)["size"] == 2 and _stats(c)["maxsize"] == 16
+    finally:
+        app_module.configure_response_cache()
+
+def test_cache_can_be_turned_off(client):
+    app_module.configure_response_cache(0)
+    assert client.post("/validate", json={"command": "fu", "args": ["410"]}).json()["result"] is True
+    assert client.get("/debug/cache").json() == {"response_cache": None}
+    assert client.get("/debug/cache/keys").text == ""
@@ -0,0 +1,80 @@
+# tests/test_api_coalesce_performance.py
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+pytest.importorskip("fastapi")
+
+from osdag_validator_cli import app as app_module
+
+CLIENTS = 200
+REQUESTS = 20_000
+BODIES = [json.dumps(p).encode() for p in ({"command": "fu", "args": ["410"]},
+                                           {"command": "fu", "args": ["abc"]},
+                                           {"command": "plate", "args": ["10", "250"]})]
+
+async def _call(body: bytes):
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "path": "/validate", "raw_path": b"/validate", "query_string": b"",
+             "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+             "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": ""}
+    status = []
+
+    async def receive():
+        await asyncio.sleep(0)  # the body arrives from the network: other requests interleave
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app_module.app(scope, receive, send)
+    assert status == [200]
+
+async def _load():
+    """CLIENTS concurrent clients issuing REQUESTS in total; (latencies, seconds)."""
+    latencies = []
+    remaining = [REQUESTS]
+
+    async def client(k):
+        i = k
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            t0 = time.perf_counter()
+            await _call(BODIES[i % len(BODIES)])
+            latencies.append(time.perf_counter() - t0)
+            i += 1
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(k) for k in range(CLIENTS)))
+    return sorted(latencies), time.perf_counter() - t0
+
+@pytest.mark.parametrize("max_items,wait_ms", [(0, 0), (8, 1), (32, 1), (128, 1), (128, 5)])
+def test_coalescing_latency_vs_throughput(max_items, wait_ms):
+    app_module.warm_up()
+    # every request would be a response cache hit and skip the coalescer
+    app_module.configure_response_cache(0)
+    app_module.configure_coalescing(max_items, wait_ms / 1000)
+    try:
+        latencies, seconds = asyncio.run(_load())
+        stats = app_module._COALESCER.stats() if max_items else None
+    finally:
+        app_module.configure_coalescing(0)
+        app_module.configure_response_cache()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    label = f"window {max_items} / {wait_ms} ms" if max_items else "coalescing off"
+    if stats:
+        label += f", mean group {stats['mean_batch']:.1f}"
+    print(f"\n{label}: {REQUESTS / seconds:,.0f} req/s, p50 {p50:.1f} ms, p99 {p99:.1f} ms "
+          f"({CLIENTS} concurrent clients)")
+    assert REQUESTS / seconds > 1000 and p99 < 500  # adjust if needed for slow machines
+    if stats:
+        assert stats["mean_batch"] > 1  # concurrent requests were actually grouped
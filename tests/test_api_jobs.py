@@ -0,0 +1,139 @@
+# tests/test_api_jobs.py
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli import app as app_module, cli, jobs
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setenv("OSDAG_VAL_JOB_DIR", str(tmp_path / "jobs"))
+    monkeypatch.setenv("OSDAG_VAL_JOB_WORKERS", "1")
+    monkeypatch.setenv("OSDAG_VAL_MAX_JOBS", "2")
+    with TestClient(app_module.app) as c:
+        yield c
+    assert app_module._JOBS is None  # shut down with the app
+
+def _wait(client, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while True:
+        s = client.get(f"/jobs/{job_id}").json()
+        if s["state"] in jobs.FINISHED:
+            return s
+        assert time.time() < deadline, s
+        time.sleep(0.01)
+
+def test_job_lifecycle(client, tmp_path):
+    src = tmp_path / "in.csv"
+    src.write_text("fu,410\nbolt,M99,8.8\n" * 100)
+    r = client.post("/jobs", json={"path": str(src), "format": "csv"})
+    assert r.status_code == 202 and r.headers["location"] == f"/jobs/{r.json()['id']}"
+    job_id = r.json()["id"]
+    s = _wait(client, job_id)
+    assert (s["state"], s["rows_done"], s["eta_seconds"], s["progress"]) == ("done", 200, 0.0, 1.0)
+    expected = tmp_path / "expected.csv"
+    cli.run_batch_file(str(src), str(expected), "csv")
+    r = client.get(f"/jobs/{job_id}/result")
+    assert r.headers["content-type"].startswith("text/csv")
+    assert r.content == expected.read_bytes()
+    assert [j["id"] for j in client.get("/jobs").json()["jobs"]] == [job_id]
+    assert client.delete(f"/jobs/{job_id}").json()["removed"] is True
+    assert client.get(f"/jobs/{job_id}").status_code == 404
+
+def test_result_follows_a_running_job(client, tmp_path, monkeypatch):
+    gate = threading.Event()
+    real = jobs._iter_batch_rows_from
+
+    def rows(path):
+        gate.wait(10)
+        yield from real(path)
+
+    monkeypatch.setattr(jobs, "_iter_batch_rows_from", rows)
+    src = tmp_path / "in.jsonl"
+    src.write_text('{"command": "fu", "args": ["410"]}\n' * 3)
+    job_id = client.post("/jobs", json={"path": str(src)}).json()["id"]
+    assert client.get(f"/jobs/{job_id}").json()["state"] in ("queued", "running")
+    threading.Timer(0.1, gate.set).start()
+    r = client.get(f"/jobs/{job_id}/result")
+    assert r.text.splitlines() == ['{"command": "fu", "args": ["410"], "result": true}'] * 3
+
+@pytest.mark.parametrize("end", ["fail", "cancel"])
+def test_following_a_job_that_ends_badly_aborts(client, tmp_path, monkeypatch, end):
+    gate = threading.Event()
+    real = jobs._iter_batch_rows_from
+
+    def rows(path):
+        for i, item in enumerate(real(path)):
+            if i == 300:
+                gate.wait(10)
+                if end == "fail":
+                    raise ValueError("disk on fire")
+            yield item
+
+    monkeypatch.setattr(jobs, "_iter_batch_rows_from", rows)
+    src = tmp_path / "in.csv"
+    src.write_text("fu,410\n" * 1000)
+    job_id = client.post("/jobs", json={"path": str(src)}).json()["id"]
+    if end == "fail":
+        threading.Timer(0.2, gate.set).start()
+    else:
+        threading.Timer(0.2, lambda: (client.delete(f"/jobs/{job_id}"), gate.set())).start()
+    with pytest.raises(app_module.JobOutputAborted, match="failed: ValueError: disk on fire" if end == "fail"
+                       else "cancelled"):
+        client.get(f"/jobs/{job_id}/result")
+
+def test_cancel_and_limits(client, tmp_path, monkeypatch):
+    gate = threading.Event()
+    real = jobs._iter_batch_rows_from
+
+    def rows(path):
+        gate.wait(10)
+        yield from real(path)
+
+    monkeypatch.setattr(jobs, "_iter_batch_rows_from", rows)
+    src = tmp_path / "in.csv"
+    src.write_text("fu,410\n")
+    ids = [client.post("/jobs", json={"path": str(src)}).json()["id"] for _ in range(2)]
+    r = client.post("/jobs", json={"path": str(src)})
+    assert r.status_code == 429
+    r = client.delete(f"/jobs/{ids[1]}")
+    assert r.json() == {"ok": True, "id": ids[1], "state": "cancelled", "removed": False}
+    assert client.get(f"/jobs/{ids[1]}/result").status_code == 409
+    gate.set()
+    assert _wait(client, ids[0])["state"] == "done"
+
+@pytest.mark.parametrize("body,status", [
+    ({"path": "/no/such/file.csv"}, 400),
+    ({"path": __file__, "format": "xml"}, 400),
+])
+def test_bad_job_requests(client, body, status):
+    assert client.post("/jobs", json=body).status_code == status
+
+def test_unknown_job(client):
+    assert client.get("/jobs/nope").status_code == 404
+    assert client.get("/jobs/nope/result").status_code == 404
+    assert client.delete("/jobs/nope").status_code == 404
+
+def test_full_queue_sends_retry_after(client, tmp_path, monkeypatch):
+    gate = threading.Event()
+    real = jobs._iter_batch_rows_from
+
+    def rows(path):
+        gate.wait(10)
+        yield from real(path)
+
+    monkeypatch.setattr(jobs, "_iter_batch_rows_from", rows)
+    src = tmp_path / "in.csv"
+    src.write_text("fu,410\n")
+    ids = [client.post("/jobs", json={"path": str(src)}).json()["id"] for _ in range(2)]
+    r = client.post("/jobs", json={"path": str(src)})
+    assert r.status_code == 429 and int(r.headers["retry-after"]) >= 1
+    gate.set()
+    for job_id in ids:
+        _wait(client, job_id)
@@ -0,0 +1,49 @@
+# tests/test_api_jobs_performance.py
+import os
+import time
+
+import pytest
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli import app as app_module, cli, jobs
+
+N = 500_000
+
+def test_job_submit_is_immediate(tmp_path, monkeypatch):
+    src = tmp_path / "big.csv"
+    src.write_text("fu,410\nfy,250\nbolt,M20,8.8\nplate,10,250\ntf,12.5\n" * (N // 5))
+    t0 = time.perf_counter()
+    cli.run_batch_file(str(src), str(tmp_path / "inline.jsonl"), "jsonl", stream=True, preparse=True)
+    inline = time.perf_counter() - t0
+
+    monkeypatch.setenv("OSDAG_VAL_JOB_DIR", str(tmp_path / "jobs"))
+    with TestClient(app_module.app) as client:
+        t0 = time.perf_counter()
+        r = client.post("/jobs", json={"path": str(src)})
+        submit = time.perf_counter() - t0
+        job_id = r.json()["id"]
+        polls = []
+        while True:
+            t1 = time.perf_counter()
+            s = client.get(f"/jobs/{job_id}").json()
+            polls.append(time.perf_counter() - t1)
+            if s["state"] in jobs.FINISHED:
+                break
+            time.sleep(0.05)
+        total = time.perf_counter() - t0
+    assert s["state"] == "done" and s["rows_done"] == N
+    polls.sort()
+    print(f"\nPOST /jobs for {N:,} rows answered in {submit * 1000:.1f} ms; "
+          f"job ran at {s['rows_per_sec']:,.0f} rows/s ({total:.2f}s, inline run {inline:.2f}s); "
+          f"status poll p50 {polls[len(polls) // 2] * 1000:.1f} ms, max {polls[-1] * 1000:.1f} ms")
+    # submitting and polling must not wait on the job; the job itself runs near inline speed
+    assert submit < 0.5 and polls[-1] < 0.5  # adjust if needed for slow machines
+    assert total < 3 * inline + 1.0
@@ -0,0 +1,87 @@
+# tests/test_api_metrics.py
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli import app as app_module
+from osdag_validator_cli.metrics import Metrics
+
+@pytest.fixture
+def client(monkeypatch):
+    m = Metrics()
+    m.register_cache("response", lambda: app_module._RESPONSE_CACHE.stats())
+    monkeypatch.setattr(app_module, "METRICS", m)
+    monkeypatch.setattr(app_module, "_HANDLERS", None)
+    app_module.configure_response_cache()
+    with TestClient(app_module.app) as c:
+        yield c
+    app_module.configure_response_cache()
+
+def _samples(client):
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    out = {}
+    for line in r.text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+def test_validate_counts_outcomes_and_phases(client):
+    for args in (["410"], ["410"], ["abc"]):
+        assert client.post("/validate", json={"command": "fu", "args": args}).status_code == 200
+    assert client.post("/validate", json={"command": "nope", "args": []}).status_code == 400
+    s = _samples(client)
+    assert s['osdag_validator_validations_total{command="fu",outcome="valid"}'] == 2
+    assert s['osdag_validator_validations_total{command="fu",outcome="invalid"}'] == 1
+    for phase in ("parse", "dispatch", "serialize"):
+        assert s[f'osdag_validator_phase_seconds_count{{unit="request",phase="{phase}"}}'] == 3
+    # the second "410" was answered from the response cache
+    assert s['osdag_validator_phase_seconds_count{unit="request",phase="validate"}'] == 2
+    assert s['osdag_validator_phase_seconds_count{unit="block",phase="validate"}'] == 0
+    assert s['osdag_validator_cache_hits_total{cache="response"}'] == 1
+    assert s['osdag_validator_cache_hit_ratio{cache="response"}'] == pytest.approx(1 / 3)
+
+def test_rejected_validate_requests_count_as_errors(client, monkeypatch):
+    assert client.post("/validate", json={"command": "nope", "args": []}).status_code == 400
+    assert client.post("/validate", json={"command": "fu", "args": []}).status_code == 400
+    monkeypatch.setattr(app_module._SCHEDULER, "enter_interactive", lambda: False)
+    assert client.post("/validate", json={"command": "fu", "args": ["410"]}).status_code == 429
+    s = _samples(client)
+    assert s['osdag_validator_validations_total{command="nope",outcome="error"}'] == 1
+    assert s['osdag_validator_validations_total{command="fu",outcome="error"}'] == 2
+    assert s['osdag_validator_phase_seconds_count{unit="request",phase="parse"}'] == 0
+
+def test_batch_endpoints_record_rows(client):
+    r = client.post("/validate/batch", json={"items": [{"command": "fu", "args": ["410"]},
+                                                       {"command": "nope"}]})
+    assert r.status_code == 200
+    body = "".join(json.dumps({"command": "fy", "args": [v]}) + "\n" for v in ("250", "x", "300"))
+    r = client.post("/validate/stream", content=body)
+    assert r.status_code == 200 and len(r.text.splitlines()) == 3
+    s = _samples(client)
+    assert s['osdag_validator_validations_total{command="fu",outcome="valid"}'] == 1
+    assert s['osdag_validator_validations_total{command="nope",outcome="error"}'] == 1
+    assert s['osdag_validator_validations_total{command="fy",outcome="valid"}'] == 2
+    assert s['osdag_validator_validations_total{command="fy",outcome="invalid"}'] == 1
+    assert s["osdag_validator_batch_rows_total"] == 5
+    assert s['osdag_validator_phase_seconds_count{unit="block",phase="parse"}'] >= 2
+    assert s['osdag_validator_phase_seconds_count{unit="request",phase="parse"}'] == 0
+    assert s["osdag_validator_batch_rows_per_second"] > 0
+
+def test_batch_command_counts_rows(client, tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nfu,abc\n")
+    r = client.post("/validate", json={"command": "batch", "args": [str(f)]})
+    assert r.status_code == 200
+    s = _samples(client)
+    assert s['osdag_validator_validations_total{command="fu",outcome="valid"}'] == 1
+    assert s['osdag_validator_validations_total{command="fu",outcome="invalid"}'] == 1
+    assert 'osdag_validator_validations_total{command="batch",outcome="valid"}' not in s
+    assert s["osdag_validator_batch_rows_total"] == 2
@@ -0,0 +1,109 @@
+# tests/test_api_scheduler.py
+import asyncio
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("fastapi")
+httpx = pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli import app as app_module
+
+@pytest.fixture
+def client():
+    app_module.configure_scheduler()
+    with TestClient(app_module.app) as c:
+        yield c
+    app_module.configure_scheduler()
+
+def test_lanes_count_requests(client, tmp_path):
+    assert client.post("/validate", json={"command": "fu", "args": ["410"]}).json()["result"] is True
+    r = client.post("/validate/batch", json={"command": "fu", "values": ["410", "1", "250"]})
+    assert r.json()["results"] == [True, False, False]
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\n")
+    client.post("/validate", json={"command": "batch", "args": [str(f)]})
+    client.post("/validate/stream", content=b'{"command": "fu", "args": ["410"]}\n')
+    st = client.get("/debug/scheduler").json()["scheduler"]
+    assert (st["interactive"]["requests"], st["interactive"]["inflight"], st["bulk"]["inflight"]) == (1, 0, 0)
+    # one slice each for /validate/batch, the batch command and the stream
+    assert st["bulk"]["slices"] == 3
+
+def test_sliced_bulk_results_keep_order(client):
+    app_module.configure_scheduler(slice_rows=3)
+    values = [str(v) for v in range(400, 420)]
+    r = client.post("/validate/batch", json={"command": "fu", "values": values})
+    assert r.json()["results"] == app_module.run_rows([("fu", [v]) for v in values])
+    body = "".join('{"command": "fu", "args": ["%s"]}\n' % v for v in values) + "not json\n"
+    lines = client.post("/validate/stream", content=body.encode()).text.splitlines()
+    assert lines[:20] == [json.dumps(r) for r in app_module.iter_rows([("fu", [v]) for v in values])]
+    assert lines[20].startswith('{"line": 21, "error": "Invalid JSON on line 21')
+    assert app_module._SCHEDULER.stats()["bulk"]["slices"] >= 14
+
+def test_batch_command_runs_in_bulk_slices(client, tmp_path):
+    app_module.configure_scheduler(slice_rows=4)
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nfy,abc\nbolt,M20,8.8\n" * 5)
+    r = client.post("/validate", json={"command": "batch", "args": [str(f)]})
+    assert r.status_code == 200
+    assert r.json()["result"] == list(app_module.run_batch_file(str(f)))
+    # 15 rows in slices of 4
+    assert client.get("/debug/scheduler").json()["scheduler"]["bulk"]["slices"] == 4
+
+def test_over_budget_lanes_get_429(client, tmp_path):
+    app_module.configure_scheduler(interactive_budget=1, bulk_budget=1)
+    scheduler = app_module._SCHEDULER
+    scheduler.enter_interactive()
+    scheduler.enter_bulk()
+    r = client.post("/validate", json={"command": "fu", "args": ["410"]})
+    assert r.status_code == 429 and r.headers["retry-after"] == "1"
+    for path, kwargs in (("/validate/batch", {"json": {"command": "fu", "values": ["410"]}}),
+                         ("/validate/stream", {"content": b'{"command": "fu", "args": ["410"]}\n'}),
+                         ("/validate", {"json": {"command": "batch", "args": [str(tmp_path)]}})):
+        r = client.post(path, **kwargs)
+        assert r.status_code == 429 and r.headers["retry-after"] == "1", path
+    st = client.get("/debug/scheduler").json()["scheduler"]
+    assert (st["interactive"]["rejected"], st["bulk"]["rejected"]) == (1, 3)
+
+def test_interactive_requests_queue_behind_bulk_and_429_over_budget(client):
+    app_module.configure_scheduler(interactive_budget=1)
+    scheduler = app_module._SCHEDULER
+    running, release = threading.Event(), threading.Event()
+
+    def bulk():
+        with scheduler.bulk_slot():
+            running.set()
+            release.wait(5)
+
+    t = threading.Thread(target=bulk)
+    t.start()
+    assert running.wait(1)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app_module.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            body = {"command": "fu", "args": ["410"]}
+            first = asyncio.ensure_future(c.post("/validate", json=body))
+            while scheduler.stats()["interactive"]["waiting"] < 1:  # queued behind the slice
+                await asyncio.sleep(0.001)
+            second = await c.post("/validate", json=body)
+            release.set()
+            return await first, second
+
+    try:
+        first, second = asyncio.run(asyncio.wait_for(main(), 5))
+    finally:
+        release.set()
+        t.join()
+    assert first.status_code == 200 and first.json()["result"] is True
+    assert second.status_code == 429 and second.headers["retry-after"] == "1"
+    st = scheduler.stats()["interactive"]
+    assert (st["rejected"], st["deferred_requests"], st["inflight"]) == (1, 1, 0)
+
+def test_scheduler_can_be_turned_off(client):
+    app_module.configure_scheduler(False)
+    assert client.post("/validate/batch", json={"command": "fu", "values": ["410"]}).json()["results"] == [True]
+    assert client.get("/debug/scheduler").json() == {"scheduler": None}
@@ -0,0 +1,109 @@
+# tests/test_api_scheduler_performance.py
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+pytest.importorskip("fastapi")
+
+from osdag_validator_cli import app as app_module, jobs
+
+DURATION = 3.0
+INTERACTIVE_CLIENTS = 16
+THINK_SECONDS = 0.002
+BATCH_CLIENTS = 2
+BATCH_ROWS = 20_000
+JOB_ROWS = 400_000
+
+async def _call(method: str, path: str, body: bytes = b""):
+    """One request over raw ASGI; returns the status code."""
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+             "path": path, "raw_path": path.encode(), "query_string": b"",
+             "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+             "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": ""}
+    status = []
+
+    async def receive():
+        await asyncio.sleep(0)
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app_module.app(scope, receive, send)
+    return status[0]
+
+async def _load(bulk: bool, src: str):
+    latencies = []
+    batch_rows = [0]
+    stop = time.perf_counter() + DURATION
+    interactive = [json.dumps({"command": c, "args": a}).encode()
+                   for c, a in (("fu", ["410"]), ("bolt", ["M20", "8.8"]), ("plate", ["10", "250"]))]
+    batch = json.dumps({"command": "fu", "values": [str(v) for v in range(BATCH_ROWS)]}).encode()
+
+    async def interactive_client(k):
+        i = k
+        while time.perf_counter() < stop:
+            t0 = time.perf_counter()
+            assert await _call("POST", "/validate", interactive[i % 3]) == 200
+            latencies.append(time.perf_counter() - t0)
+            i += 1
+            await asyncio.sleep(THINK_SECONDS)
+
+    async def batch_client():
+        while time.perf_counter() < stop:
+            assert await _call("POST", "/validate/batch", batch) == 200
+            batch_rows[0] += BATCH_ROWS
+
+    queue = app_module.get_job_queue()
+    submitted = [queue.submit(src) for _ in range(4)] if bulk else []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(interactive_client(k) for k in range(INTERACTIVE_CLIENTS)),
+                         *(batch_client() for _ in range(BATCH_CLIENTS if bulk else 0)))
+    elapsed = time.perf_counter() - t0
+    job_rows = sum(j.rows_done for j in submitted)
+    for j in submitted:
+        queue.cancel(j.id)
+    return sorted(latencies), (batch_rows[0] + job_rows) / elapsed
+
+# scheduled interactive p99 under bulk load may be at most this many times
+# the no-bulk p99 (plus a small absolute allowance for timer noise)
+P99_RATIO = 5.0
+P99_SLACK_MS = 2.0
+
+def _run(tmp_path, monkeypatch, bulk, scheduled):
+    src = tmp_path / "big.csv"
+    if not src.exists():
+        src.write_text("fu,410\nfy,250\nbolt,M20,8.8\nplate,10,250\ntf,12.5\n" * (JOB_ROWS // 5))
+    monkeypatch.setenv("OSDAG_VAL_JOB_DIR", str(tmp_path / "jobs"))
+    app_module.warm_up()
+    app_module.configure_response_cache(0)
+    app_module.configure_scheduler(scheduled)
+    try:
+        latencies, bulk_rate = asyncio.run(_load(bulk, str(src)))
+    finally:
+        app_module.shutdown_jobs()
+        app_module.configure_scheduler()
+        app_module.configure_response_cache()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    label = "no bulk load" if not bulk else ("bulk load, scheduler on" if scheduled else "bulk load, scheduler off")
+    print(f"\n{label}: interactive p50 {p50:.2f} ms, p99 {p99:.2f} ms ({len(latencies)} requests); "
+          f"bulk {bulk_rate:,.0f} rows/s")
+    return p99, bulk_rate
+
+def test_interactive_latency_under_bulk_load(tmp_path, monkeypatch):
+    baseline, _ = _run(tmp_path, monkeypatch, bulk=False, scheduled=True)
+    unscheduled, _ = _run(tmp_path, monkeypatch, bulk=True, scheduled=False)
+    scheduled, bulk_rate = _run(tmp_path, monkeypatch, bulk=True, scheduled=True)
+    # interactive p99 stays near the no-bulk baseline while bulk work still progresses
+    assert scheduled <= baseline * P99_RATIO + P99_SLACK_MS
+    assert scheduled < unscheduled
+    assert bulk_rate > 0
@@ -0,0 +1,60 @@
+# tests/test_api_stream.py
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli import app as app_module
+from osdag_validator_cli import cli
+
+client = TestClient(app_module.app)
+
+def _post(body):
+    r = client.post("/validate/stream", content=body)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in r.text.splitlines()]
+
+def test_results_in_order_with_line_errors():
+    body = (b'{"command": "fu", "args": ["410"]}\n{"command": "BOLT", "args": ["m20", "8.8"]}\r\n'
+            b'not json\n\n[1]\n{"command": "plate", "args": [10, 250]}')
+    out = _post(body)
+    assert [r.get("result") for r in out] == [True, True, None, None, True]
+    assert out[1] == {"command": "bolt", "args": ["m20", "8.8"], "result": True}
+    assert out[2]["line"] == 3 and out[2]["error"].startswith("Invalid JSON on line 3")
+    assert out[3] == {"line": 5, "error": "Line 5 is not a JSON object"}
+
+def test_chunked_upload_matches_cli(monkeypatch):
+    monkeypatch.setattr(app_module, "STREAM_FIRST_ROWS", 3)
+    monkeypatch.setattr(app_module, "STREAM_BLOCK_ROWS", 50)
+    cmds = [("fu", ["410"]), ("fy", ["x"]), ("tf", ["12.5"]), ("plate", ["10", "5000"]), ("nope", [])]
+    lines = [json.dumps({"command": c, "args": a}).encode() + b"\n" for c, a in cmds * 200]
+    data = b"".join(lines)
+
+    def chunks():
+        # cut lines (and multi-byte characters) across chunk boundaries
+        for i in range(0, len(data), 997):
+            yield data[i:i + 997]
+
+    out = _post(chunks())
+    assert out == [cli.run_command(c, a) for c, a in cmds * 200]
+
+def test_overlong_line_stops_the_stream(monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_STREAM_LINE_BYTES", 100)
+    body = [b'{"command": "fu", "args": ["410"]}\n{"command": "fu", "args": ["', b"1" * 200, b'"]}\n']
+
+    async def chunks():
+        for piece in body:
+            yield piece
+
+    async def collect():
+        return "".join([text async for text in app_module._stream_results(chunks())])
+
+    out = [json.loads(line) for line in asyncio.run(collect()).splitlines()]
+    assert out[0]["result"] is True
+    assert out[1] == {"line": 2, "error": "Line 2 exceeds 100 bytes"}
@@ -0,0 +1,63 @@
+# tests/test_api_stream_performance.py
+import asyncio
+import os
+import time
+import tracemalloc
+
+import pytest
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+pytest.importorskip("fastapi")
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.app import app
+
+LINE = b'{"command": "fu", "args": ["410"]}\n'
+CHUNK_ROWS = 2000  # ~70 KB request body chunks
+
+def _upload(rows: int):
+    """Drive /validate/stream over raw ASGI; (first result s, total s, response bytes)."""
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "path": "/validate/stream", "raw_path": b"/validate/stream", "query_string": b"",
+             "headers": [(b"content-type", b"application/x-ndjson")], "scheme": "http",
+             "server": ("test", 80), "client": ("test", 1), "root_path": ""}
+    chunk = LINE * CHUNK_ROWS
+    state = {"sent": 0, "first": None, "bytes": 0}
+
+    async def receive():
+        if state["sent"] < rows:
+            state["sent"] += CHUNK_ROWS
+            await asyncio.sleep(0)
+            return {"type": "http.request", "body": chunk, "more_body": state["sent"] < rows}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.body" and message.get("body"):
+            if state["first"] is None:
+                state["first"] = time.perf_counter() - t0
+            state["bytes"] += len(message["body"])
+
+    t0 = time.perf_counter()
+    asyncio.run(app(scope, receive, send))
+    return state["first"], time.perf_counter() - t0, state["bytes"]
+
+def test_stream_latency_and_throughput():
+    cli.run_rows([("fu", ["410"])])  # validator and numpy imported
+    _upload(CHUNK_ROWS)  # worker threads started
+    for rows in (100_000, 1_000_000):
+        first, total, out = _upload(rows)
+        print(f"\n{rows:,} rows: first result after {first * 1000:.1f} ms, {total:.1f}s total "
+              f"({rows / total:,.0f} rows/s, {out / 1e6:.0f} MB out)")
+
+def test_stream_memory_is_flat():
+    peaks = {}
+    for rows in (20_000, 200_000):
+        tracemalloc.start()
+        _upload(rows)
+        peaks[rows] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    print("\npeak traced memory: " + ", ".join(f"{r:,} rows {p / 1e6:.1f} MB" for r, p in peaks.items()))
+    assert peaks[200_000] < 2 * peaks[20_000]
@@ -0,0 +1,69 @@
+# tests/test_api_validate.py
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from osdag_validator_cli import app as app_module
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(app_module, "_HANDLERS", None)
+    with TestClient(app_module.app) as c:
+        yield c
+
+def test_startup_binds_handlers(client):
+    assert app_module._HANDLERS is not None
+    assert {"fu", "fy", "fu-fy", "tf", "bolt", "plate", "batch"} <= set(app_module._HANDLERS)
+
+@pytest.mark.parametrize("command,args,result", [
+    ("fu", ["410"], True), (" FY ", ["abc"], False), ("tf", ["12.5"], True),
+    ("bolt", ["m20", "8.8"], True), ("plate", ["10", "5000"], False),
+])
+def test_validate_results(client, command, args, result):
+    r = client.post("/validate", json={"command": command, "args": args})
+    assert r.status_code == 200
+    assert r.json() == {"ok": True, "command": command.lower().strip(), "args": args, "result": result}
+
+@pytest.mark.parametrize("command,args,detail", [
+    ("fu", [], "fu requires 1 argument"),
+    ("fufy", ["410"], "fu-fy requires 2 arguments"),
+    ("bolt", ["M20"], "bolt requires size and grade"),
+    ("nope", [], "Unsupported command: nope"),
+])
+def test_validate_bad_requests(client, command, args, detail):
+    r = client.post("/validate", json={"command": command, "args": args})
+    assert r.status_code == 400
+    assert r.json()["detail"] == detail
+
+def test_missing_validator_method_is_500(client):
+    # the Validator has no validate_fu_fy; the call fails as it did when looked up per request
+    r = client.post("/validate", json={"command": "fu-fy", "args": ["410", "250"]})
+    assert r.status_code == 500
+    assert "validate_fu_fy" in r.json()["detail"]
+
+def test_batch_command(client, tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nbolt,M99,8.8\n")
+    r = client.post("/validate", json={"command": "batch", "args": [str(f)]})
+    assert [row["result"] for row in r.json()["result"]] == [True, False]
+
+def test_handlers_built_lazily_without_startup(monkeypatch):
+    monkeypatch.setattr(app_module, "_HANDLERS", None)
+    r = TestClient(app_module.app).post("/validate", json={"command": "fu", "args": ["410"]})
+    assert r.json()["result"] is True
+
+def test_coalesced_requests(client, monkeypatch):
+    app_module.configure_coalescing(16, 0.0005)
+    try:
+        r = client.post("/validate", json={"command": "plate", "args": ["10", "250"]})
+        assert r.json() == {"ok": True, "command": "plate", "args": ["10", "250"], "result": True}
+        assert app_module._COALESCER.stats()["rows"] == 1
+        monkeypatch.setattr(app_module._COALESCER, "run_rows", lambda rows: [{"error": "boom"}] * len(rows))
+        r = client.post("/validate", json={"command": "fu", "args": ["410"]})
+        assert r.status_code == 500 and r.json()["detail"] == "Internal error: boom"
+    finally:
+        app_module.configure_coalescing(0)
+    assert app_module._COALESCER is None
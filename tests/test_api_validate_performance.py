@@ -0,0 +1,67 @@
+# tests/test_api_validate_performance.py
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+pytest.importorskip("fastapi")
+
+from osdag_validator_cli import app as app_module
+
+N = 5000
+
+async def _call(app, body: bytes):
+    """One POST /validate over raw ASGI (no HTTP client in the measurement)."""
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+             "path": "/validate", "raw_path": b"/validate", "query_string": b"",
+             "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+             "scheme": "http", "server": ("test", 80), "client": ("test", 1), "root_path": ""}
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await app(scope, receive, send)
+    return status[0]
+
+@pytest.mark.parametrize("cache_size", [0, app_module.RESPONSE_CACHE_SIZE])
+def test_validate_requests_per_second(cache_size):
+    bodies = [json.dumps(p).encode() for p in ({"command": "fu", "args": ["410"]},
+                                               {"command": "bolt", "args": ["M20", "8.8"]},
+                                               {"command": "plate", "args": ["10", "250"]})]
+    app_module.warm_up()
+    app_module.configure_response_cache(cache_size)
+
+    async def run():
+        for b in bodies:
+            assert await _call(app_module.app, b) == 200
+        best = float("inf")
+        for _ in range(3):
+            t0 = time.perf_counter()
+            for i in range(N):
+                await _call(app_module.app, bodies[i % 3])
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    try:
+        best = asyncio.run(run())
+        cache = app_module._RESPONSE_CACHE
+        stats = cache.stats() if cache is not None else None
+    finally:
+        app_module.configure_response_cache()
+    label = "response cache on" if cache_size else "response cache off"
+    print(f"\n/validate over ASGI, {label}: {N / best:,.0f} requests/s ({best / N * 1e6:.0f} us/request)")
+    assert best / N < 1e-3  # adjust if needed for slow machines
+    if cache_size:
+        # the timed runs must have been answered from the cache, not recomputed
+        assert stats["misses"] == len(bodies) and stats["hits"] == 3 * N
@@ -0,0 +1,58 @@
+# tests/test_batch_cache.py
+import json
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.cache import LRUCache
+
+def test_lru_eviction_and_counters():
+    c = LRUCache(2)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1          # a is now most recent
+    c.put("c", 3)                   # evicts b
+    assert c.get("b", None) is None
+    s = c.stats()
+    assert (s["hits"], s["misses"], s["evictions"], s["size"]) == (1, 1, 1, 2)
+
+def test_lru_rejects_zero_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+def test_run_command_key_is_normalised():
+    c = LRUCache(8)
+    assert cli.run_command("fu", ["410"], cache=c)["result"] is True
+    assert cli.run_command(" fu", [" 410 "], cache=c)["result"] is True
+    assert (c.hits, c.misses) == (1, 1)
+
+def test_cached_batch_matches_uncached(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("bolt,M20,8.8\nplate,10,250\nfu,abc\nnope,1\n" * 25)
+    cache = LRUCache(16)
+    assert cli.run_batch_file(str(f), cache=cache) == cli.run_batch_file(str(f))
+    # 3 cacheable distinct rows; the unknown command never reaches the cache
+    assert (cache.misses, cache.hits) == (3, 72)
+
+def test_unhashable_args_bypass_cache(tmp_path):
+    f = tmp_path / "in.json"
+    f.write_text(json.dumps([{"command": "fu", "args": [[410]]}] * 3))
+    cache = LRUCache(4)
+    results = cli.run_batch_file(str(f), cache=cache)
+    assert [r["result"] for r in results] == [False] * 3
+    assert len(cache) == 0
+
+def test_parallel_cache_counters_are_merged(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nfy,250\n" * 50)
+    cache = LRUCache(8)
+    results = list(cli.iter_batch_file(str(f), workers=2, chunk_size=10, cache=cache))
+    assert len(results) == 100
+    assert cache.hits + cache.misses == 100
+    assert cache.misses <= 4  # at most one miss per key per worker
+
+def test_cli_cache_size_reports_stats(tmp_path, capsys):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\n" * 5)
+    assert cli.main(["batch", str(f), "--format", "csv", "--cache-size", "10"]) == 0
+    assert "4 hits, 1 misses, 0 evictions" in capsys.readouterr().err
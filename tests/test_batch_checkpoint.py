@@ -0,0 +1,179 @@
+# tests/test_batch_checkpoint.py
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.checkpoint import load as load_checkpoint
+
+ROWS = "fu,410\nfy,abc\ntf,12.5\nbolt,M20,8.8\nplate,10,250\n\"fu\",\"3\n00\"\n"
+
+REAL_RUN = cli._run_command_by_name
+
+class Crash(Exception):
+    pass
+
+def _crash_after(monkeypatch, n):
+    """Make row validation die after n calls; returns a call counter."""
+    calls = {"n": 0}
+    def run(*a, **kw):
+        calls["n"] += 1
+        if n is not None and calls["n"] > n:
+            raise Crash
+        return REAL_RUN(*a, **kw)
+    monkeypatch.setattr(cli, "_run_command_by_name", run)
+    return calls
+
+def _write_input(tmp_path, name, reps=50):
+    src = tmp_path / name
+    if name.endswith(".csv"):
+        src.write_text(ROWS * reps)
+    else:
+        rows = [{"command": "fu", "args": [str(300 + i)]} for i in range(reps * 6)]
+        if name.endswith(".json"):
+            src.write_text(json.dumps(rows, indent=1))
+        else:
+            src.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    return src
+
+@pytest.mark.parametrize("name", ["in.csv", "in.jsonl", "in.json"])
+@pytest.mark.parametrize("fmt", ["json", "jsonl", "csv", "text"])
+def test_resume_after_crash_matches_uninterrupted(tmp_path, monkeypatch, name, fmt):
+    src = _write_input(tmp_path, name)
+    ref = tmp_path / "ref.out"
+    cli.run_batch_file(str(src), out_path=str(ref), out_format=fmt, stream=True)
+
+    out = tmp_path / "out.out"
+    ckpt = tmp_path / "run.ckpt"
+    _crash_after(monkeypatch, 137)
+    with pytest.raises(Crash):
+        cli.run_batch_file(str(src), out_path=str(out), out_format=fmt,
+                           checkpoint=str(ckpt), checkpoint_every=20)
+    state = load_checkpoint(str(ckpt))
+    assert state.row_index == 120
+    assert os.path.getsize(out) >= state.output_offset
+
+    calls = _crash_after(monkeypatch, None)
+    n = cli.run_batch_file(str(src), out_path=str(out), out_format=fmt,
+                           checkpoint=str(ckpt), checkpoint_every=20)
+    assert n == 300
+    assert calls["n"] == 300 - 120  # finished rows are not validated again
+    assert out.read_bytes() == ref.read_bytes()
+    assert not ckpt.exists()
+
+def test_checkpoint_rejects_other_job(tmp_path, monkeypatch):
+    src = _write_input(tmp_path, "in.csv")
+    out = tmp_path / "out.csv"
+    ckpt = tmp_path / "run.ckpt"
+    _crash_after(monkeypatch, 50)
+    with pytest.raises(Crash):
+        cli.run_batch_file(str(src), out_path=str(out), out_format="csv",
+                           checkpoint=str(ckpt), checkpoint_every=10)
+    _crash_after(monkeypatch, None)
+    with pytest.raises(ValueError):
+        cli.run_batch_file(str(src), out_path=str(out), out_format="json", checkpoint=str(ckpt))
+    src.write_text(ROWS)  # input changed since the checkpoint
+    with pytest.raises(ValueError):
+        cli.run_batch_file(str(src), out_path=str(out), out_format="csv", checkpoint=str(ckpt))
+
+def test_input_edited_in_place_is_not_resumed(tmp_path, monkeypatch):
+    src = _write_input(tmp_path, "in.csv")
+    out = tmp_path / "out.csv"
+    ckpt = tmp_path / "run.ckpt"
+    _crash_after(monkeypatch, 50)
+    with pytest.raises(Crash):
+        cli.run_batch_file(str(src), out_path=str(out), out_format="csv",
+                           checkpoint=str(ckpt), checkpoint_every=10)
+    _crash_after(monkeypatch, None)
+    # one value changed, same size
+    text = src.read_text()
+    src.write_text(text.replace("fu,410", "fu,411", 1))
+    assert len(src.read_text()) == len(text)
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    with pytest.raises(ValueError, match="changed since checkpoint"):
+        cli.run_batch_file(str(src), out_path=str(out), out_format="csv", checkpoint=str(ckpt))
+    assert load_checkpoint(str(ckpt)) is not None
+
+def test_checkpoint_needs_plain_out_file(tmp_path):
+    src = _write_input(tmp_path, "in.csv")
+    with pytest.raises(ValueError):
+        cli.run_batch_file(str(src), checkpoint=str(tmp_path / "c"))
+    with pytest.raises(ValueError):
+        cli.run_batch_file(str(src), out_path=str(tmp_path / "o.csv.gz"), checkpoint=str(tmp_path / "c"))
+
+def test_compressed_input_resumes(tmp_path, monkeypatch):
+    import gzip
+    src = tmp_path / "in.csv.gz"
+    src.write_bytes(gzip.compress((ROWS * 50).encode()))
+    ref = cli.run_batch_file(str(src))
+    out = tmp_path / "out.jsonl"
+    ckpt = tmp_path / "run.ckpt"
+    _crash_after(monkeypatch, 99)
+    with pytest.raises(Crash):
+        cli.run_batch_file(str(src), out_path=str(out), out_format="jsonl",
+                           checkpoint=str(ckpt), checkpoint_every=25)
+    _crash_after(monkeypatch, None)
+    cli.run_batch_file(str(src), out_path=str(out), out_format="jsonl", checkpoint=str(ckpt))
+    assert [json.loads(l) for l in out.read_text().splitlines()] == ref
+
+@pytest.mark.skipif(not hasattr(signal, "SIGKILL"), reason="needs SIGKILL")
+def test_killed_process_resumes(tmp_path):
+    src = tmp_path / "in.csv"
+    src.write_text(ROWS * 20_000)  # 120k rows
+    ref = tmp_path / "ref.json"
+    cli.run_batch_file(str(src), out_path=str(ref), out_format="json", stream=True)
+
+    out = tmp_path / "out.json"
+    ckpt = tmp_path / "run.ckpt"
+    argv = [sys.executable, "-m", "osdag_validator_cli.cli", "batch", str(src), "--out", str(out),
+            "--checkpoint", str(ckpt), "--checkpoint-every", "2000"]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    proc = subprocess.Popen(argv, env=env, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while not ckpt.exists() and proc.poll() is None and time.monotonic() < deadline:
+        time.sleep(0.005)
+    proc.send_signal(signal.SIGKILL)
+    proc.wait()
+    if not ckpt.exists():
+        pytest.skip("run finished before it could be killed")
+    assert load_checkpoint(str(ckpt)).row_index < 120_000
+
+    assert cli.main(["batch", str(src), "--out", str(out), "--checkpoint", str(ckpt)]) == 0
+    assert out.read_bytes() == ref.read_bytes()
+    assert not ckpt.exists()
+
+def _rows_outcome(rows):
+    try:
+        return "ok", list(rows)
+    except Exception as e:
+        return "error", type(e).__name__
+
+@pytest.mark.parametrize("suffix", [".csv", ".csv.gz"])
+def test_offset_reader_matches_plain_reader(tmp_path, suffix):
+    import gzip
+    import random
+    rnd = random.Random(11)
+    alphabet = ["fu", "410", ",", " ", '"', "\n", "\r", "\r\n", "é", "M20", ",", "\n"]
+    cases = ["fu,410\rfy,250\rbolt,M20,8.8\r", 'fu,"4\r\n10"\r\nfy,250\r\n', "fu,410\n\r\nfy,250\n"]
+    cases += ["".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 80))) for _ in range(300)]
+    src = tmp_path / f"in{suffix}"
+    for text in cases:
+        data = text.encode("utf-8")
+        src.write_bytes(gzip.compress(data) if suffix.endswith(".gz") else data)
+        expected = _rows_outcome(cli._iter_batch_rows(str(src)))
+        got = _rows_outcome(cli._iter_batch_rows_from(str(src)))
+        if expected[0] == "error":
+            assert got == expected
+            continue
+        tracked = got[1]
+        assert [row for _, row, _ in tracked] == expected[1], repr(text)
+        # raw bytes tile the input, and resuming at any row end yields the rest
+        assert b"".join(raw for _, _, raw in tracked) == data[:tracked[-1][0] if tracked else 0]
+        for i, (end, _, _) in enumerate(tracked):
+            assert [row for _, row, _ in cli._iter_batch_rows_from(str(src), end)] == expected[1][i + 1:]
@@ -0,0 +1,59 @@
+# tests/test_batch_compression.py
+import bz2
+import gzip
+import json
+import lzma
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.compression import open_text, strip_compression_suffix
+
+CODECS = {".gz": gzip, ".bz2": bz2, ".xz": lzma}
+CSV_ROWS = "fu,410\nfy,abc\nbolt,M20,8.8\nplate,10,250\n"
+JSONL_ROWS = "".join(
+    json.dumps({"command": c, "args": a}) + "\n"
+    for c, a in [("fu", ["410"]), ("fy", ["abc"]), ("bolt", ["M20", "8.8"]), ("plate", ["10", "250"])]
+)
+
+def test_strip_compression_suffix():
+    assert strip_compression_suffix("rows.jsonl.gz") == "rows.jsonl"
+    assert strip_compression_suffix("ROWS.CSV.XZ") == "ROWS.CSV"
+    assert strip_compression_suffix("rows.csv") == "rows.csv"
+
+@pytest.mark.parametrize("suffix", sorted(CODECS))
+@pytest.mark.parametrize("name,content", [("in.csv", CSV_ROWS), ("in.jsonl", JSONL_ROWS)])
+def test_compressed_input_matches_plain(tmp_path, suffix, name, content):
+    plain = tmp_path / name
+    plain.write_text(content)
+    packed = tmp_path / (name + suffix)
+    packed.write_bytes(CODECS[suffix].compress(content.encode()))
+    assert cli.run_batch_file(str(packed)) == cli.run_batch_file(str(plain))
+
+@pytest.mark.parametrize("suffix", sorted(CODECS))
+@pytest.mark.parametrize("fmt", ["json", "csv"])
+def test_compressed_output_matches_plain(tmp_path, suffix, fmt):
+    src = tmp_path / "in.csv"
+    src.write_text(CSV_ROWS)
+    plain = tmp_path / f"out.{fmt}"
+    packed = tmp_path / f"out.{fmt}{suffix}"
+    cli.run_batch_file(str(src), out_path=str(plain), out_format=fmt, stream=True)
+    cli.run_batch_file(str(src), out_path=str(packed), out_format=fmt, stream=True)
+    assert CODECS[suffix].decompress(packed.read_bytes()) == plain.read_bytes()
+
+def test_open_text_round_trip(tmp_path):
+    p = str(tmp_path / "x.txt.gz")
+    with open_text(p, "w") as f:
+        f.write("héllo\n")
+    with open_text(p) as f:
+        assert f.read() == "héllo\n"
+    with pytest.raises(ValueError):
+        open_text(p, "x")
+
+def test_cli_compressed_in_and_out(tmp_path):
+    src = tmp_path / "in.csv.gz"
+    src.write_bytes(gzip.compress(CSV_ROWS.encode()))
+    out = tmp_path / "out.jsonl.xz"
+    assert cli.main(["batch", str(src), "--format", "jsonl", "--out", str(out)]) == 0
+    rows = [json.loads(l) for l in lzma.decompress(out.read_bytes()).decode().splitlines()]
+    assert [r["result"] for r in rows] == [True, False, True, True]
@@ -0,0 +1,52 @@
+# tests/test_batch_compression_performance.py
+import bz2
+import gzip
+import lzma
+import os
+import time
+
+import pytest
+
+from osdag_validator_cli import cli
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+ROWS = "fu,410\nfy,250\ntf,12.5\nbolt,M20,8.8\nplate,10,250\nfu,abc\n"
+N = 50_000  # 300k rows
+
+def test_compressed_batch_throughput(tmp_path):
+    data = (ROWS * N).encode()
+    inputs = {
+        "plain": (tmp_path / "in.csv", data),
+        "gz": (tmp_path / "in.csv.gz", gzip.compress(data, 6)),
+        "bz2": (tmp_path / "in.csv.bz2", bz2.compress(data)),
+        "xz": (tmp_path / "in.csv.xz", lzma.compress(data)),
+    }
+    codecs = {"plain": (lambda b: b, lambda b: b), "gz": (gzip.decompress, lambda b: gzip.compress(b, 6)),
+              "bz2": (bz2.decompress, bz2.compress), "xz": (lzma.decompress, lzma.compress)}
+    rows = ROWS.count("\n") * N
+    timings = {}
+    outputs = {}
+    for name, (path, payload) in inputs.items():
+        path.write_bytes(payload)
+        suffix = "" if name == "plain" else "." + name
+        out = tmp_path / f"out_{name}.jsonl{suffix}"
+        for _ in range(2):
+            t0 = time.perf_counter()
+            assert cli.run_batch_file(str(path), out_path=str(out), out_format="jsonl", stream=True) == rows
+            timings[name] = min(timings.get(name, float("inf")), time.perf_counter() - t0)
+        outputs[name] = codecs[name][0](out.read_bytes())
+    for name, dur in timings.items():
+        print(f"\n{name:>5}: {dur:.2f}s, {rows / dur:,.0f} rows/s ({dur / timings['plain']:.2f}x plain)", end="")
+    assert len(set(outputs.values())) == 1
+    # streaming through a codec keeps at least 0.8x the speed of the plain run
+    # plus the codec's own one-shot work on the same input and output
+    for name in ("gz", "bz2", "xz"):
+        decompress, compress = codecs[name]
+        t0 = time.perf_counter()
+        decompress(inputs[name][1])
+        compress(outputs["plain"])
+        codec = time.perf_counter() - t0
+        assert timings[name] < (timings["plain"] + codec) / 0.8, name  # adjust if needed for slow machines
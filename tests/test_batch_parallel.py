@@ -0,0 +1,28 @@
+# tests/test_batch_parallel.py
+import pytest
+
+from osdag_validator_cli import cli
+
+ROWS = "fu,410\nfy,1000\ntf,12.5\nbolt,M20,8.8\nplate,10,x\nnope,1\nfu,abc\n"
+
+def test_parallel_results_in_input_order(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text(ROWS * 20)
+    serial = list(cli.iter_batch_file(str(f)))
+    parallel = list(cli.iter_batch_file(str(f), workers=3, chunk_size=7))
+    assert parallel == serial
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "text"])
+def test_parallel_output_byte_identical(tmp_path, fmt):
+    f = tmp_path / "in.csv"
+    f.write_text(ROWS * 5)
+    a, b = tmp_path / "serial.out", tmp_path / "parallel.out"
+    cli.run_batch_file(str(f), out_path=str(a), out_format=fmt, stream=True)
+    cli.run_batch_file(str(f), out_path=str(b), out_format=fmt, stream=True, workers=2)
+    assert a.read_bytes() == b.read_bytes()
+
+def test_cli_workers_flag(tmp_path, capsys):
+    f = tmp_path / "in.csv"
+    f.write_text(ROWS)
+    assert cli.main(["batch", str(f), "--format", "csv", "--workers", "2"]) == 0
+    assert capsys.readouterr().out.splitlines()[0] == "fu,410,True"
@@ -0,0 +1,28 @@
+# tests/test_batch_parallel_performance.py
+import os
+import time
+
+import pytest
+
+from osdag_validator_cli import cli
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+ROWS = "fu,410\nfy,250\ntf,12.5\nbolt,M20,8.8\nplate,10,250\nfu,abc\n"
+
+def test_batch_workers_scaling(tmp_path):
+    f = tmp_path / "big.csv"
+    f.write_text(ROWS * 100_000)  # 600k rows
+    timings = {}
+    outputs = {}
+    for workers in (1, 2, 4, 8):
+        out = tmp_path / f"out_{workers}.csv"
+        t0 = time.perf_counter()
+        cli.run_batch_file(str(f), out_path=str(out), out_format="csv", stream=True, workers=workers)
+        timings[workers] = time.perf_counter() - t0
+        outputs[workers] = out.read_bytes()
+    for workers, dur in timings.items():
+        print(f"\nworkers={workers}: {dur:.2f}s ({timings[1] / dur:.2f}x)", end="")
+    assert len(set(outputs.values())) == 1
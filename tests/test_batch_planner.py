@@ -0,0 +1,44 @@
+# tests/test_batch_planner.py
+import json
+import random
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.columnar import parse_block, parse_columns
+
+CELLS = ["410", "250", "12.5", " 7 ", "1e2", "abc", "", "nan", "1" * 400, "M20", "8.8", "m24"]
+
+def _mixed_items(n, seed):
+    rng = random.Random(seed)
+    cmds = ["fu", " fy", "tf", "plate", "bolt", "nope", "", None]
+    items = []
+    for _ in range(n):
+        args = [rng.choice(CELLS + [410, None, [1]]) for _ in range(rng.randint(0, 3))]
+        items.append({"command": rng.choice(cmds), "args": args})
+    return items
+
+def test_grouped_matches_per_row_in_input_order():
+    rows = [(it["command"], it["args"]) for it in _mixed_items(3000, 11)]
+    dispatch = cli.get_dispatch()
+    ref = [cli._run_command_by_name(cmd, args, dispatch) for cmd, args in rows]
+    assert cli._run_grouped(rows, dispatch) == ref
+
+def test_grouped_without_vector_checks(monkeypatch):
+    rows = [(it["command"], it["args"]) for it in _mixed_items(500, 12)]
+    dispatch = cli.get_dispatch()
+    ref = [cli._run_command_by_name(cmd, args, dispatch) for cmd, args in rows]
+    monkeypatch.setattr(cli, "_VECTOR_DISPATCH", {})
+    assert cli._run_grouped(rows, dispatch) == ref
+
+def test_parse_columns_matches_parse_block():
+    rows = [("plate", [a, b]) for a in CELLS for b in CELLS] + [("plate", []), ("plate", ["10"])]
+    a = parse_block(rows, {"plate": 2})
+    b = parse_columns(rows, 2)
+    assert a.state == b.state
+    assert [bytes(v) for v in a.values] == [bytes(v) for v in b.values]
+
+def test_preparse_batch_file_keeps_order(tmp_path):
+    f = tmp_path / "in.json"
+    f.write_text(json.dumps(_mixed_items(2500, 13)))
+    ref = cli.run_batch_file(str(f))
+    assert cli.run_batch_file(str(f), preparse=True) == ref
+    assert list(cli.iter_batch_file(str(f), workers=2, chunk_size=300, preparse=True)) == ref
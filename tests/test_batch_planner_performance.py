@@ -0,0 +1,45 @@
+# tests/test_batch_planner_performance.py
+import os
+import random
+import time
+
+import pytest
+
+from osdag_validator_cli import cli
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+N = 200_000
+
+def test_grouped_vs_interleaved_on_shuffled_mixed_file(tmp_path):
+    rng = random.Random(5)
+    kinds = ["fu,410", "fy,250", "tf,12.5", "plate,10,250.5", "bolt,M20,8.8", "bolt,m24,4.6",
+             "fu,abc", "plate,ten,250", "tf,200"]
+    f = tmp_path / "in.csv"
+    f.write_text("\n".join(rng.choice(kinds) for _ in range(N)) + "\n")
+    rows = list(cli._iter_batch_rows(str(f)))
+    dispatch = cli.get_dispatch()
+    size = cli.BATCH_CHUNK_SIZE
+
+    def per_row(block):
+        return [cli._run_command_by_name(cmd, args, dispatch) for cmd, args in block]
+
+    def masked(block):
+        return list(cli._run_block(block, dispatch))
+
+    def grouped(block):
+        return cli._run_grouped(block, dispatch)
+
+    timings = {}
+    for name, run in (("per-row", per_row), ("masked block", masked), ("grouped", grouped)):
+        best = float("inf")
+        for _ in range(3):
+            t0 = time.perf_counter()
+            for i in range(0, N, size):
+                run(rows[i:i + size])
+            best = min(best, time.perf_counter() - t0)
+        timings[name] = best
+    assert grouped(rows[:size]) == per_row(rows[:size])
+    print("\n" + ", ".join(f"{k} {v:.2f}s ({timings['per-row'] / v:.2f}x)" for k, v in timings.items()))
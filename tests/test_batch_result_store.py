@@ -0,0 +1,153 @@
+# tests/test_batch_result_store.py
+import os
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.diskcache import ResultStore, iter_chunks, row_bytes
+
+REAL_RUN = cli._run_command_by_name
+
+def _rows(n, start=0):
+    return "".join(f"fu,{300 + (i * 7) % 500}\nbolt,M{16 + i % 20},8.8\n" for i in range(start, start + n))
+
+def _count_calls(monkeypatch):
+    calls = {"n": 0}
+    def run(*a, **kw):
+        calls["n"] += 1
+        return REAL_RUN(*a, **kw)
+    monkeypatch.setattr(cli, "_run_command_by_name", run)
+    return calls
+
+def test_chunks_are_content_defined():
+    rows = [("fu", [str(i)]) for i in range(20_000)]
+    edited = rows[:5000] + [("fy", ["1"])] + rows[5000:]
+    a = list(iter_chunks(((r, row_bytes(r)) for r in rows), "v1"))
+    b = list(iter_chunks(((r, row_bytes(r)) for r in edited), "v1"))
+    assert sum(len(c) for c, _ in a) == 20_000
+    assert all(256 <= len(c) <= 8192 for c, _ in a[:-1])
+    # one inserted row changes only the chunk it lands in
+    assert len({k for _, k in a} - {k for _, k in b}) == 1
+    assert {k for _, k in iter_chunks(((r, row_bytes(r)) for r in rows), "v2")}.isdisjoint(k for _, k in a)
+
+def test_version_covers_result_format_and_cli_code(monkeypatch):
+    import inspect
+    base = cli.result_cache_version()
+    monkeypatch.setattr(cli, "_RESULT_CACHE_VERSION", None)
+    monkeypatch.setattr(cli, "RESULT_FORMAT", cli.RESULT_FORMAT + 1)
+    bumped = cli.result_cache_version()
+    assert bumped != base
+    real = inspect.getsource
+
+    def edited(obj):
+        # as if as_number_if_possible / the argument parsers had changed
+        return real(obj) + "\n# edited" if obj is cli else real(obj)
+    monkeypatch.setattr(inspect, "getsource", edited)
+    monkeypatch.setattr(cli, "_RESULT_CACHE_VERSION", None)
+    assert cli.result_cache_version() not in (base, bumped)
+
+def test_unchanged_file_is_replayed(tmp_path, monkeypatch):
+    f = tmp_path / "in.csv"
+    f.write_text(_rows(5000))
+    store = ResultStore(str(tmp_path / "cache"))
+    first = cli.run_batch_file(str(f), result_store=store)
+    assert first == cli.run_batch_file(str(f))
+    misses = store.misses
+    calls = _count_calls(monkeypatch)
+    assert cli.run_batch_file(str(f), result_store=store) == first
+    assert calls["n"] == 0
+    assert store.misses == misses and store.hits > 0
+
+def test_only_changed_chunks_are_revalidated(tmp_path, monkeypatch):
+    f = tmp_path / "in.csv"
+    text = _rows(10_000)
+    f.write_text(text)
+    store = ResultStore(str(tmp_path / "cache"))
+    cli.run_batch_file(str(f), result_store=store)
+    lines = text.splitlines(keepends=True)
+    lines[7000] = "fu,abc\n"
+    f.write_text("".join(lines))
+    calls = _count_calls(monkeypatch)
+    assert cli.run_batch_file(str(f), result_store=store) == cli.run_batch_file(str(f))
+    assert 0 < calls["n"] - 20_000 <= 8192
+
+@pytest.mark.parametrize("workers,preparse", [(2, False), (1, True)])
+def test_modes_share_the_store(tmp_path, workers, preparse):
+    f = tmp_path / "in.csv"
+    f.write_text(_rows(3000) + "fu,\nplate,10,x\nnope,1\n")
+    store = ResultStore(str(tmp_path / "cache"))
+    ref = cli.run_batch_file(str(f))
+    assert cli.run_batch_file(str(f), workers=workers, preparse=preparse, result_store=store) == ref
+    misses = store.misses
+    assert cli.run_batch_file(str(f), result_store=store) == ref
+    assert store.misses == misses
+
+def test_lru_eviction_by_size(tmp_path):
+    store = ResultStore(str(tmp_path / "cache"), max_bytes=500)
+    for i in range(10):
+        store.put(f"{i:040x}", [True] * 100)
+        os.utime(store._path(f"{i:040x}"), ns=(i * 10**9, i * 10**9))
+    assert store.bytes_used <= 500
+    assert store.evictions > 0
+    assert store.get(f"{9:040x}") == [True] * 100
+    assert store.get(f"{0:040x}") is None
+    # the running total matches what is on disk after reopening
+    assert ResultStore(str(tmp_path / "cache"), max_bytes=500).bytes_used == store.bytes_used
+
+def test_overwriting_a_block_does_not_grow_bytes_used(tmp_path):
+    store = ResultStore(str(tmp_path / "cache"))
+    for _ in range(5):
+        assert store.put("ab" * 20, [True] * 100)
+    assert store.put("cd" * 20, [False] * 10)
+    assert store.bytes_used == ResultStore(str(tmp_path / "cache")).bytes_used
+    assert store.evictions == 0
+
+def test_unwritable_store_falls_back_to_validating(tmp_path, monkeypatch):
+    f = tmp_path / "in.csv"
+    f.write_text(_rows(500))
+    store = ResultStore(str(tmp_path / "cache"))
+    real_open = open
+
+    def full_disk(path, *a, **kw):
+        if str(path).endswith(".tmp"):
+            raise OSError(28, "No space left on device")
+        return real_open(path, *a, **kw)
+    monkeypatch.setattr("builtins.open", full_disk)
+    assert not store.put("ab" * 20, [True])
+    assert cli.run_batch_file(str(f), result_store=store) == cli.run_batch_file(str(f))
+    assert store.bytes_used == 0 and not list((tmp_path / "cache").rglob("*.tmp"))
+
+@pytest.mark.parametrize("text", ["fu,410\rfy,250\rbolt,M20,8.8\r",
+                                  'fu,"4\r\n10"\r\nbolt,"M20\r\n",8.8\r\nfy,250\r\n'])
+def test_cli_cache_reads_cr_and_crlf_like_a_plain_run(tmp_path, capsys, text):
+    f = tmp_path / "in.csv"
+    f.write_bytes(text.encode())
+    assert cli.main(["batch", str(f), "--format", "csv", "--no-cache"]) == 0
+    plain = capsys.readouterr().out
+    for _ in range(2):  # a fresh store, then a replay
+        assert cli.main(["batch", str(f), "--format", "csv", "--cache-dir", str(tmp_path / "c")]) == 0
+        assert capsys.readouterr().out == plain
+    args = [r["args"] for r in cli.iter_batch_file(str(f), result_store=ResultStore(str(tmp_path / "c")))]
+    assert args == [r["args"] for r in cli.iter_batch_file(str(f))]
+    assert len(args) == 3 and not any("\r" in a for row in args for a in row)
+
+def test_corrupt_block_is_a_miss(tmp_path):
+    store = ResultStore(str(tmp_path / "cache"))
+    store.put("ab" * 20, [True, {"error": "x"}])
+    assert store.get("ab" * 20) == [True, {"error": "x"}]
+    with open(store._path("ab" * 20), "wb") as fh:
+        fh.write(b"\x00garbage")
+    assert store.get("ab" * 20) is None
+
+def test_cli_uses_cache_and_no_cache(tmp_path, monkeypatch, capsys):
+    f = tmp_path / "in.csv"
+    f.write_text(_rows(500))
+    cache_dir = tmp_path / "c"
+    assert cli.main(["batch", str(f), "--format", "csv", "--cache-dir", str(cache_dir)]) == 0
+    first = capsys.readouterr().out
+    assert any(cache_dir.rglob("*"))
+    calls = _count_calls(monkeypatch)
+    assert cli.main(["batch", str(f), "--format", "csv", "--cache-dir", str(cache_dir)]) == 0
+    assert calls["n"] == 0 and capsys.readouterr().out == first
+    assert cli.main(["batch", str(f), "--format", "csv", "--no-cache"]) == 0
+    assert calls["n"] == 1000 and capsys.readouterr().out == first
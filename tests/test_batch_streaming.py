@@ -0,0 +1,55 @@
+# tests/test_batch_streaming.py
+import tracemalloc
+
+import pytest
+
+from osdag_validator_cli import cli
+
+ROWS = "fu,410\nfy,250\ntf,12.5\nbolt,M20,8.8\nplate,10,250\nfu,abc\n"
+
+def _write_batch(path, repeat):
+    path.write_text(ROWS * repeat)
+    return path
+
+def test_iter_batch_file_is_lazy(tmp_path):
+    f = _write_batch(tmp_path / "b.csv", 2)
+    it = cli.iter_batch_file(str(f))
+    assert next(it) == {"command": "fu", "args": ["410"], "result": True}
+    assert len(list(it)) == 11
+
+def test_iter_batch_file_missing_raises_immediately(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        cli.iter_batch_file(str(tmp_path / "missing.csv"))
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "text"])
+def test_stream_output_matches_list_output(tmp_path, fmt):
+    f = _write_batch(tmp_path / "in.csv", 3)
+    a, b = tmp_path / f"a.{fmt}", tmp_path / f"b.{fmt}"
+    results = cli.run_batch_file(str(f), out_path=str(a), out_format=fmt)
+    n = cli.run_batch_file(str(f), out_path=str(b), out_format=fmt, stream=True)
+    assert n == len(results) == 18
+    assert a.read_bytes() == b.read_bytes()
+
+@pytest.mark.parametrize("fmt", ["json", "csv", "text"])
+def test_stream_empty_file(tmp_path, fmt):
+    f = tmp_path / "empty.csv"
+    f.write_text("")
+    a, b = tmp_path / "a.out", tmp_path / "b.out"
+    cli.run_batch_file(str(f), out_path=str(a), out_format=fmt)
+    assert cli.run_batch_file(str(f), out_path=str(b), out_format=fmt, stream=True) == 0
+    assert a.read_bytes() == b.read_bytes()
+
+def _peak_stream_bytes(src, out):
+    cli.get_dispatch()  # build the registry outside the measurement
+    tracemalloc.start()
+    try:
+        cli.run_batch_file(str(src), out_path=str(out), out_format="json", stream=True)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def test_stream_peak_memory_independent_of_input_size(tmp_path):
+    small = _peak_stream_bytes(_write_batch(tmp_path / "small.csv", 250), tmp_path / "small.json")
+    large = _peak_stream_bytes(_write_batch(tmp_path / "large.csv", 5_000), tmp_path / "large.json")
+    # 20x the rows must not mean more memory: only the current row is alive
+    assert large < small * 1.5 + 64 * 1024, (small, large)
@@ -0,0 +1,69 @@
+# tests/test_batch_writers.py
+import io
+import json
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.writers import get_writer
+
+RESULTS = [
+    {"command": "fu", "args": ["410"], "result": True},
+    {"command": "bolt", "args": ["M99", "8.8"], "result": False},
+    {"command": "nope", "args": [], "result": {"error": "Unknown command 'nope'"}},
+]
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+    def flush(self):
+        self.flushes += 1
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl", "csv", "text"])
+@pytest.mark.parametrize("flush_bytes", [0, 10, 1 << 16])
+def test_output_independent_of_flush_threshold(fmt, flush_bytes):
+    ref = io.StringIO()
+    get_writer(fmt, ref).write_all(RESULTS * 10)
+    out = io.StringIO()
+    assert get_writer(fmt, out, flush_bytes).write_all(RESULTS * 10) == 30
+    assert out.getvalue() == ref.getvalue()
+
+def test_jsonl_is_one_object_per_line():
+    out = io.StringIO()
+    get_writer("jsonl", out).write_all(RESULTS)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == RESULTS
+
+def test_buffer_flushes_at_threshold():
+    stream = CountingStream()
+    w = get_writer("jsonl", stream, flush_bytes=200)
+    for r in RESULTS * 20:
+        w.write(r)
+    mid = stream.writes
+    assert 0 < mid < 60        # several rows per write, but data already went out
+    assert stream.flushes == mid   # every buffered write is followed by a flush
+    w.close()
+    assert stream.getvalue().count("\n") == 60
+
+def test_zero_threshold_writes_every_row():
+    stream = CountingStream()
+    get_writer("csv", stream, flush_bytes=0).write_all(RESULTS)
+    assert stream.writes == 3
+
+def test_cli_jsonl_stdout(tmp_path, capsys):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nbolt,M99,8.8\n")
+    assert cli.main(["batch", str(f), "--format", "jsonl", "--flush-bytes", "0"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(l)["result"] for l in lines] == [True, False]
+
+def test_cli_out_file_and_stdout_echo(tmp_path, capsys):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\n")
+    out = tmp_path / "out.jsonl"
+    assert cli.main(["batch", str(f), "--format", "jsonl", "--out", str(out)]) == 0
+    assert out.read_text() == capsys.readouterr().out
@@ -0,0 +1,30 @@
+# tests/test_cli_dispatch.py
+from osdag_validator_cli import cli
+
+def test_dispatch_has_all_commands():
+    table = cli.get_dispatch()
+    assert set(table) == set(cli.COMMAND_SPECS)
+    func, parser = table["plate"]
+    assert func(*parser(["10", "250"])) is True
+
+def test_validator_built_once_for_batch(tmp_path, monkeypatch):
+    calls = []
+    real = cli.get_validator
+    def counting():
+        calls.append(1)
+        return real()
+    monkeypatch.setattr(cli, "get_validator", counting)
+    cli.get_dispatch(refresh=True)
+    f = tmp_path / "batch.csv"
+    f.write_text("fu,410\nfy,250\nbolt,M20,8.8\nplate,10,250\n" * 50)
+    results = cli.run_batch_file(str(f))
+    assert len(results) == 200
+    assert all(r["result"] is True for r in results)
+    assert len(calls) == 1
+
+def test_run_command_unknown_and_errors():
+    assert cli.run_command("nope", ["1"])["result"] == {"error": "Unknown command 'nope'"}
+    assert cli.run_command(" fu ", ["410"]) == {"command": "fu", "args": ["410"], "result": True}
+    assert cli.run_command("fu", [])["result"] is False
+    # non-string bolt args raise inside the validator and are reported, not raised
+    assert "error" in cli.run_command("bolt", [20, "8.8"])["result"]
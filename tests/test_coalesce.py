@@ -0,0 +1,63 @@
+# tests/test_coalesce.py
+import asyncio
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.coalesce import Coalescer
+
+def _run(coro):
+    return asyncio.run(coro)
+
+def test_concurrent_calls_share_one_batch_per_command():
+    calls = []
+
+    def run_rows(rows):
+        calls.append(rows)
+        return cli.run_rows(rows)
+
+    c = Coalescer(run_rows, max_items=100, max_wait=0.01)
+
+    async def main():
+        jobs = [c.submit("fu", [str(v)]) for v in (410, 100, 500)] + [c.submit("bolt", ["m20", "8.8"])]
+        return await asyncio.gather(*jobs)
+
+    assert _run(main()) == [True, False, True, True]
+    assert sorted(len(rows) for rows in calls) == [1, 3]
+    assert c.stats()["batches"] == 2 and c.stats()["rows"] == 4
+
+def test_full_group_flushes_without_waiting():
+    c = Coalescer(cli.run_rows, max_items=2, max_wait=60)
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(c.submit("fu", ["410"]), c.submit("fu", ["1"])), 5)
+
+    assert _run(main()) == [True, False]
+
+def test_errors_reach_every_caller():
+    def run_rows(rows):
+        raise RuntimeError("boom")
+
+    c = Coalescer(run_rows, max_items=8, max_wait=0)
+
+    async def main():
+        return await asyncio.gather(c.submit("fu", ["1"]), c.submit("fu", ["2"]), return_exceptions=True)
+
+    assert [str(e) for e in _run(main())] == ["boom", "boom"]
+
+def test_cancelled_caller_does_not_break_the_group():
+    c = Coalescer(cli.run_rows, max_items=8, max_wait=0.01)
+
+    async def main():
+        first = asyncio.ensure_future(c.submit("fu", ["410"]))
+        second = asyncio.ensure_future(c.submit("fu", ["1"]))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert _run(main()) is False
+
+@pytest.mark.parametrize("max_items,max_wait", [(0, 0.001), (2, -1)])
+def test_rejects_bad_settings(max_items, max_wait):
+    with pytest.raises(ValueError):
+        Coalescer(cli.run_rows, max_items, max_wait)
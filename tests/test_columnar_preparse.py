@@ -0,0 +1,117 @@
+# tests/test_columnar_preparse.py
+import json
+import random
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.columnar import parse_block, parse_number, VALID, INVALID, RAW
+
+CELLS = ["410", "250", "12.5", "-3", "+7", "1_000", "1e2", ".5", "nan", "inf", "٤١٠",
+         "abc", "", "0x10", "4__10", "1" * 400, "10", "2000", "2000.1"]
+
+@pytest.mark.parametrize("cell,state", [
+    ("410", VALID), (" 12.5 ", VALID), ("1e2", VALID), ("", INVALID), ("abc", INVALID),
+    ("1" * 400, RAW), (410, RAW), (None, RAW),
+])
+def test_parse_number_states(cell, state):
+    assert parse_number(cell)[0] == state
+
+def test_parse_number_values_match_as_number_if_possible():
+    for cell in CELLS[:-4]:
+        st, val = parse_number(cell)
+        ref = cli.as_number_if_possible(cell)
+        if st == VALID:
+            assert val == ref or (val != val and ref != ref)
+        elif st == INVALID:
+            assert isinstance(ref, str)
+
+def test_parse_block_columns_and_masks():
+    block = parse_block([("fu", ["410"]), ("plate", ["10", "x"]), ("bolt", ["M20", "8.8"]), ("fy", [])],
+                        cli.NUMERIC_ARITY)
+    assert block.commands == ["fu", "plate", "bolt", "fy"]
+    assert list(block.state[0]) == [VALID, VALID, INVALID, INVALID]
+    assert list(block.state[1]) == [INVALID, INVALID, INVALID, INVALID]
+    assert block.values[0][0] == 410.0 and block.values[0][1] == 10.0
+
+def test_preparse_batch_matches_reference(tmp_path):
+    rng = random.Random(7)
+    cmds = ["fu", "fy", "tf", "plate", "bolt", "nope", ""]
+    lines = []
+    for _ in range(2000):
+        cmd = rng.choice(cmds)
+        n = rng.randint(0, 3)
+        lines.append(",".join([cmd] + [rng.choice(CELLS + ["M20", "8.8"]) for _ in range(n)]))
+    f = tmp_path / "in.csv"
+    f.write_text("\n".join(lines) + "\n")
+    assert cli.run_batch_file(str(f), preparse=True) == cli.run_batch_file(str(f))
+
+def test_preparse_json_raw_cells_fall_back(tmp_path):
+    items = [{"command": "fu", "args": [410]}, {"command": "plate", "args": ["10", [250]]},
+             {"command": "tf", "args": None}, {"command": "fy", "args": ["10" * 200]}]
+    f = tmp_path / "in.json"
+    f.write_text(json.dumps(items))
+    assert cli.run_batch_file(str(f), preparse=True) == cli.run_batch_file(str(f))
+
+def test_preparse_parallel_and_cached(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nfu,abc\nplate,10,250\nbolt,M20,8.8\n" * 30)
+    ref = cli.run_batch_file(str(f))
+    assert list(cli.iter_batch_file(str(f), workers=2, chunk_size=9, preparse=True)) == ref
+    cache = cli.LRUCache(8)
+    assert cli.run_batch_file(str(f), preparse=True, cache=cache) == ref
+    # numeric rows are checked column-wise; only bolt goes through the cache
+    assert (cache.misses, cache.hits) == (1, 29)
+
+def test_parse_block_strips_commands():
+    rows = [("bolt", ["M20", "8.8"]), (" bolt ", ["M20", "10.9"]), (None, []), ("fu", ["410"])]
+    block = parse_block(rows, cli.NUMERIC_ARITY)
+    assert block.commands == ["bolt", "bolt", "", "fu"]
+    assert block.state[0][3] == VALID and block.values[0][3] == 410.0
+
+def test_preparse_bolt_rows_match_reference(tmp_path):
+    rng = random.Random(3)
+    sizes = ["M20", " m20 ", "M16", "m99", "", "M 20"]
+    grades = ["8.8", " 8.8", "10.9", "9.9", ""]
+    items = [{"command": "bolt", "args": [rng.choice(sizes), rng.choice(grades)][:rng.randint(0, 2)]}
+             for _ in range(500)]
+    items += [{"command": "bolt", "args": [20, "8.8"]}, {"command": "bolt", "args": [None, "8.8"]},
+              {"command": "bolt", "args": [["M20"], "8.8"]}]
+    rng.shuffle(items)
+    f = tmp_path / "in.json"
+    f.write_text(json.dumps(items))
+    assert cli.run_batch_file(str(f), preparse=True) == cli.run_batch_file(str(f))
+
+def test_bolt_validity_table_is_reused_across_blocks(monkeypatch):
+    dispatch = cli.get_dispatch(refresh=True)
+    func, parser = dispatch["bolt"]
+    calls = []
+
+    def check(size, grade):
+        calls.append((size, grade))
+        return func(size, grade)
+    dispatch = dict(dispatch, bolt=(check, parser))
+    rows = [("bolt", [s, g]) for s in ("M20", " m20 ", "M99") for g in ("8.8", "9.9")] * 50
+    rows += [("bolt", [20, "8.8"]), ("bolt", [["M20"], "8.8"])]
+    ref = [cli._run_command_by_name(cmd, args, dispatch) for cmd, args in rows]
+    calls.clear()
+    for block in cli._chunked(rows, 64):
+        assert cli._run_grouped(block, dispatch) == ref[:len(block)]
+        ref = ref[len(block):]
+    # six distinct string pairs, checked once each; the two error rows every time
+    assert len(calls) == 6 + 2
+    monkeypatch.setattr(cli, "VALIDITY_TABLE_SIZE", 0)
+    cli._VALIDITY_TABLES.clear()
+    cli._run_grouped(rows[:10], dispatch)
+    assert len(calls) == 8 + 10
+    cli.get_dispatch(refresh=True)
+    assert not cli._VALIDITY_TABLES
+
+def test_preparse_unhashable_bolt_cell_is_a_row_error(tmp_path, capsys):
+    f = tmp_path / "bad.json"
+    f.write_text(json.dumps([{"command": "bolt", "args": [["M20"], "8.8"]}, {"command": "fu", "args": ["410"]}]))
+    results = cli.run_batch_file(str(f), preparse=True)
+    assert results == cli.run_batch_file(str(f))
+    assert "error" in results[0]["result"] and results[1]["result"] is True
+    assert cli.main(["batch", str(f), "--preparse"]) == 0
+    assert "Batch error" not in capsys.readouterr().err
@@ -0,0 +1,55 @@
+# tests/test_columnar_preparse_performance.py
+import os
+import random
+import time
+
+import pytest
+
+from osdag_validator_cli import cli
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+N = 200_000
+
+@pytest.mark.parametrize("malformed", [0.0, 0.5, 1.0])
+def test_preparse_vs_per_row(tmp_path, malformed):
+    rng = random.Random(1)
+    good = ["fu,410", "fy,250", "tf,12.5", "plate,10,250.5"]
+    bad = ["fu,abc", "fy,2 5 0", "tf,12,5x", "plate,ten,250"]
+    rows = [rng.choice(bad if rng.random() < malformed else good) for _ in range(N)]
+    f = tmp_path / "in.csv"
+    f.write_text("\n".join(rows) + "\n")
+
+    timings = {}
+    for _ in range(3):
+        for preparse in (False, True):
+            t0 = time.perf_counter()
+            n = sum(1 for _ in cli.iter_batch_file(str(f), preparse=preparse))
+            timings[preparse] = min(timings.get(preparse, float("inf")), time.perf_counter() - t0)
+            assert n == N
+    print(f"\n{malformed:.0%} malformed: per-row {timings[False]:.2f}s, "
+          f"preparse {timings[True]:.2f}s ({timings[False] / timings[True]:.2f}x)")
+    # at least 0.8x the per-row speed, whatever the share of malformed rows
+    assert timings[True] < timings[False] / 0.8  # adjust if needed for slow machines
+
+def test_bolt_preparse_vs_per_row(tmp_path):
+    rng = random.Random(2)
+    sizes = ["M16", "M20", "m24", " M30", "M99"]
+    grades = ["4.6", "8.8", "10.9 ", "9.9"]
+    rows = [f"bolt,{rng.choice(sizes)},{rng.choice(grades)}" for _ in range(N)]
+    f = tmp_path / "in.csv"
+    f.write_text("\n".join(rows) + "\n")
+    # reading the file costs the same either way; time the checks on the parsed rows
+    rows = list(cli._iter_batch_rows(str(f)))
+
+    timings = {}
+    for _ in range(3):
+        for preparse in (False, True):
+            t0 = time.perf_counter()
+            assert len(cli.run_rows(rows, preparse=preparse)) == N
+            timings[preparse] = min(timings.get(preparse, float("inf")), time.perf_counter() - t0)
+    print(f"\nbolt rows: per-row {timings[False]:.2f}s, "
+          f"validity table {timings[True]:.2f}s ({timings[False] / timings[True]:.2f}x)")
+    assert timings[True] < timings[False]  # each distinct (size, grade) pair is checked once
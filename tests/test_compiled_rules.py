@@ -0,0 +1,67 @@
+# tests/test_compiled_rules.py
+import pytest
+
+from osdag_validator import Validator, COMPILED, RULES
+from osdag_validator.rules import compile_rules
+
+NUMERIC_SAMPLES = [
+    410, 300, 700, 299, 701, 150, 500, 0, -1, 1, 100, 50, 2000, 2001, 10**30, True, False,
+    410.0, 299.9, 300.0, 700.9, 701.0, -0.5, -1.5, 0.99, 100.0001, 1999.9,
+    float("nan"), float("inf"), float("-inf"),
+    "410", " 410 ", "+410", "-410", "4_10", "4__10", "_410", "410.0", "1e2", "1E2", ".5", "5.",
+    "1_0.5", "abc", "", "  ", "nan", "NaN", "inf", "-Infinity", "0x10", "٤١٠",
+    "0" * 5000 + "410", None, [1], b"410", 3 + 4j,
+]
+
+@pytest.mark.parametrize("name", ["fu", "fy", "tf"])
+def test_compiled_single_value_parity(name):
+    ref = getattr(Validator(), f"validate_{name}")
+    check = COMPILED[name]
+    for x in NUMERIC_SAMPLES:
+        assert check(x) is ref(x), (name, x)
+
+def test_compiled_plate_parity():
+    v = Validator()
+    for t in NUMERIC_SAMPLES[::3]:
+        for w in NUMERIC_SAMPLES[::4]:
+            assert COMPILED["plate"](t, w) is v.validate_plate(t, w), (t, w)
+
+def test_compiled_bolt_parity():
+    v = Validator()
+    sizes = ["M20", " m20 ", "M99", "", None, "m16", "M30\n"]
+    grades = ["8.8", " 8.8", "4.6", "9.9", "", None, "10.9"]
+    for s in sizes:
+        for g in grades:
+            assert COMPILED["bolt"](s, g) is v.validate_bolt(s, g), (s, g)
+    with pytest.raises(AttributeError):
+        v.validate_bolt(20, "8.8")
+    with pytest.raises(AttributeError):
+        COMPILED["bolt"](20, "8.8")
+
+def test_generated_source_has_no_exception_handling():
+    source, functions = compile_rules(RULES)
+    assert set(functions) == set(RULES)
+    assert "try:" not in source and "except" not in source
+
+def test_unknown_rule_kind_rejected():
+    with pytest.raises(ValueError):
+        compile_rules({"x": {"kind": "regex", "params": ("v",)}})
+
+def test_dispatch_runs_compiled_checks(monkeypatch):
+    from osdag_validator_cli import cli
+    table = cli.get_dispatch(refresh=True)
+    for name in RULES:
+        assert table[name][0] is COMPILED[name]
+
+    class Strict(Validator):
+        def validate_fu(self, value):
+            return False
+    monkeypatch.setattr(cli, "get_validator", Strict)
+    try:
+        table = cli.get_dispatch(refresh=True)
+        assert table["fy"][0] is COMPILED["fy"]
+        assert table["fu"][0] is not COMPILED["fu"]
+        assert cli.run_command("fu", ["410"])["result"] is False
+    finally:
+        monkeypatch.undo()
+        cli.get_dispatch(refresh=True)
@@ -0,0 +1,34 @@
+# tests/test_compiled_rules_performance.py
+import os
+import time
+
+import pytest
+
+from osdag_validator import Validator, COMPILED
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+N = 200_000
+
+def _bench(fn, args):
+    t0 = time.perf_counter()
+    for a in args:
+        fn(*a)
+    return time.perf_counter() - t0
+
+@pytest.mark.parametrize("name,args", [
+    ("fu", [("410",), (410,), ("abc",), (410.5,)]),
+    ("tf", [("12.5",), (12.5,), ("x",)]),
+    ("plate", [("10", "250"), (10, 250), ("x", "250")]),
+    ("bolt", [("M20", "8.8"), (" m24 ", "10.9"), ("M99", "8.8")]),
+])
+def test_compiled_rules_vs_methods(name, args):
+    v = Validator()
+    method = getattr(v, f"validate_{name}")
+    rows = (args * (N // len(args) + 1))[:N]
+    ref = _bench(method, rows)
+    fast = _bench(COMPILED[name], rows)
+    print(f"\n{name}: methods {ref:.3f}s, compiled {fast:.3f}s ({ref / fast:.2f}x) for {N} calls")
+    assert fast < ref * 1.5
@@ -0,0 +1,141 @@
+# tests/test_jobs.py
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from osdag_validator_cli import cli, jobs
+from osdag_validator_cli.jobs import JobQueue, JobQueueFull
+from osdag_validator_cli.metrics import Metrics
+
+ROWS = "fu,410\nfy,abc\nbolt,m20,8.8\nplate,10,5000\n"
+
+def _wait(job, timeout=10):
+    deadline = time.time() + timeout
+    while job.state not in jobs.FINISHED:
+        assert time.time() < deadline, job.status()
+        time.sleep(0.005)
+    return job
+
+@pytest.fixture
+def queue(tmp_path):
+    q = JobQueue(max_workers=1, max_jobs=2, directory=str(tmp_path / "out"))
+    yield q
+    q.shutdown()
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl", "csv", "text"])
+def test_job_output_matches_run_batch_file(queue, tmp_path, fmt):
+    src = tmp_path / "in.csv"
+    src.write_text(ROWS * 50)
+    job = _wait(queue.submit(str(src), fmt))
+    expected = tmp_path / ("expected." + fmt)
+    cli.run_batch_file(str(src), str(expected), fmt)
+    assert job.state == jobs.DONE
+    with open(job.out_path, "rb") as f:
+        assert f.read() == expected.read_bytes()
+    s = job.status()
+    assert (s["rows_done"], s["progress"], s["eta_seconds"]) == (200, 1.0, 0.0)
+    assert s["rows_per_sec"] > 0
+
+@pytest.mark.parametrize("text", ["fu,410\rfy,abc\rbolt,M20,8.8\r",
+                                  'fu,"4\r\n10"\r\nbolt,"M20\r\n",8.8\r\nfy,250\r\n',
+                                  "fu,410\r\n\rplate,10,250\nfy,250"])
+@pytest.mark.parametrize("name", ["in.csv", "in.csv.gz"])
+def test_job_output_matches_cli_batch(queue, tmp_path, capsys, text, name):
+    import gzip
+    src = tmp_path / name
+    data = text.encode()
+    src.write_bytes(gzip.compress(data) if name.endswith(".gz") else data)
+    job = _wait(queue.submit(str(src), "jsonl"))
+    assert job.state == jobs.DONE, job.status()
+    expected = tmp_path / "expected.jsonl"
+    assert cli.main(["batch", str(src), "--format", "jsonl", "--out", str(expected), "--stream",
+                     "--cache-dir", str(tmp_path / "cache")]) == 0
+    with open(job.out_path, "rb") as f:
+        assert f.read() == expected.read_bytes()
+    capsys.readouterr()
+
+def test_progress_of_json_array_input_has_no_eta(queue, tmp_path):
+    src = tmp_path / "in.json"
+    src.write_text(json.dumps([{"command": "fu", "args": ["410"]}] * 10))
+    job = _wait(queue.submit(str(src)))
+    assert job.bytes_total is None and job.status()["rows_done"] == 10
+
+def test_bad_submissions(queue, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        queue.submit(str(tmp_path / "missing.csv"))
+    src = tmp_path / "in.csv"
+    src.write_text(ROWS)
+    with pytest.raises(ValueError):
+        queue.submit(str(src), "xml")
+
+def _blocking_queue(queue, monkeypatch):
+    """Make every job wait on the returned event before reading its input."""
+    gate = threading.Event()
+    real = jobs._iter_batch_rows_from
+
+    def rows(path):
+        gate.wait(10)
+        yield from real(path)
+
+    monkeypatch.setattr(jobs, "_iter_batch_rows_from", rows)
+    return gate
+
+def test_cap_on_active_jobs_and_cancellation(queue, tmp_path, monkeypatch):
+    gate = _blocking_queue(queue, monkeypatch)
+    src = tmp_path / "in.csv"
+    src.write_text(ROWS)
+    running = queue.submit(str(src))
+    queued = queue.submit(str(src))
+    with pytest.raises(JobQueueFull):
+        queue.submit(str(src))
+    assert queue.cancel(queued.id).state == jobs.CANCELLED   # never started
+    queue.cancel(running.id)
+    gate.set()
+    assert _wait(running).state == jobs.CANCELLED
+    assert not (tmp_path / "out" / (running.id + ".jsonl")).exists()
+    assert queue.active() == 0
+    _wait(queue.submit(str(src)))                            # room again
+
+def test_failed_job_reports_error(queue, tmp_path):
+    src = tmp_path / "in.jsonl"
+    src.write_text('{"command": "fu", "args": ["410"]}\nnot json\n')
+    job = _wait(queue.submit(str(src)))
+    assert job.state == jobs.FAILED and job.error
+    assert queue.remove(job.id) and queue.get(job.id) is None
+
+def test_finished_jobs_are_pruned(tmp_path):
+    q = JobQueue(max_workers=1, directory=str(tmp_path / "out"), keep_finished=2)
+    try:
+        src = tmp_path / "in.csv"
+        src.write_text(ROWS)
+        done = [_wait(q.submit(str(src))) for _ in range(3)]
+        assert [j.id for j in q.jobs()] == [j.id for j in done[1:]]
+        assert sorted(p.name for p in (tmp_path / "out").iterdir()) == sorted(j.id + ".jsonl" for j in done[1:])
+    finally:
+        q.shutdown()
+
+def test_shutdown_removes_owned_directory(tmp_path):
+    q = JobQueue()
+    directory = q.directory
+    q.shutdown()
+    assert not os.path.exists(directory)
+
+def test_job_records_metrics(tmp_path):
+    m = Metrics()
+    q = JobQueue(max_workers=1, directory=str(tmp_path / "out"), metrics=m)
+    try:
+        src = tmp_path / "in.csv"
+        src.write_text(ROWS * 50)
+        expected = tmp_path / "expected.jsonl"
+        cli.run_batch_file(str(src), str(expected), "jsonl")
+        job = _wait(q.submit(str(src)))
+        with open(job.out_path, "rb") as f:
+            assert f.read() == expected.read_bytes()
+    finally:
+        q.shutdown()
+    assert m.validations == {("fu", "valid"): 50, ("fy", "invalid"): 50, ("bolt", "valid"): 50,
+                             ("plate", "invalid"): 50}
+    assert m.batch_rows == 200 and m.phases["block", "serialize"].count >= 1
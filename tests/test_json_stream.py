@@ -0,0 +1,85 @@
+# tests/test_json_stream.py
+import io
+import json
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.jsonstream import iter_json_array, iter_json_lines
+
+DOC = [
+    {"command": "fu", "args": ["410"]},
+    {"command": "bolt", "args": ["M20", "8.8"], "note": "with \"quotes\", ] and [ and \\u00e9 é"},
+    {"command": "plate", "args": [10, 250.5]},
+    [1, [2, [3]]], 12345, -1.5e3, "str", True, None, {},
+]
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_array_matches_json_load(chunk_size, indent):
+    text = json.dumps(DOC, indent=indent, ensure_ascii=False)
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == DOC
+
+@pytest.mark.parametrize("text", ["[]", "  [ ]  ", "\n[\n]\n"])
+def test_empty_array(text):
+    assert list(iter_json_array(io.StringIO(text), 2)) == []
+
+@pytest.mark.parametrize("text", ['{"command": "fu"}', "", "410"])
+def test_non_array_rejected(text):
+    with pytest.raises(ValueError, match="list of commands"):
+        list(iter_json_array(io.StringIO(text)))
+
+@pytest.mark.parametrize("text", ['[{"a": 1}', '[{"a": 1} {"b": 2}]', '[{"a": 1},]', '[1] 2', '[{"a": ]'])
+def test_malformed_array_raises(text):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), 3))
+
+def test_array_is_incremental():
+    class Exploding(io.StringIO):
+        # fails if the reader asks for data beyond the first element
+        def read(self, n=-1):
+            if self.tell() > 40:
+                raise AssertionError("read past the first element")
+            return super().read(n)
+    it = iter_json_array(Exploding('[{"command": "fu", "args": ["410"]},' + " " * 1000 + "]"), 8)
+    assert next(it) == {"command": "fu", "args": ["410"]}
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7])
+def test_escapes_and_literals_split_across_chunks(chunk_size):
+    doc = ["é\u2603\U0001F600", True, False, None, float("inf"), -float("inf"), -12.5e-3, "a\\b\"c",
+           [10, 250.5e-2, [True, None, -float("inf")]]]
+    text = json.dumps(doc, ensure_ascii=True)
+    assert list(iter_json_array(io.StringIO(text), chunk_size)) == doc
+
+@pytest.mark.parametrize("bad", ['{"a": x}', '{"a" 1}', "1x", "tru e", '"a\x01"'])
+def test_malformed_element_raises_without_reading_ahead(bad):
+    class Counting(io.StringIO):
+        reads = 0
+
+        def read(self, n=-1):
+            self.reads += 1
+            return super().read(n)
+    f = Counting("[" + bad + "," + ", ".join(['{"command": "fu", "args": ["410"]}'] * 10_000) + "]")
+    with pytest.raises(ValueError):
+        list(iter_json_array(f, 64))
+    assert f.reads <= 3
+
+def test_element_size_is_capped():
+    text = '[{"command": "fu", "args": ["' + "4" * 5000 + '"]}]'
+    with pytest.raises(ValueError, match="exceeds 1000 characters"):
+        list(iter_json_array(io.StringIO(text), 64, max_element=1000))
+    assert len(next(iter_json_array(io.StringIO(text), 64, max_element=6000))["args"][0]) == 5000
+
+def test_json_lines_skips_blank_lines_and_reports_line():
+    assert list(iter_json_lines(io.StringIO('{"a": 1}\n\n  \n[2]\n'))) == [{"a": 1}, [2]]
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_json_lines(io.StringIO('{"a": 1}\n{oops}\n')))
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".ndjson"])
+def test_batch_json_lines_matches_json_array(tmp_path, suffix):
+    items = [{"command": "fu", "args": ["410"]}, {"command": "bolt", "args": ["M99", "8.8"]}]
+    a = tmp_path / "in.json"
+    a.write_text(json.dumps(items))
+    b = tmp_path / f"in{suffix}"
+    b.write_text("\n".join(json.dumps(i) for i in items) + "\n")
+    assert cli.run_batch_file(str(b)) == cli.run_batch_file(str(a))
@@ -0,0 +1,106 @@
+# tests/test_metrics.py
+import re
+
+from osdag_validator_cli import cli
+from osdag_validator_cli import metrics as metrics_module
+from osdag_validator_cli.cache import LRUCache
+from osdag_validator_cli.metrics import Metrics, Histogram, outcome
+
+def test_outcome():
+    assert [outcome(r) for r in (True, False, None, {"error": "x"}, [1])] == \
+        ["valid", "invalid", "invalid", "error", "valid"]
+
+def test_histogram_buckets_and_quantile():
+    h = Histogram((0.1, 1.0))
+    for v in (0.05, 0.1, 0.5, 2.0):
+        h.observe(v)
+    assert h.counts == [2, 1, 1] and h.count == 4 and abs(h.sum - 2.65) < 1e-9
+    assert h.quantile(0.5) == 0.1 and h.quantile(0.75) == 1.0 and h.quantile(1.0) is None
+
+def test_render_is_prometheus_text():
+    m = Metrics(buckets=(0.001, 0.01))
+    m.record("fu", True, parse=0.0005, validate=0.005)
+    m.record("fu", False)
+    m.count("bolt", {"error": "bad"})
+    m.observe("validate", 0.005)
+    m.record_batch(100, 0.5)
+    m.register_cache("lru", lambda: {"hits": 3, "misses": 1})
+    m.register_cache("off", lambda: None)
+    text = m.render()
+    assert 'osdag_validator_validations_total{command="fu",outcome="valid"} 1' in text
+    assert 'osdag_validator_validations_total{command="fu",outcome="invalid"} 1' in text
+    assert 'osdag_validator_validations_total{command="bolt",outcome="error"} 1' in text
+    assert 'osdag_validator_phase_seconds_bucket{unit="request",phase="parse",le="0.001"} 1' in text
+    assert 'osdag_validator_phase_seconds_bucket{unit="request",phase="validate",le="0.001"} 0' in text
+    assert 'osdag_validator_phase_seconds_bucket{unit="request",phase="validate",le="+Inf"} 1' in text
+    assert 'osdag_validator_phase_seconds_count{unit="request",phase="serialize"} 0' in text
+    # block samples are kept apart from request samples
+    assert 'osdag_validator_phase_seconds_count{unit="block",phase="validate"} 1' in text
+    assert 'osdag_validator_phase_seconds_count{unit="block",phase="parse"} 0' in text
+    assert "osdag_validator_batch_rows_per_second 200.0" in text
+    assert 'osdag_validator_cache_hit_ratio{cache="lru"} 0.75' in text
+    assert 'cache="off"' not in text
+    sample = re.compile(r'^[a-z_]+(\{[a-z]+="[^"]*"(,[a-z]+="[^"]*")*\})? \S+$')
+    for line in text.splitlines():
+        assert line.startswith("# HELP ") or line.startswith("# TYPE ") or sample.match(line), line
+
+def test_command_labels_are_bounded(monkeypatch):
+    monkeypatch.setattr(metrics_module, "MAX_COMMAND_LABELS", 2)
+    m = Metrics()
+    for cmd in ("a", "b", "c", "d", "a"):
+        m.count(cmd, True)
+    assert m.validations == {("a", "valid"): 2, ("b", "valid"): 1, ("other", "valid"): 2}
+
+def test_label_values_are_escaped():
+    m = Metrics()
+    m.count('x"\\\n', True)
+    assert 'command="x\\"\\\\\\n"' in m.render()
+
+def test_batch_results_unchanged_and_counted(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nfu,abc\nbolt,M20,8.8\nnope,1\n" * 50)
+    for preparse in (False, True):
+        m = Metrics()
+        assert cli.run_batch_file(str(f), preparse=preparse, metrics=m) == \
+            cli.run_batch_file(str(f), preparse=preparse)
+        assert m.validations == {("fu", "valid"): 50, ("fu", "invalid"): 50,
+                                 ("bolt", "valid"): 50, ("nope", "error"): 50}
+        assert m.batch_rows == 200 and m.batch_seconds > 0
+        assert m.phases["block", "parse"].count >= 1 and m.phases["block", "validate"].count >= 1
+        assert (m.phases["block", "dispatch"].count >= 1) == preparse
+
+def test_streamed_and_parallel_runs_are_counted(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nfy,abc\n" * 30)
+    m = Metrics()
+    assert cli.run_batch_file(str(f), out_path=str(tmp_path / "out.jsonl"), stream=True, metrics=m) == 60
+    assert m.phases["block", "serialize"].count >= 1
+    m = Metrics()
+    results = list(cli.iter_batch_file(str(f), workers=2, chunk_size=10, metrics=m))
+    assert results == list(cli.iter_batch_file(str(f)))
+    assert m.validations == {("fu", "valid"): 30, ("fy", "invalid"): 30}
+
+def test_cli_stats_flag(tmp_path, capsys):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nfu,abc\nnope,1\n" * 4)
+    assert cli.main(["batch", str(f), "--format", "csv", "--cache-size", "10", "--stats"]) == 0
+    err = capsys.readouterr().err
+    assert re.search(r"stats: 12 rows in [\d.]+s \([\d,]+ rows/s\)", err)
+    assert "fu: 4 valid, 4 invalid, 0 errors" in err and "nope: 0 valid, 0 invalid, 4 errors" in err
+    assert "lru cache: 6 hits, 2 misses (75.0% hit rate)" in err
+    assert "serialize per block:" in err and "per request" not in err
+
+def test_stats_off_by_default(tmp_path, capsys):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\n")
+    assert cli.main(["batch", str(f), "--format", "csv"]) == 0
+    assert "stats:" not in capsys.readouterr().err
+
+def test_lru_cache_registration():
+    m = Metrics()
+    cache = LRUCache(4)
+    m.register_cache("lru", cache.stats)
+    cache.get("a", None)
+    cache.put("a", 1)
+    cache.get("a")
+    assert m.cache_stats() == {"lru": (1, 1, 0.5)}
@@ -0,0 +1,119 @@
+# tests/test_mmap_csv.py
+import csv
+import random
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.mmapcsv import iter_csv_rows, iter_csv_rows_from, iter_text_lines, iter_tracked_rows
+
+def _reference(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if row:
+                yield row[0].strip(), [c.strip() for c in row[1:]]
+
+def _outcome(rows):
+    try:
+        return "ok", list(rows)
+    except Exception as e:
+        return "error", type(e).__name__
+
+CASES = {
+    "plain": "fu,410\nbolt,M20,8.8\nplate,10,250\n",
+    "no_trailing_newline": "fu,410\nfy,250",
+    "blank_lines": "\n\nfu,410\n\n\nfy,250\n\n",
+    "whitespace": " fu , 410 \n\tbolt,\tM20 ,8.8\x0c\n   \n",
+    "crlf": "fu,410\r\nfy,250\r\n",
+    "lone_cr": "fu,410\rfy,250\r",
+    "quoted": 'fu,"410"\nbolt,"M20","8.8"\n"plate","1,0","250"\n',
+    "quoted_newline": 'fu,"4\n10"\nfy,"2\r\n50"\nfy,250\n',
+    "doubled_quotes": 'bolt,"M""20",8.8\n',
+    "unicode": "fu,४१०\nbolt,ｍ20,8.8\nfy,2é0\n",
+    "trailing_comma": "fu,410,\n,,\n",
+    "nul": "fu,41\x000\n",
+    "empty": "",
+}
+
+@pytest.mark.parametrize("name", sorted(CASES))
+@pytest.mark.parametrize("block_size", [4, 16, 1 << 14])
+def test_matches_csv_reader(tmp_path, name, block_size):
+    f = tmp_path / "in.csv"
+    f.write_bytes(CASES[name].encode("utf-8"))
+    assert _outcome(iter_csv_rows(str(f), block_size)) == _outcome(_reference(str(f)))
+
+def test_matches_csv_reader_fuzz(tmp_path):
+    rnd = random.Random(13)
+    alphabet = ["a", "1", ".", ",", " ", "\t", '"', "\n", "\r", "\r\n", "é", "M20", "\x0c", ","]
+    f = tmp_path / "in.csv"
+    for _ in range(500):
+        f.write_bytes("".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 120))).encode())
+        expected = _outcome(_reference(str(f)))
+        for block_size in (5, 64):
+            assert _outcome(iter_csv_rows(str(f), block_size)) == expected
+
+def _tracked_reference(path):
+    def parse(lines):
+        for row in csv.reader(lines):
+            if row:
+                yield row[0].strip(), [c.strip() for c in row[1:]]
+    with open(path, "rb") as f:
+        yield from iter_tracked_rows(iter_text_lines(f), parse)
+
+@pytest.mark.parametrize("name", sorted(CASES))
+@pytest.mark.parametrize("block_size", [4, 16, 1 << 14])
+def test_offsets_match_line_reader(tmp_path, name, block_size):
+    f = tmp_path / "in.csv"
+    f.write_bytes(CASES[name].encode("utf-8"))
+    expected = _outcome(_tracked_reference(str(f)))
+    assert _outcome(iter_csv_rows_from(str(f), 0, block_size)) == expected
+    assert [r for _, r, _ in expected[1]] == list(_reference(str(f)))
+
+@pytest.mark.parametrize("alphabet", [
+    ["a", "1", ".", ",", " ", "\t", '"', "\n", "\n", "\r", "\r\n", "é", "M20", ","],
+    ["a", "1", ".", ",", " ", '"', '"', "\n", "\n", "\n", "\x00", "é", "M20", ","],  # quoted blocks without CR
+])
+def test_offsets_match_line_reader_fuzz(tmp_path, alphabet):
+    rnd = random.Random(17)
+    f = tmp_path / "in.csv"
+    for _ in range(500):
+        f.write_bytes("".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 120))).encode())
+        expected = _outcome(_tracked_reference(str(f)))
+        for block_size in (5, 64):
+            got = _outcome(iter_csv_rows_from(str(f), 0, block_size))
+            assert got == expected
+            if got[0] == "ok" and got[1]:
+                # resuming at a row end reads the rest of the file
+                end = got[1][len(got[1]) // 2][0]
+                assert list(iter_csv_rows_from(str(f), end, block_size)) == got[1][len(got[1]) // 2 + 1:]
+
+def test_quoted_field_spanning_blocks(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text('fu,410\nbolt,"M20\n' + "x" * 100 + '\n",8.8\nfy,250\n' * 3)
+    assert list(iter_csv_rows(str(f), 32)) == list(_reference(str(f)))
+
+def test_field_size_limit_still_enforced(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("fu," + "1" * (csv.field_size_limit() + 1) + "\n")
+    with pytest.raises(csv.Error):
+        list(iter_csv_rows(str(f)))
+
+def test_batch_uses_mmap_for_plain_csv(tmp_path, monkeypatch):
+    f = tmp_path / "in.csv"
+    f.write_text('fu,410\n"bolt", M20 ,8.8\n')
+    calls = []
+    real = cli.iter_csv_rows
+    monkeypatch.setattr(cli, "iter_csv_rows", lambda p: calls.append(p) or real(p))
+    assert [r["result"] for r in cli.iter_batch_file(str(f))] == [True, True]
+    assert calls == [str(f)]
+
+def test_cached_batch_uses_mmap_for_plain_csv(tmp_path, monkeypatch):
+    from osdag_validator_cli.diskcache import ResultStore
+    f = tmp_path / "in.csv"
+    f.write_text('fu,410\n"bolt", M20 ,8.8\n')
+    calls = []
+    real = cli.iter_csv_rows_from
+    monkeypatch.setattr(cli, "iter_csv_rows_from", lambda p, offset: calls.append(p) or real(p, offset))
+    store = ResultStore(str(tmp_path / "store"))
+    assert [r["result"] for r in cli.iter_batch_file(str(f), result_store=store)] == [True, True]
+    assert calls == [str(f)]
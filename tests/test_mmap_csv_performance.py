@@ -0,0 +1,48 @@
+# tests/test_mmap_csv_performance.py
+import csv
+import os
+import time
+
+import pytest
+
+from osdag_validator_cli.mmapcsv import iter_csv_rows, iter_csv_rows_from, iter_text_lines, iter_tracked_rows
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+ROWS = "fu,410\nfy,250\ntf,12.5\nbolt,M20,8.8\nplate,10,250\nfu,abc\n"
+
+def _text_reader(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if row:
+                yield row[0].strip(), [c.strip() for c in row[1:]]
+
+def _parse(lines):
+    for row in csv.reader(lines):
+        if row:
+            yield row[0].strip(), [c.strip() for c in row[1:]]
+
+def _tracked_line_reader(path):
+    """What resumable and cached runs used before: offsets and raw bytes line by line."""
+    with open(path, "rb") as f:
+        yield from iter_tracked_rows(iter_text_lines(f), _parse)
+
+@pytest.mark.parametrize("rows", [ROWS, ROWS.replace(",", ", "), ROWS + 'bolt,"M20",8.8\n'])
+def test_mmap_scanner_faster_than_csv_reader(tmp_path, rows):
+    f = tmp_path / "big.csv"
+    f.write_text(rows * 100_000)
+    readers = {"csv": _text_reader, "mmap": iter_csv_rows,
+               "lines+offsets": _tracked_line_reader, "mmap+offsets": iter_csv_rows_from}
+    timings, counts = {}, {}
+    for _ in range(3):
+        for name, reader in readers.items():
+            t0 = time.perf_counter()
+            counts[name] = sum(1 for _ in reader(str(f)))
+            timings[name] = min(timings.get(name, float("inf")), time.perf_counter() - t0)
+    print("\n" + ", ".join(f"{name} {t:.2f}s" for name, t in timings.items()), end="")
+    assert len(set(counts.values())) == 1
+    # each scanner keeps at least 0.8x the speed of the reader it replaces
+    assert timings["mmap"] < timings["csv"] / 0.8  # adjust if needed for slow machines
+    assert timings["mmap+offsets"] < timings["lines+offsets"] / 0.8
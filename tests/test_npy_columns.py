@@ -0,0 +1,91 @@
+# tests/test_npy_columns.py
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from osdag_validator import Validator
+from osdag_validator_cli import cli
+from osdag_validator_cli.npyinput import load_column
+
+FU = np.array([410, 299, 700, 701, -5, 0, 450], dtype=np.int32)
+FY = np.array([250.0, 150.0, 500.9, 501.0, np.nan, np.inf, 149.99])
+T = np.array([10.0, 0.5, 100.0, 12.5])
+W = np.array([250.0, 250.0, 2000.0, 2001.0])
+
+def _manifest(tmp_path, columns):
+    m = tmp_path / "job.json"
+    m.write_text(json.dumps({"columns": columns}))
+    return m
+
+def _expected():
+    v = Validator()
+    return np.array([v.validate_fu(int(x)) for x in FU]
+                    + [v.validate_fy(float(x)) for x in FY]
+                    + [v.validate_plate(float(t), float(w)) for t, w in zip(T, W)])
+
+@pytest.fixture
+def job(tmp_path):
+    np.save(tmp_path / "fu.npy", FU)
+    np.savez(tmp_path / "props.npz", fy=FY)
+    np.savez_compressed(tmp_path / "plates.npz", thickness=T, width=W)
+    return _manifest(tmp_path, [
+        {"command": "fu", "arrays": ["fu.npy"]},
+        {"command": "fy", "arrays": ["props.npz:fy"]},
+        {"command": "plate", "arrays": ["plates.npz:thickness", "plates.npz:width"]},
+    ])
+
+def test_npy_output_matches_scalar_checks(job, tmp_path):
+    out = tmp_path / "res.npy"
+    results = cli.run_column_file(str(job), str(out))
+    assert [cmd for cmd, _ in results] == ["fu", "fy", "plate"]
+    saved = np.load(out)
+    assert saved.dtype == np.bool_
+    assert saved.tolist() == _expected().tolist()
+    assert np.concatenate([r for _, r in results]).tolist() == saved.tolist()
+
+def test_npz_output_one_array_per_entry(job, tmp_path):
+    out = tmp_path / "res.npz"
+    cli.run_column_file(str(job), str(out))
+    with np.load(out) as data:
+        assert sorted(data.files) == ["fu", "fy", "plate"]
+        got = np.concatenate([data["fu"], data["fy"], data["plate"]])
+    assert got.tolist() == _expected().tolist()
+
+def test_small_slices_give_same_results(job):
+    from osdag_validator_cli.npyinput import run_column_batch
+    full = run_column_batch(str(job), cli.get_vector_dispatch(), cli.NUMERIC_ARITY)
+    sliced = run_column_batch(str(job), cli.get_vector_dispatch(), cli.NUMERIC_ARITY, slice_size=2)
+    assert [r.tolist() for _, r in full] == [r.tolist() for _, r in sliced]
+
+def test_columns_are_memory_mapped(job, tmp_path):
+    assert isinstance(load_column("fu.npy", str(tmp_path)), np.memmap)
+    fy = load_column("props.npz:fy", str(tmp_path))  # stored member: mapped in place
+    assert isinstance(fy, np.memmap) and fy.tolist()[:2] == [250.0, 150.0]
+    t = load_column("plates.npz:thickness", str(tmp_path))  # compressed member: loaded
+    assert t.tolist() == T.tolist()
+
+@pytest.mark.parametrize("columns,match", [
+    ([{"command": "bolt", "arrays": ["fu.npy"]}], "no vectorized check"),
+    ([{"command": "plate", "arrays": ["fu.npy"]}], "takes 2"),
+    ([{"command": "plate", "arrays": ["fu.npy", "plates.npz:width"]}], "differ in length"),
+    ([{"command": "fy", "arrays": ["props.npz:nope"]}], "no array named"),
+    ([{"command": "fy", "arrays": ["props.npz"]}], "npz member"),
+    (["fu.npy"], r"columns\[0\]: entry must be an object"),
+    ([{"command": "fu", "arrays": ["fu.npy"]}, None], r"columns\[1\]: entry must be an object"),
+])
+def test_manifest_errors(job, tmp_path, columns, match):
+    with pytest.raises((ValueError, KeyError), match=match):
+        cli.run_column_file(str(_manifest(tmp_path, columns)))
+
+def test_rejects_other_output_suffix(job, tmp_path):
+    with pytest.raises(ValueError):
+        cli.run_column_file(str(job), str(tmp_path / "res.csv"))
+
+def test_cli_columns_flag(job, tmp_path, capsys):
+    out = tmp_path / "res.npy"
+    assert cli.main(["batch", str(job), "--columns", "--out", str(out)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert summary[0] == {"command": "fu", "rows": 7, "valid": 3}
+    assert np.load(out).sum() == sum(s["valid"] for s in summary)
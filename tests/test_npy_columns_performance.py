@@ -0,0 +1,46 @@
+# tests/test_npy_columns_performance.py
+import json
+import os
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from osdag_validator_cli import cli
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+N = 1_000_000
+
+def test_npy_columns_vs_csv(tmp_path):
+    rng = np.random.default_rng(14)
+    fu = rng.integers(200, 800, N)
+    t = rng.uniform(0, 120, N).round(1)
+    w = rng.uniform(0, 2500, N).round(0)
+    np.save(tmp_path / "fu.npy", fu)
+    np.savez(tmp_path / "plates.npz", t=t, w=w)
+    manifest = tmp_path / "job.json"
+    manifest.write_text(json.dumps({"columns": [
+        {"command": "fu", "arrays": ["fu.npy"]},
+        {"command": "plate", "arrays": ["plates.npz:t", "plates.npz:w"]},
+    ]}))
+    csv_path = tmp_path / "job.csv"
+    with open(csv_path, "w") as f:
+        f.writelines(f"fu,{x}\n" for x in fu.tolist())
+        f.writelines(f"plate,{a},{b}\n" for a, b in zip(t.tolist(), w.tolist()))
+
+    t0 = time.perf_counter()
+    cli.run_column_file(str(manifest), str(tmp_path / "res.npy"))
+    t_npy = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    cli.run_batch_file(str(csv_path), out_path=str(tmp_path / "res.jsonl"), out_format="jsonl",
+                       stream=True, preparse=True)
+    t_csv = time.perf_counter() - t0
+    print(f"\n{2 * N} rows: npy {t_npy:.2f}s, csv --preparse {t_csv:.2f}s ({t_csv / t_npy:.0f}x)", end="")
+
+    res = np.load(tmp_path / "res.npy")
+    with open(tmp_path / "res.jsonl") as f:
+        assert res.tolist() == [json.loads(line)["result"] for line in f]
@@ -0,0 +1,62 @@
+# tests/test_result_table.py
+import io
+import json
+
+import pytest
+
+from osdag_validator_cli import cli
+from osdag_validator_cli.results import ResultTable
+from osdag_validator_cli.writers import get_writer
+
+ROWS = [
+    {"command": "fu", "args": ["410"], "result": True},
+    {"command": "fy", "args": ["abc"], "result": False},
+    {"command": "bolt", "args": ["M20", "8.8"], "result": True},
+    {"command": "nope", "args": [], "result": {"error": "Unknown command 'nope'"}},
+    {"command": "fu", "args": [410, 1.0, True, [1, 2]], "result": False},
+    {"command": "tf", "args": "12.5", "result": True},
+    {"command": "fu", "args": None, "result": 1},
+]
+
+def test_round_trips_every_row():
+    table = ResultTable(ROWS * 3)
+    assert len(table) == 21
+    assert list(table) == ROWS * 3
+    assert table == ROWS * 3
+    assert table[3] == ROWS[3] and table[-1] == ROWS[-1]
+    assert table[2:5] == ROWS[2:5]
+    with pytest.raises(IndexError):
+        table[21]
+
+def test_types_are_preserved():
+    t = ResultTable(ROWS)
+    args = t[4]["args"]
+    assert [type(a) for a in args] == [int, float, bool, list]
+    assert t[6]["result"] == 1 and type(t[6]["result"]) is int
+    assert type(t[0]["result"]) is bool
+
+def test_strings_are_interned_and_bits_packed():
+    rows = [{"command": "bolt", "args": ["".join(["M", "20"]), "".join(["8.", "8"])], "result": i % 3 == 0}
+            for i in range(1000)]
+    t = ResultTable(rows)
+    assert t[0]["args"][0] is t[999]["args"][0]
+    assert len(t._bits) == 125
+    assert t.count_valid() == sum(r["result"] for r in rows)
+    assert t.nbytes() < 25_000  # ~25 B/row: 2 arg refs, an offset, a command id, one bit
+
+def test_writers_accept_table():
+    for fmt in ("json", "jsonl", "csv", "text"):
+        a, b = io.StringIO(), io.StringIO()
+        get_writer(fmt, a).write_all(ROWS[:5])
+        get_writer(fmt, b).write_all(ResultTable(ROWS[:5]))
+        assert a.getvalue() == b.getvalue()
+
+def test_run_batch_file_compact(tmp_path):
+    f = tmp_path / "in.csv"
+    f.write_text("fu,410\nfy, 250 \nbolt,m20,8.8\nzzz,1\n" * 50)
+    plain = cli.run_batch_file(str(f))
+    assert isinstance(plain, list)
+    compact = cli.run_batch_file(str(f), compact=True)
+    assert isinstance(compact, ResultTable)
+    assert compact == plain
+    assert json.dumps(list(compact)) == json.dumps(plain)
@@ -0,0 +1,30 @@
+# tests/test_result_table_performance.py
+import os
+import tracemalloc
+
+import pytest
+
+from osdag_validator_cli import cli
+
+# Skip unless RUN_PERF=1
+if os.getenv("RUN_PERF", "0") != "1":
+    pytest.skip("Performance tests are disabled by default.", allow_module_level=True)
+
+ROWS = "fu,410\nfy,250\ntf,12.5\nbolt,M20,8.8\nplate,10,250\nfu,abc\n"
+N = 25_000  # x6 rows; tracemalloc makes this slow
+
+def _retained_bytes(path, compact):
+    tracemalloc.start()
+    results = cli.run_batch_file(path, compact=compact)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(results) == N * 6
+    return size
+
+def test_bytes_per_row(tmp_path):
+    f = tmp_path / "big.csv"
+    f.write_text(ROWS * N)
+    before = _retained_bytes(str(f), compact=False) / (N * 6)
+    after = _retained_bytes(str(f), compact=True) / (N * 6)
+    print(f"\nlist of dicts: {before:.1f} B/row, ResultTable: {after:.1f} B/row ({before / after:.1f}x)", end="")
+    assert after * 5 < before
@@ -0,0 +1,159 @@
+# tests/test_scheduler.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from osdag_validator_cli.scheduler import FairScheduler, INTERACTIVE, BULK
+
+def test_bulk_runs_freely_without_interactive_traffic():
+    s = FairScheduler(idle_grace=0.001)
+    for _ in range(3):
+        with s.bulk_slot():
+            pass
+    st = s.stats()["bulk"]
+    assert (st["slices"], st["deferred_slices"]) == (3, 0)
+
+def _interactive(s, hold=0.0):
+    """One interactive request through the scheduler, as /validate runs it."""
+    async def request():
+        async with s.interactive_slot():
+            await asyncio.sleep(hold)
+    asyncio.run(request())
+
+def test_bulk_yields_to_interactive_by_weight():
+    s = FairScheduler(interactive_weight=4, bulk_weight=1, idle_grace=1)
+    with s.bulk_slot():                   # bulk alone: runs at once, 10 ms of service
+        time.sleep(0.01)
+    _interactive(s)                       # interactive takes the server and keeps it...
+    t0 = time.monotonic()
+    with s.bulk_slot():                   # ...until it has had ~4x the bulk slice
+        waited = time.monotonic() - t0
+    assert 0.035 <= waited < 0.5          # well before the 1 s grace runs out
+    assert s.stats()["bulk"]["deferred_slices"] == 1
+
+def test_waiting_bulk_starts_when_interactive_goes_idle():
+    s = FairScheduler(interactive_weight=1000, idle_grace=0.05)
+    with s.bulk_slot():
+        time.sleep(0.01)                  # the weighted turn would be ~10 s away
+    _interactive(s)
+    started = threading.Event()
+
+    def bulk():
+        with s.bulk_slot():
+            started.set()
+
+    t = threading.Thread(target=bulk)
+    t.start()
+    assert not started.wait(0.01)
+    assert started.wait(1)                # the idle grace ran out
+    t.join()
+
+def test_interactive_queues_behind_a_running_slice_then_goes_first():
+    s = FairScheduler(idle_grace=0.001)
+    order = []
+    running, release = threading.Event(), threading.Event()
+
+    def bulk(name, hold):
+        with s.bulk_slot():
+            order.append(name)
+            if hold:
+                running.set()
+                release.wait(1)
+
+    first = threading.Thread(target=bulk, args=("bulk 1", True))
+    first.start()
+    assert running.wait(1)
+    second = threading.Thread(target=bulk, args=("bulk 2", False))
+    second.start()
+    while s.stats()["bulk"]["deferred_slices"] < 1:
+        time.sleep(0.001)
+
+    async def request():
+        async with s.interactive_slot():
+            order.append("interactive")
+
+    async def main():
+        task = asyncio.ensure_future(request())
+        await asyncio.sleep(0.02)
+        assert order == ["bulk 1"] and s.stats()["interactive"]["waiting"] == 1
+        release.set()                     # the queued request was owed the next turn
+        await task
+
+    asyncio.run(main())
+    first.join()
+    second.join()
+    assert order == ["bulk 1", "interactive", "bulk 2"]
+    assert s.stats()["interactive"]["deferred_requests"] == 1
+
+def test_cancelled_interactive_request_leaves_the_queue():
+    s = FairScheduler(idle_grace=0.001)
+    running, release = threading.Event(), threading.Event()
+
+    def bulk():
+        with s.bulk_slot():
+            running.set()
+            release.wait(1)
+
+    t = threading.Thread(target=bulk)
+    t.start()
+    assert running.wait(1)
+
+    async def main():
+        async def request():
+            async with s.interactive_slot():
+                pass
+        task = asyncio.ensure_future(request())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert s.stats()["interactive"]["waiting"] == 0
+    release.set()
+    t.join()
+    with s.bulk_slot():                   # the lane is free again
+        pass
+
+def test_bulk_concurrency_limit():
+    s = FairScheduler(bulk_concurrency=1)
+    order = []
+    gate = threading.Event()
+
+    def first():
+        with s.bulk_slot():
+            order.append("first")
+            gate.wait(1)
+
+    t = threading.Thread(target=first)
+    t.start()
+    while not order:
+        time.sleep(0.001)
+    def second():
+        with s.bulk_slot():
+            order.append("second")
+
+    t2 = threading.Thread(target=second)
+    t2.start()
+    time.sleep(0.02)
+    assert order == ["first"]
+    gate.set()
+    t.join()
+    t2.join()
+    assert order == ["first", "second"]
+
+def test_admission_budgets_and_retry_after():
+    s = FairScheduler(interactive_budget=1, bulk_budget=1)
+    assert s.enter_interactive() and not s.enter_interactive()
+    assert s.enter_bulk() and not s.enter_bulk()
+    s.leave_bulk(2.5)
+    assert s.retry_after(BULK) == 3 and s.retry_after(INTERACTIVE) == 1
+    st = s.stats()
+    assert (st["interactive"]["rejected"], st["bulk"]["rejected"], st["bulk"]["inflight"]) == (1, 1, 0)
+
+@pytest.mark.parametrize("kwargs", [{"bulk_weight": 0}, {"slice_rows": 0}, {"interactive_budget": 0}])
+def test_rejects_bad_settings(kwargs):
+    with pytest.raises(ValueError):
+        FairScheduler(**kwargs)
@@ -0,0 +1,48 @@
+# tests/test_validator_vectorized.py
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from osdag_validator import Validator
+
+# Mixed bag of inputs: valid, boundary, truncation, non-numeric and odd types.
+SAMPLES = [
+    410, 300, 700, 299, 701, 0, -10, True, 10**30,
+    410.0, 299.9, 700.9, 700.0001, -0.5, float("nan"), float("inf"), float("-inf"),
+    "410", " 410 ", "4_10", "410.0", "1e2", "abc", "", "  ", "nan", "inf",
+    None, [1], b"410", 1.0, 100.0, 100.5, 50, 2000, 2000.5, "2000", "0.99",
+]
+
+@pytest.mark.parametrize("name", ["fu", "fy", "tf"])
+def test_single_value_parity_on_mixed_input(name):
+    v = Validator()
+    scalar = getattr(v, f"validate_{name}")
+    many = getattr(v, f"validate_{name}_many")
+    out = many(SAMPLES)
+    assert out.dtype == bool
+    assert out.tolist() == [scalar(x) for x in SAMPLES]
+
+@pytest.mark.parametrize("name", ["fu", "fy", "tf"])
+def test_numeric_array_parity(name):
+    v = Validator()
+    scalar = getattr(v, f"validate_{name}")
+    many = getattr(v, f"validate_{name}_many")
+    ints = np.arange(-50, 1000, dtype=np.int64)
+    floats = np.linspace(-5.0, 1000.0, 4001)
+    strings = np.array([str(x) for x in floats[::7]])
+    for arr in (ints, floats, strings):
+        assert many(arr).tolist() == [scalar(x) for x in arr.tolist()]
+
+def test_plate_many_parity_and_broadcast():
+    v = Validator()
+    thick = ["10", 0.5, 1, 100, 100.1, "x", None, 50.0]
+    width = [250, 250, "49.9", 2000, 60, 60, 60, "2000"]
+    out = v.validate_plate_many(thick, width)
+    assert out.tolist() == [v.validate_plate(t, w) for t, w in zip(thick, width)]
+    # scalar width broadcasts against an array of thicknesses
+    assert v.validate_plate_many(np.array([0.5, 10.0, 20.0]), 300).tolist() == [False, True, True]
+
+def test_many_preserves_shape():
+    v = Validator()
+    grid = np.array([[300, 299], [700, 701]])
+    assert v.validate_fu_many(grid).tolist() == [[True, False], [True, False]]